@@ -1,5 +1,32 @@
-from aiomodels.core.model import BaseModel
+from aiomodels.core.model import BaseModel, CreateManyResult, UpdateManyResult
 from aiomodels.core.cursor import WrappedCursor
+from aiomodels.core.bulk import BulkWriter, BulkFlush
+from aiomodels.core.pagination import Page
+from aiomodels.core.cache import IdentityCache
+from aiomodels.core.indexes import ensure_indexes
+from aiomodels.core.limiter import Limiter
+from aiomodels.core.loader import Loader
+from aiomodels.core.metrics import CommandMetrics, Metrics
+from aiomodels.core.profiler import HookProfiler
+from aiomodels.core.record import Record, record_class, schema_fields
 
 
-__all__ = ["BaseModel", "WrappedCursor"]
+__all__ = [
+    "BaseModel",
+    "BulkFlush",
+    "BulkWriter",
+    "CommandMetrics",
+    "CreateManyResult",
+    "HookProfiler",
+    "IdentityCache",
+    "Limiter",
+    "Loader",
+    "Metrics",
+    "Page",
+    "Record",
+    "UpdateManyResult",
+    "WrappedCursor",
+    "ensure_indexes",
+    "record_class",
+    "schema_fields",
+]
@@ -0,0 +1,203 @@
+import asyncio
+import time
+import typing as t
+
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+from pymongo.results import BulkWriteResult
+
+from aiomodels.base import Query
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .model import BaseModel
+
+
+__all__ = ["BulkWriter", "BulkFlush"]
+
+
+DUPLICATE_KEY_CODES = (11000, 11001, 12582)
+
+Operation = t.Union[InsertOne, UpdateOne, DeleteOne]
+
+
+class BulkFlush(t.NamedTuple):
+    operations: int
+    """Operations sent in one bulk_write"""
+    duration: float
+    """Seconds spent in bulk_write"""
+    result: BulkWriteResult
+    errors: t.List[dict]
+    """Write errors, index is the position inside the flush"""
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    # nobody is obliged to await the operation, errors are in BulkWriter.errors
+    if not future.cancelled():
+        future.exception()
+
+
+class BulkWriter:
+    """
+    Queue of write operations sent with bulk_write
+
+    The queue is flushed when it reaches max_operations, max_delay_ms after
+    the first queued operation and on exit. Every queued operation returns a
+    future resolved after its flush, with the write error if any.
+    """
+
+    def __init__(
+        self,
+        model: "BaseModel",
+        *,
+        max_operations: int = None,
+        max_delay_ms: float = 100,
+        ordered: bool = False,
+        session=None,
+        on_flush: t.Callable[[BulkFlush], t.Any] = None,
+    ) -> None:
+        self.model: "BaseModel" = model
+        self.max_operations: int = max_operations or model.bulk_size
+        self.max_delay_ms = max_delay_ms
+        self.ordered = ordered
+        self.session = session
+        self.on_flush = on_flush
+
+        self.errors: t.List[dict] = []
+        self.flushes = 0
+        self.operations = 0
+
+        self._queue: t.List[Operation] = []
+        self._futures: t.List[asyncio.Future] = []
+        # queries of queued updates and deletes to invalidate the model cache
+        self._modified: t.List[Query] = []
+        self._timer: t.Optional[asyncio.TimerHandle] = None
+        self._tasks: t.Set[asyncio.Future] = set()
+
+    async def __aenter__(self) -> "BulkWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    ##
+    # Operations
+    #
+    async def insert(self, new) -> asyncio.Future:
+        document = await self.model._before_create(new)
+        return await self._add(InsertOne(document))
+
+    async def update(
+        self, query: Query, update: dict, *, upsert: dict = None
+    ) -> asyncio.Future:
+        kwargs = await self.model._before_update(
+            query=query, update=update, upsert=upsert
+        )
+        return await self._add(
+            UpdateOne(kwargs["filter"], kwargs["update"], upsert=kwargs["upsert"]),
+            query=kwargs["filter"],
+        )
+
+    async def upsert(
+        self, query: Query, update: dict, upsert: dict = None
+    ) -> asyncio.Future:
+        return await self.update(query, update, upsert=upsert or {})
+
+    async def delete(self, query: Query) -> asyncio.Future:
+        query = await self.model._before_delete(query)
+        return await self._add(DeleteOne(query), query=query)
+
+    ##
+    # Flush
+    #
+    async def _add(self, operation: Operation, query: Query = None) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_retrieve)
+        self._queue.append(operation)
+        self._futures.append(future)
+        if query is not None:
+            self._modified.append(query)
+
+        if len(self._queue) >= self.max_operations:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(
+                self.max_delay_ms / 1000, self._flush_in_background
+            )
+        return future
+
+    def _flush_in_background(self) -> None:
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> t.Optional[BulkFlush]:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._queue:
+            return None
+
+        queue, futures, modified = self._queue, self._futures, self._modified
+        self._queue, self._futures, self._modified = [], [], []
+
+        start = time.perf_counter()
+        errors: t.List[dict] = []
+        try:
+            result = await self.model.collection.bulk_write(
+                queue, ordered=self.ordered, session=self.session
+            )
+        except BulkWriteError as e:
+            result = BulkWriteResult(e.details, acknowledged=True)
+            errors = e.details["writeErrors"]
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            raise
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            for query in modified:
+                self.model._invalidate(query)
+        duration = time.perf_counter() - start
+        if self.model.metrics is not None:
+            labels = (self.model.collection_name, "bulk", "server")
+            self.model.metrics.observe(labels, duration)
+            self.model.metrics.batch(self.model.collection_name, "bulk", len(queue))
+
+        failed = {error["index"]: error for error in errors}
+        for i, future in enumerate(futures):
+            if i in failed:
+                error = failed[i]
+                exc = (
+                    DuplicateKeyError
+                    if error["code"] in DUPLICATE_KEY_CODES
+                    else WriteError
+                )
+                future.set_exception(exc(error["errmsg"], error["code"], error))
+            elif self.ordered and errors and i > min(failed):
+                future.cancel()  # not executed after the first error
+            else:
+                future.set_result(None)
+
+        self.errors.extend(errors)
+        self.flushes += 1
+        self.operations += len(queue)
+
+        flush = BulkFlush(
+            operations=len(queue), duration=duration, result=result, errors=errors
+        )
+        if self.on_flush is not None:
+            self.on_flush(flush)
+        return flush
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
@@ -0,0 +1,113 @@
+import collections
+import time
+import typing as t
+
+from aiomodels.base import Projection
+from aiomodels.core.query import projection_key, query_id
+
+
+__all__ = ["IdentityCache"]
+
+
+Key = t.Tuple[t.Any, t.Optional[t.Tuple]]
+
+
+class IdentityCache:
+    """
+    LRU + TTL cache of encoded documents by _id and projection
+
+    Entries are BSON bytes, so max_bytes is exact and every hit decodes
+    a fresh document which callers may mutate freely.
+    """
+
+    def __init__(
+        self, *, max_size: int = 1024, max_bytes: int = None, ttl: float = None
+    ) -> None:
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+        # incremented on invalidation, reads started before are not stored
+        self.version = 0
+
+        self._data: t.OrderedDict[
+            Key, t.Tuple[bytes, float]
+        ] = collections.OrderedDict()
+        self._ids: t.Dict[t.Any, t.Set[Key]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def key(query: t.Any, projection: Projection = None) -> t.Optional[Key]:
+        _id = query_id(query)
+        if _id is None:
+            return None
+        return _id, projection_key(projection)
+
+    def get(self, key: Key) -> t.Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] < time.monotonic():
+            self._remove(key)
+            self.evictions += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Key, data: bytes, *, version: int) -> None:
+        if version != self.version:
+            return  # invalidated while reading
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        if key in self._data:
+            self._remove(key)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._data[key] = (data, expires)
+        self._ids.setdefault(key[0], set()).add(key)
+        self.size_bytes += len(data)
+
+        while len(self._data) > self.max_size or (
+            self.max_bytes is not None and self.size_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def _remove(self, key: Key) -> None:
+        data, _ = self._data.pop(key)
+        self.size_bytes -= len(data)
+        keys = self._ids[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._ids[key[0]]
+
+    ##
+    # Invalidation
+    #
+    def invalidate(self, _id: t.Any) -> None:
+        self.version += 1
+        for key in list(self._ids.get(_id, ())):
+            self._remove(key)
+
+    def invalidate_query(self, query: t.Any) -> None:
+        _id = query_id(query)
+        if _id is None:
+            self.clear()
+        else:
+            self.invalidate(_id)
+
+    def clear(self) -> None:
+        self.version += 1
+        self._data.clear()
+        self._ids.clear()
+        self.size_bytes = 0
@@ -1,6 +1,12 @@
+import asyncio
+import collections
+import contextlib
 import typing as t
 
+import bson
+from bson.raw_bson import RawBSONDocument
 from motor.core import AgnosticCursor
+from pymongo.errors import InvalidOperation
 
 from aiomodels.base import RawDocument
 
@@ -11,35 +17,182 @@ if t.TYPE_CHECKING:  # pragma: no cover
 __all__ = ["WrappedCursor"]
 
 
+Hydrate = t.Callable[[t.List[t.Any]], t.Awaitable[t.List[t.Any]]]
+
+
 class WrappedCursor:
     def __init__(
-        self, model: "BaseModel", *, cursor: AgnosticCursor = None, **kwargs
+        self,
+        model: "BaseModel",
+        *,
+        cursor: AgnosticCursor = None,
+        hydrate: Hydrate = None,
+        operation: str = "cursor",
+        depth: int = 0,
+        max_bytes: int = None,
+        **kwargs,
     ) -> None:
         self.model: "BaseModel" = model
         self.cursor: AgnosticCursor = cursor or self.model.collection.find(**kwargs)
+        self.hydrate: Hydrate = hydrate or model._after_read_many
+        """Turns a batch of documents into results, _after_read_many by default"""
+        self.operation = operation
+        """Label of server and hook timings"""
+        self.depth = depth
+        """Server batches fetched ahead in background, see prefetch()"""
+        self.max_bytes = max_bytes
+        """BSON size of prefetched batches above which fetching pauses"""
+        self._buffer: t.Deque[RawDocument] = collections.deque()
+
+        self._task: t.Optional[asyncio.Future] = None
+        self._ready = asyncio.Condition()
+        self._batches: t.Deque[t.Tuple[t.List[t.Any], int]] = collections.deque()
+        self._bytes = 0
+        self._end: t.Optional[BaseException] = None
 
     def __aiter__(self) -> "WrappedCursor":
         return self
 
     async def __anext__(self) -> RawDocument:
-        return await self.model._after_read(await self.cursor.next())
+        if not self._buffer:
+            documents = await self._fetch()
+            self.model._observe_batch(self.operation, documents)
+            with self.model._timer(self.operation, "hooks"):
+                self._buffer.extend(await self.hydrate(documents))
+        return self._buffer.popleft()
 
     def __await__(self):
         # todo types?
         return self.to_list().__await__()
 
+    async def _next_batch(self) -> t.List[dict]:
+        """Documents left from the current server batch, fetching next if empty"""
+        documents = [await self.cursor.next()]
+        for _ in range(self.cursor._buffer_size()):
+            documents.append(await self.cursor.next())
+        return documents
+
+    async def _fetch(self) -> t.List[t.Any]:
+        """Next server batch, from the prefetched ones in prefetch mode"""
+        if not self.depth:
+            with self.model._timer(self.operation, "server"):
+                return await self._next_batch()
+
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._prefetch())
+        async with self._ready:
+            await self._ready.wait_for(lambda: self._batches or self._end)
+            if not self._batches:
+                raise t.cast(BaseException, self._end)
+            documents, size = self._batches.popleft()
+            self._bytes -= size
+            self._ready.notify_all()
+        return documents
+
+    def _has_room(self) -> bool:
+        if len(self._batches) >= self.depth:
+            return False
+        return self.max_bytes is None or self._bytes < self.max_bytes
+
+    async def _prefetch(self) -> None:
+        try:
+            while True:
+                async with self._ready:
+                    await self._ready.wait_for(self._has_room)
+                with self.model._timer(self.operation, "server"):
+                    documents = await self._next_batch()
+                size = 0
+                if self.max_bytes is not None:
+                    size = sum(
+                        len(document.raw)
+                        if isinstance(document, RawBSONDocument)
+                        else len(bson.encode(document))
+                        for document in documents
+                    )
+                async with self._ready:
+                    self._batches.append((documents, size))
+                    self._bytes += size
+                    self._ready.notify_all()
+        except Exception as e:  # StopAsyncIteration at the end
+            async with self._ready:
+                self._end = e
+                self._ready.notify_all()
+
+    def prefetch(self, depth: int = 1, *, max_bytes: int = None) -> "WrappedCursor":
+        """
+        Fetch up to depth server batches in background while one is consumed
+
+        Server round trips overlap with hooks and the consumer's work.
+        A batch is fetched only while the waiting ones take less than
+        max_bytes of BSON, decoded documents are encoded to measure them.
+        Call close() when leaving the cursor before its end.
+        """
+        if depth < 1:
+            raise ValueError(f"depth must be at least 1, got {depth}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}")
+        self.depth = depth
+        self.max_bytes = max_bytes
+        return self
+
+    async def close(self) -> None:
+        """Stop prefetching and close the server cursor"""
+        if self._task is not None:
+            self._task.cancel()
+            # the server cursor is not used by the task once it is closed
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        await self.cursor.close()
+
     async def to_list(self, length: int = None) -> t.List[RawDocument]:
-        # todo gather?
-        return [
-            await self.model._after_read(doc)
-            for doc in await self.cursor.to_list(length)
-        ]
+        result: t.List[RawDocument] = []
+        while self._buffer and (length is None or len(result) < length):
+            result.append(self._buffer.popleft())
+        while self.depth and (length is None or len(result) < length):
+            try:
+                documents = await self._fetch()
+            except StopAsyncIteration:
+                return result
+            self.model._observe_batch(self.operation, documents)
+            with self.model._timer(self.operation, "hooks"):
+                self._buffer.extend(await self.hydrate(documents))
+            while self._buffer and (length is None or len(result) < length):
+                result.append(self._buffer.popleft())
+        if length is None or len(result) < length:
+            with self.model._timer(self.operation, "server"):
+                documents = await self.cursor.to_list(
+                    None if length is None else length - len(result)
+                )
+            self.model._observe_batch(self.operation, documents)
+            with self.model._timer(self.operation, "hooks"):
+                result.extend(await self.hydrate(documents))
+        return result
+
+    async def batches(self, size: int) -> t.AsyncIterator[t.List[RawDocument]]:
+        """
+        Iterate lists of up to size documents, one server batch each
+
+        The next batch is fetched only when the previous one was consumed.
+        """
+        try:
+            self.cursor.batch_size(size)
+        except InvalidOperation:
+            pass  # already iterated, server batches are fixed
+        while batch := await self.to_list(size):
+            yield batch
 
     ##
     # Cursor operations
     #
     def clone(self, cursor: AgnosticCursor = None) -> "WrappedCursor":
-        return self.__class__(self.model, cursor=cursor or self.cursor.clone())
+        return self.__class__(
+            self.model,
+            cursor=cursor or self.cursor.clone(),
+            hydrate=self.hydrate,
+            operation=self.operation,
+            depth=self.depth,
+            max_bytes=self.max_bytes,
+        )
 
     def sort(self, *args, **kwargs) -> "WrappedCursor":
         return self.clone(cursor=self.cursor.sort(*args, **kwargs))
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import typing as t
+import weakref
+
+from motor.core import AgnosticCollection
+
+from aiomodels.base import Query
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .model import BaseModel
+
+
+__all__ = ["ensure_indexes", "explain_query"]
+
+
+logger = logging.getLogger(__name__)
+
+registry: "weakref.WeakSet[BaseModel]" = weakref.WeakSet()
+"""Models with declared indexes, ensured by ensure_indexes()"""
+
+
+async def ensure_indexes(
+    models: t.Iterable["BaseModel"] = None,
+) -> t.Dict[str, t.List[str]]:
+    """
+    Create missing declared indexes of all models concurrently
+
+    Models default to every instance with indexes, returns names of
+    the created indexes by collection.
+    """
+    models = list(registry if models is None else models)
+    created = await asyncio.gather(*[model.ensure_indexes() for model in models])
+    return {
+        model.collection.full_name: names
+        for model, names in zip(models, created)
+        if names
+    }
+
+
+def _stages(plan: t.Mapping) -> t.Iterator[str]:
+    yield plan.get("stage", "")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", ()):
+        yield from _stages(child)
+    for shard in plan.get("shards", ()):
+        yield from _stages(shard.get("winningPlan", {}))
+
+
+async def explain_query(
+    collection: AgnosticCollection,
+    query: t.Optional[Query],
+    *,
+    sort: t.Any = None,
+    limit: int = 0,
+    ratio: float = 10.0,
+) -> t.Optional[str]:
+    """Explain a find and warn on a collection scan or a poor selectivity"""
+    cursor = collection.find(query, sort=sort, limit=limit)
+    explain = await cursor.explain()
+
+    problem = None
+    stages = list(_stages(explain["queryPlanner"]["winningPlan"]))
+    stats = explain.get("executionStats", {})
+    examined = stats.get("totalDocsExamined", 0)
+    returned = stats.get("nReturned", 0)
+    if "COLLSCAN" in stages:
+        problem = "collection scan"
+    elif examined > ratio * max(returned, 1):
+        problem = f"{examined} documents examined for {returned} returned"
+
+    if problem is not None:
+        logger.warning(
+            "Poor query plan on %s, %s: %r sort=%r",
+            collection.name,
+            problem,
+            query,
+            sort,
+        )
+    return problem
@@ -0,0 +1,87 @@
+import asyncio
+import collections
+import contextlib
+import typing as t
+import weakref
+
+
+__all__ = ["Limiter"]
+
+
+class Limiter:
+    """
+    Cap of in-flight operations shared by many models
+
+    Waiters are queued by key, a released slot goes to the next key in
+    round-robin order, so a model with a long fan-out does not starve
+    the others. slot() is reentrant within a task, a hook running in
+    a slot of a fan-out does not wait for a second one. Tasks started
+    inside a slot are not its holders and wait for their own.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+
+        self._queues: t.OrderedDict[
+            t.Any, t.Deque[asyncio.Future]
+        ] = collections.OrderedDict()
+        # tasks holding a slot, keyed by task so copied contexts do not inherit it
+        self._holders: "weakref.WeakSet[asyncio.Task]" = weakref.WeakSet()
+
+    def __len__(self) -> int:
+        """Waiting operations"""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self, key: t.Any = None) -> None:
+        if self.active < self.limit and not self._queues:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, collections.deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # the slot was handed over already
+            else:
+                self._discard(key, future)
+            raise
+
+    def release(self) -> None:
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                future.set_result(None)  # the slot passes to the waiter
+                return
+        self.active -= 1
+
+    def _discard(self, key: t.Any, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            if not queue:
+                del self._queues[key]
+
+    @contextlib.asynccontextmanager
+    async def slot(self, key: t.Any = None) -> t.AsyncIterator[None]:
+        task = asyncio.current_task()
+        if task is not None and task in self._holders:
+            yield
+            return
+
+        await self.acquire(key)
+        if task is not None:
+            self._holders.add(task)
+        try:
+            yield
+        finally:
+            if task is not None:
+                self._holders.discard(task)
+            self.release()
@@ -0,0 +1,117 @@
+import asyncio
+import copy
+import typing as t
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from motor.core import AgnosticCollection
+
+from aiomodels.base import Projection, RawDocument
+from aiomodels.core.query import projection_key
+
+
+__all__ = ["Loader"]
+
+
+class _Batch:
+    __slots__ = ("collection", "projection", "waiters", "dispatched")
+
+    def __init__(
+        self, collection: AgnosticCollection, projection: t.Optional[Projection]
+    ):
+        self.collection = collection
+        self.projection = projection
+        self.waiters: t.Dict[t.Any, t.List[asyncio.Future]] = {}
+        self.dispatched = False
+
+
+class Loader:
+    """
+    Coalesce concurrent loads by _id into one find with $in
+
+    Loads are collected until the end of the current loop iteration or for
+    window_ms, identical _id's share one slot of the query.
+    """
+
+    def __init__(self, *, window_ms: float = 0, max_batch: int = 1000) -> None:
+        self.window_ms = window_ms
+        self.max_batch = max_batch
+
+        self.loads = 0
+        self.queries = 0
+
+        self._batches: t.Dict[t.Tuple[int, t.Any], _Batch] = {}
+        self._tasks: t.Set[asyncio.Future] = set()
+
+    async def load(
+        self, collection: AgnosticCollection, _id: t.Any, projection: Projection = None
+    ) -> t.Optional[RawDocument]:
+        loop = asyncio.get_running_loop()
+        key = (id(collection), projection_key(projection))
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch(collection, projection)
+            if self.window_ms:
+                loop.call_later(self.window_ms / 1000, self._dispatch, key, batch)
+            else:
+                loop.call_soon(self._dispatch, key, batch)
+
+        future = loop.create_future()
+        batch.waiters.setdefault(_id, []).append(future)
+        self.loads += 1
+        if len(batch.waiters) >= self.max_batch:
+            self._dispatch(key, batch)
+        return await future
+
+    def _dispatch(self, key: t.Tuple[int, t.Any], batch: _Batch) -> None:
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        if batch.dispatched:
+            return
+        batch.dispatched = True
+
+        task = asyncio.ensure_future(self._fetch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, batch: _Batch) -> None:
+        self.queries += 1
+        projection = batch.projection
+        exclude_id = False
+        if projection is not None and not projection.get("_id", True):
+            # _id is needed to match the callers
+            exclude_id = True
+            projection = {k: v for k, v in projection.items() if k != "_id"} or None
+        try:
+            cursor = batch.collection.find(
+                {"_id": {"$in": list(batch.waiters)}}, projection=projection
+            )
+            documents = {
+                doc["_id"]: self._without_id(batch, doc) if exclude_id else doc
+                for doc in await cursor.to_list(None)
+            }
+        except Exception as e:
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for _id, futures in batch.waiters.items():
+            document = documents.get(_id)
+            for i, future in enumerate(futures):
+                if future.done():
+                    continue
+                # every caller owns its document
+                future.set_result(
+                    document if i == 0 or document is None else copy.deepcopy(document)
+                )
+
+    @staticmethod
+    def _without_id(batch: _Batch, document: RawDocument) -> RawDocument:
+        if isinstance(document, RawBSONDocument):
+            # raw documents are immutable, encoded again without the key
+            fields = {k: v for k, v in document.items() if k != "_id"}
+            return type(document)(bson.encode(fields), batch.collection.codec_options)
+        del document["_id"]
+        return document
@@ -0,0 +1,217 @@
+import bisect
+import contextlib
+import threading
+import time
+import typing as t
+
+from pymongo import monitoring
+
+
+__all__ = ["Metrics", "Histogram", "CommandMetrics"]
+
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000)
+
+Labels = t.Tuple[str, ...]
+
+NULL_TIMER: t.ContextManager = contextlib.nullcontext()
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: t.Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the quantile"""
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "buckets": dict(zip(self.buckets, self.counts)),
+            "count": self.count,
+            "sum": self.sum,
+        }
+
+
+class _Timer:
+    __slots__ = ("metrics", "labels", "start")
+
+    def __init__(self, metrics: "Metrics", labels: Labels) -> None:
+        self.metrics = metrics
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.metrics.observe(self.labels, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.error(self.labels)
+
+
+class Metrics:
+    """
+    In-process registry of latencies, sizes and errors
+
+    Latencies are labelled by (model, operation, phase), where phase is
+    "server" for the MongoDB call and "hooks" for _before_*/_after_* hooks.
+    """
+
+    def __init__(self, *, measure_bytes: bool = False) -> None:
+        self.measure_bytes = measure_bytes
+        """Encode decoded dict documents to count their bytes, RawBSONDocument is free"""
+
+        self.latency: t.Dict[Labels, Histogram] = {}
+        self.documents: t.Dict[Labels, Histogram] = {}
+        self.bytes_decoded: t.Dict[str, int] = {}
+        self.bytes_encoded: t.Dict[str, int] = {}
+        """Bytes of documents written, counted apart from the ones read"""
+        self.errors: t.Dict[Labels, int] = {}
+        self._lock = threading.Lock()  # command listeners run in driver threads
+
+    def timer(self, model: str, operation: str, phase: str) -> t.ContextManager:
+        return _Timer(self, (model, operation, phase))
+
+    def observe(self, labels: Labels, seconds: float) -> None:
+        with self._lock:
+            histogram = self.latency.get(labels)
+            if histogram is None:
+                histogram = self.latency[labels] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def error(self, labels: Labels) -> None:
+        with self._lock:
+            self.errors[labels] = self.errors.get(labels, 0) + 1
+
+    def batch(self, model: str, operation: str, documents: int) -> None:
+        labels = (model, operation)
+        with self._lock:
+            histogram = self.documents.get(labels)
+            if histogram is None:
+                histogram = self.documents[labels] = Histogram(SIZE_BUCKETS)
+            histogram.observe(documents)
+
+    def decoded(self, model: str, size: int) -> None:
+        with self._lock:
+            self.bytes_decoded[model] = self.bytes_decoded.get(model, 0) + size
+
+    def encoded(self, model: str, size: int) -> None:
+        with self._lock:
+            self.bytes_encoded[model] = self.bytes_encoded.get(model, 0) + size
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "latency": {k: v.snapshot() for k, v in self.latency.items()},
+                "documents": {k: v.snapshot() for k, v in self.documents.items()},
+                "bytes_decoded": dict(self.bytes_decoded),
+                "bytes_encoded": dict(self.bytes_encoded),
+                "errors": dict(self.errors),
+            }
+
+    def render(self) -> str:
+        """Prometheus text exposition"""
+        lines = []
+        snapshot = self.snapshot()
+        for name, labels_names, histograms in (
+            (
+                "aiomodels_latency_seconds",
+                ("model", "operation", "phase"),
+                snapshot["latency"],
+            ),
+            (
+                "aiomodels_batch_documents",
+                ("model", "operation"),
+                snapshot["documents"],
+            ),
+        ):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in histograms.items():
+                base = ",".join(f'{k}="{v}"' for k, v in zip(labels_names, labels))
+                total = 0
+                for bound, count in histogram["buckets"].items():
+                    total += count
+                    lines.append(f'{name}_bucket{{{base},le="{bound}"}} {total}')
+                lines.append(f'{name}_bucket{{{base},le="+Inf"}} {histogram["count"]}')
+                lines.append(f"{name}_sum{{{base}}} {histogram['sum']}")
+                lines.append(f"{name}_count{{{base}}} {histogram['count']}")
+
+        lines.append("# TYPE aiomodels_decoded_bytes_total counter")
+        for model, size in snapshot["bytes_decoded"].items():
+            lines.append(f'aiomodels_decoded_bytes_total{{model="{model}"}} {size}')
+
+        lines.append("# TYPE aiomodels_encoded_bytes_total counter")
+        for model, size in snapshot["bytes_encoded"].items():
+            lines.append(f'aiomodels_encoded_bytes_total{{model="{model}"}} {size}')
+
+        lines.append("# TYPE aiomodels_errors_total counter")
+        for (model, operation, phase), count in snapshot["errors"].items():
+            lines.append(
+                f'aiomodels_errors_total{{model="{model}",operation="{operation}",'
+                f'phase="{phase}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Driver command latencies as ("collection", "command", "driver")
+
+    Pass to the client: AsyncIOMotorClient(event_listeners=[CommandMetrics(m)])
+    """
+
+    def __init__(self, metrics: Metrics) -> None:
+        self.metrics = metrics
+        self._collections: t.Dict[t.Tuple[t.Any, int], str] = {}
+
+    def _labels(self, event) -> Labels:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        return collection, event.command_name, "driver"
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        name = event.command.get(event.command_name)
+        if isinstance(name, str):
+            key = (event.connection_id, event.request_id)
+            self._collections[key] = name
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self.metrics.observe(self._labels(event), event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        labels = self._labels(event)
+        self.metrics.observe(labels, event.duration_micros / 1e6)
+        self.metrics.error(labels)
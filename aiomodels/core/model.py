@@ -1,20 +1,69 @@
 import asyncio
+import collections
+import contextlib
+import concurrent.futures
+import functools
+import logging
 import typing as t
 
+import bson
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 from motor.core import AgnosticDatabase, AgnosticCollection
-from pymongo.errors import DuplicateKeyError
+from pymongo import IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pymongo.collection import ReturnDocument
 
 from aiomodels.base import Projection, Query
-from aiomodels.core.cursor import WrappedCursor
+from aiomodels.core.bulk import DUPLICATE_KEY_CODES, BulkWriter
+from aiomodels.core.cache import IdentityCache
+from aiomodels.core.indexes import explain_query, registry
+from aiomodels.core.limiter import Limiter
+from aiomodels.core.loader import Loader
+from aiomodels.core.metrics import NULL_TIMER, Metrics
+from aiomodels.core.offload import Hydrator, decoded, hydrate_raw
+from aiomodels.core.cursor import Hydrate, WrappedCursor
+from aiomodels.core.profiler import HookProfiler
+from aiomodels.core.record import Record, record_class
+from aiomodels.core.pagination import (
+    Page,
+    Sort,
+    encode_token,
+    keyset_query,
+    page_projection,
+    without_paths,
+)
+from aiomodels.core.query import query_id
 
 
-__all__ = ["BaseModel"]
+__all__ = ["BaseModel", "CreateManyResult", "UpdateManyResult"]
 
 
+logger = logging.getLogger(__name__)
+
 T = t.TypeVar("T")
 P = t.TypeVar("P")
+R = t.TypeVar("R")
+
+
+async def _aiter(items: t.Union[t.Iterable, t.AsyncIterable]) -> t.AsyncIterator:
+    if isinstance(items, t.AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class CreateManyResult(t.NamedTuple):
+    documents: t.List[t.Any]
+    errors: t.List[DuplicateKeyError]
+    """Duplicates, details contain the document as op and its input index"""
+
+
+class UpdateManyResult(t.NamedTuple):
+    matched_count: int
+    modified_count: int
 
 
 class BaseModel(t.Generic[T, P]):
@@ -22,15 +71,248 @@ class BaseModel(t.Generic[T, P]):
     collection_name: str
     collection: AgnosticCollection
 
-    def __init__(self, db: AgnosticDatabase, collection_name: str):
+    bulk_size: int = 1000
+    """Documents per round trip for chunked bulk operations"""
+    bulk_bytes: int = 16 * 1024 * 1024
+    """Encoded documents size per insert_many batch"""
+    concurrency: int = 32
+    """In-flight hook calls of a fan-out such as _after_read_many"""
+    raw: bool = False
+    """Read RawBSONDocument by default, fields are decoded lazily on access"""
+    offload_batch: int = 500
+    """Documents per executor task, smaller cursor batches are hydrated inline"""
+
+    record_fields: t.ClassVar[t.Sequence[str]] = ()
+    """Fields of read results as slotted records, e.g. schema_fields(Schema)"""
+    record_class: t.ClassVar[t.Optional[t.Type[Record]]] = None
+    """Generated from record_fields, returned by _after_read"""
+
+    indexes: t.ClassVar[t.Sequence[IndexModel]] = ()
+    """Declared indexes, created by ensure_indexes()"""
+    explain: bool = False
+    """Debug mode, queries of read_one/read_many/update_one are explained"""
+    explain_ratio: float = 10.0
+    """Examined per returned documents above which a plan is logged"""
+
+    cache: t.Optional[IdentityCache]
+    """Cache of read_one by _id, invalidated by writes of this instance"""
+
+    loader: t.Optional[Loader]
+    """Coalesces concurrent read_one by _id into one query"""
+
+    metrics: t.Optional[Metrics]
+    """Latencies of server calls and hooks, disabled when None"""
+
+    profiler: t.Optional[HookProfiler]
+    """Per-hook wall and await times, hooks are wrapped on this instance only"""
+
+    limiter: t.Optional[Limiter]
+    """Cap of in-flight fan-out calls shared with other models, fair between them"""
+
+    executor: t.Optional[concurrent.futures.Executor]
+    """Pool decoding and hydrating cursor batches off the event loop"""
+
+    def __init__(
+        self,
+        db: AgnosticDatabase,
+        collection_name: str,
+        *,
+        cache: IdentityCache = None,
+        loader: Loader = None,
+        metrics: Metrics = None,
+        profiler: HookProfiler = None,
+        limiter: Limiter = None,
+        executor: concurrent.futures.Executor = None,
+    ):
         self.db = db
         self.collection_name = collection_name
         self.collection = db[self.collection_name]
+        self.cache = cache
+        self.loader = loader
+        self.metrics = metrics
+        self.profiler = profiler
+        self.limiter = limiter
+        self.executor = executor
+        if profiler is not None:
+            profiler.install(self)
+        if self.indexes:
+            registry.add(self)
+        self._tasks: t.Set[asyncio.Future] = set()
+
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        if "record_fields" not in cls.__dict__:
+            return
+        cls.record_class = None
+        if cls.record_fields:
+            record = record_class(f"{cls.__name__}Record", cls.record_fields)
+            record.__module__ = cls.__module__
+            record.__qualname__ = f"{cls.__qualname__}.record_class"  # picklable
+            cls.record_class = record
 
     @staticmethod
     def generate_id() -> P:
         return ObjectId()
 
+    @functools.cached_property
+    def raw_collection(self) -> AgnosticCollection:
+        codec_options = self.collection.codec_options.with_options(
+            document_class=RawBSONDocument
+        )
+        return self.collection.with_options(codec_options=codec_options)
+
+    def get_collection(self, raw: bool = None) -> AgnosticCollection:
+        return (
+            self.raw_collection
+            if (self.raw if raw is None else raw)
+            else self.collection
+        )
+
+    def _overrides(self, *names: str) -> bool:
+        """Check if any of the hooks is redefined by a subclass"""
+        cls = type(self)
+        return any(getattr(cls, name) is not getattr(BaseModel, name) for name in names)
+
+    def _timer(self, operation: str, phase: str) -> t.ContextManager:
+        if self.metrics is None:
+            return NULL_TIMER
+        return self.metrics.timer(self.collection_name, operation, phase)
+
+    def _observe_batch(
+        self, operation: str, documents: t.List[t.Any], *, written: bool = False
+    ) -> None:
+        metrics = self.metrics
+        if metrics is None:
+            return
+        metrics.batch(self.collection_name, operation, len(documents))
+        size = 0
+        for document in documents:
+            if isinstance(document, RawBSONDocument):
+                size += len(document.raw)
+            elif metrics.measure_bytes:
+                size += len(bson.encode(document))
+        if size:
+            if written:
+                metrics.encoded(self.collection_name, size)
+            else:
+                metrics.decoded(self.collection_name, size)
+
+    def _invalidate(self, query: t.Any, document: dict = None) -> None:
+        if self.cache is None:
+            return
+        if document is not None and "_id" in document:
+            self.cache.invalidate(document["_id"])
+        else:
+            self.cache.invalidate_query(query)
+
+    ##
+    # Concurrency
+    #
+    @contextlib.asynccontextmanager
+    async def slot(self) -> t.AsyncIterator[None]:
+        """Slot of the shared limiter, for hooks doing their own I/O"""
+        if self.limiter is None:
+            yield
+            return
+        async with self.limiter.slot(self):
+            yield
+
+    async def map(
+        self,
+        fn: t.Callable[[t.Any], t.Awaitable[R]],
+        items: t.Union[t.Iterable, t.AsyncIterable],
+        *,
+        concurrency: int = None,
+    ) -> t.List[R]:
+        """
+        Await fn for every item, at most concurrency calls are in flight
+
+        Items are pulled by the workers as they get free, so a cursor is
+        streamed rather than read upfront. Every call holds a slot of
+        the limiter. Results keep the order of items.
+        """
+        workers = concurrency or self.concurrency
+        if isinstance(items, t.Sized):
+            workers = min(workers, len(items))
+        if workers <= 0:
+            return []
+
+        iterator = _aiter(items).__aiter__()
+        lock = asyncio.Lock()
+        results: t.Dict[int, R] = {}
+
+        async def worker() -> None:
+            while True:
+                async with lock:
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                    i = len(results)
+                    results[i] = t.cast(R, None)  # reserve the position
+                async with self.slot():
+                    results[i] = await fn(item)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # slots of the cancelled calls are released before returning
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return list(results.values())
+
+    ##
+    # Indexes
+    #
+    async def ensure_indexes(self) -> t.List[str]:
+        """Create declared indexes missing in the collection, returns their names"""
+        existing = await self.collection.index_information()
+        missing = []
+        for index in self.indexes:
+            document = index.document
+            info = existing.get(document["name"])
+            if info is None:
+                missing.append(index)
+            elif [tuple(key) for key in info["key"]] != list(document["key"].items()):
+                logger.warning(
+                    "Index %s of %s differs from the declared one",
+                    document["name"],
+                    self.collection_name,
+                )
+        if not missing:
+            return []
+        return await self.collection.create_indexes(missing)
+
+    async def _explain(self, query: t.Any, *, sort=None, limit: int = 0) -> None:
+        if query_id(query) is not None:
+            return  # by _id is always indexed
+        await explain_query(
+            self.collection, query, sort=sort, limit=limit, ratio=self.explain_ratio
+        )
+
+    async def _read_ids(
+        self, query: Query, *, size: int, session=None
+    ) -> t.AsyncIterator[t.List[P]]:
+        # sort by _id so the scan walks the _id index, _id never changes,
+        # so each document is met at most once per call
+        cursor = self.collection.find(
+            filter=query,
+            projection={"_id": True},
+            sort=[("_id", 1)],
+            batch_size=size,
+            session=session,
+        )
+        chunk: t.List[P] = []
+        async for doc in cursor:
+            chunk.append(doc["_id"])
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
     ##
     # Create
     #
@@ -43,41 +325,376 @@ class BaseModel(t.Generic[T, P]):
         return t.cast(T, document)
 
     async def create_one(self, new: T) -> T:
-        document: dict = await self._before_create(new)
+        with self._timer("create", "hooks"):
+            document: dict = await self._before_create(new)
         try:
-            await self.collection.insert_one(document)
+            with self._timer("create", "server"):
+                await self.collection.insert_one(document)
         except DuplicateKeyError:
             raise  # todo
-        return await self._after_create(document)
+        with self._timer("create", "hooks"):
+            return await self._after_create(document)
+
+    async def _create_batches(
+        self, new: t.Union[t.Iterable[T], t.AsyncIterable[T]], *, size: int
+    ) -> t.AsyncIterator[t.List[dict]]:
+        batch: t.List[dict] = []
+        batch_bytes = 0
+        async for item in _aiter(new):
+            with self._timer("create_many", "hooks"):
+                document = await self._before_create(item)
+            length = len(bson.encode(document))
+            if batch and (len(batch) >= size or batch_bytes + length > self.bulk_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(document)
+            batch_bytes += length
+        if batch:
+            yield batch
+
+    async def _insert_batch(
+        self, batch: t.List[dict], *, offset: int, session=None
+    ) -> CreateManyResult:
+        failed: t.Dict[int, dict] = {}
+        try:
+            with self._timer("create_many", "server"):
+                await self.collection.insert_many(batch, ordered=False, session=session)
+        except BulkWriteError as e:
+            errors = e.details["writeErrors"]
+            if any(error["code"] not in DUPLICATE_KEY_CODES for error in errors):
+                raise
+            failed = {error["index"]: error for error in errors}
+
+        self._observe_batch("create_many", batch, written=True)
+        documents: t.List[t.Any] = [
+            document for i, document in enumerate(batch) if i not in failed
+        ]
+        if self._overrides("_after_create"):
+            with self._timer("create_many", "hooks"):
+                documents = await self.map(self._after_create, documents)
+        return CreateManyResult(
+            documents=documents,
+            errors=[
+                DuplicateKeyError(
+                    error["errmsg"], error["code"], {**error, "index": offset + i}
+                )
+                for i, error in failed.items()
+            ],
+        )
+
+    async def create_many_iter(
+        self,
+        new: t.Union[t.Iterable[T], t.AsyncIterable[T]],
+        *,
+        bulk_size: int = None,
+        in_flight: int = 2,
+        session=None,
+    ) -> t.AsyncIterator[CreateManyResult]:
+        """
+        Insert documents with up to in_flight batches at a time
+
+        Yields a result per batch in the input order, the input is consumed
+        only as fast as results are, so memory is bounded on unbounded input.
+        """
+        if in_flight < 1:
+            raise ValueError(f"in_flight must be at least 1, got {in_flight}")
+        pending: t.Deque[asyncio.Future] = collections.deque()
+        offset = 0
+        try:
+            async for batch in self._create_batches(
+                new, size=bulk_size or self.bulk_size
+            ):
+                if len(pending) >= in_flight:
+                    yield await pending.popleft()
+                pending.append(
+                    asyncio.ensure_future(
+                        self._insert_batch(batch, offset=offset, session=session)
+                    )
+                )
+                offset += len(batch)
+            while pending:
+                yield await pending.popleft()
+        finally:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def create_many(
+        self,
+        new: t.Union[t.Iterable[T], t.AsyncIterable[T]],
+        *,
+        bulk_size: int = None,
+        session=None,
+    ) -> CreateManyResult:
+        """
+        Insert documents with unordered insert_many
+
+        Duplicates do not stop the load, they are returned in errors.
+        """
+        result = CreateManyResult(documents=[], errors=[])
+        async for batch in self.create_many_iter(
+            new, bulk_size=bulk_size, session=session
+        ):
+            result.documents.extend(batch.documents)
+            result.errors.extend(batch.errors)
+        return result
 
     ##
     # Read
     #
     async def _after_read(self, document: dict) -> T:
+        if self.record_class is not None:
+            return t.cast(T, self.record_class.from_document(document))
         return t.cast(T, document)
 
+    async def _after_read_many(self, documents: t.List[dict]) -> t.List[T]:
+        if not self._overrides("_after_read"):
+            if self.record_class is not None:
+                return t.cast(t.List[T], self.record_class.many(documents))
+            return t.cast(t.List[T], documents)
+
+        return await self.map(self._after_read, documents)
+
+    def _hydrator(self) -> t.Optional[Hydrator]:
+        """
+        Picklable sync equivalent of _after_read_many for the executor
+
+        None keeps hydration on the event loop, the default for models
+        overriding the async read hooks.
+        """
+        if self._overrides("_after_read", "_after_read_many"):
+            return None
+        if self.record_class is not None:
+            return self.record_class.many
+        return decoded
+
+    def _offloads(self, raw: t.Optional[bool]) -> bool:
+        if self.executor is None or (self.raw if raw is None else raw):
+            return False
+        return self._hydrator() is not None
+
+    async def _after_read_offload(self, documents: t.List[RawBSONDocument]) -> list:
+        """
+        Decode and hydrate raw documents in the executor
+
+        Batches are split into tasks of offload_batch documents, their
+        results are joined in order. Results of a process pool are
+        unpickled on this process, so it pays off when building them
+        costs more than that, e.g. with heavy validators.
+        """
+        hydrator = t.cast(Hydrator, self._hydrator())
+        codec_options = self.collection.codec_options
+        size = self.offload_batch
+        if len(documents) < size:
+            raw = b"".join(document.raw for document in documents)
+            return hydrate_raw(hydrator, raw, codec_options)
+
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    self.executor,
+                    hydrate_raw,
+                    hydrator,
+                    b"".join(document.raw for document in documents[i : i + size]),
+                    codec_options,
+                )
+                for i in range(0, len(documents), size)
+            ]
+        )
+        return [result for chunk in chunks for result in chunk]
+
     async def read_one(
         self,
         query: t.Union[ObjectId, str, Query] = None,
         *,
         projection: Projection = None,
         strict: bool = True,
+        raw: bool = None,
     ) -> t.Optional[T]:  # todo upsert
-        doc = await self.collection.find_one(filter=query, projection=projection)
+        collection = self.get_collection(raw)
+
+        cache, key, version = self.cache, None, 0
+        if cache is not None and (key := cache.key(query, projection)) is not None:
+            data = cache.get(key)
+            if data is not None:
+                codec_options = collection.codec_options
+                with self._timer("read", "cache"):
+                    if issubclass(codec_options.document_class, RawBSONDocument):
+                        document = RawBSONDocument(data, codec_options)
+                    else:
+                        document = bson.decode(data, codec_options)
+                with self._timer("read", "hooks"):
+                    return await self._after_read(document)
+            version = cache.version
+
+        if self.explain:
+            await self._explain(query, limit=1)
+        with self._timer("read", "server"):
+            if self.loader is not None and (_id := query_id(query)) is not None:
+                doc = await self.loader.load(collection, _id, projection)
+            else:
+                doc = await collection.find_one(filter=query, projection=projection)
         if doc is not None:
-            return await self._after_read(doc)
+            if cache is not None and key is not None:
+                encoded = doc.raw if isinstance(doc, RawBSONDocument) else None
+                cache.set(key, encoded or bson.encode(doc), version=version)
+            with self._timer("read", "hooks"):
+                return await self._after_read(doc)
         elif strict:
             raise Exception("not found")
         return None
 
     def read_many(
-        self, query: Query = None, *, projection: Projection = None, **kwargs
+        self,
+        query: Query = None,
+        *,
+        projection: Projection = None,
+        raw: bool = None,
+        **kwargs,
     ) -> WrappedCursor:
+        """
+        Cursor over matched documents
+
+        With raw=True documents are RawBSONDocument, their raw attribute
+        holds the bytes as received for pass-through without decoding.
+        """
+        if self.explain:
+            task = asyncio.ensure_future(
+                self._explain(
+                    query, sort=kwargs.get("sort"), limit=kwargs.get("limit", 0)
+                )
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        offload = self._offloads(raw)
         return WrappedCursor(
             self,
-            filter=query,
-            projection=projection,
-            **kwargs,
+            cursor=self.get_collection(raw or offload).find(
+                filter=query,
+                projection=projection,
+                **kwargs,
+            ),
+            hydrate=self._after_read_offload if offload else None,
+        )
+
+    async def read_page(
+        self,
+        query: Query = None,
+        *,
+        limit: int,
+        sort: Sort = ("_id", 1),
+        after: str = None,
+        projection: Projection = None,
+        raw: bool = None,
+    ) -> Page:
+        """
+        Keyset pagination, next page starts after the token of the previous
+
+        Sorts by (key, _id), so an index on them serves any page depth.
+        The sort key should be present in all documents with one type,
+        a projection may not exclude it.
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        key, direction = sort
+        # the token needs the sort key and _id of the last document
+        fetched, added = page_projection(projection, key)
+
+        cursor = self.read_many(
+            keyset_query(query, sort, after),
+            projection=fetched,
+            sort=[(key, direction)] if key == "_id" else [sort, ("_id", direction)],
+            limit=limit,
+            raw=raw,
+        )
+        with self._timer("read_page", "server"):
+            documents = await cursor.cursor.to_list(limit)
+        self._observe_batch("read_page", documents)
+        token = None
+        if documents and len(documents) == limit:
+            token = encode_token(sort, documents[-1])
+        if added:
+            # raw when offloaded, the cursor hydrates them in the executor
+            codec_options = self.get_collection(
+                raw or self._offloads(raw)
+            ).codec_options
+            documents = [
+                without_paths(document, added, codec_options) for document in documents
+            ]
+        with self._timer("read_page", "hooks"):
+            return Page(await cursor.hydrate(documents), next=token)
+
+    async def scan(
+        self, query: Query = None, *, size: int = None, projection: Projection = None
+    ) -> t.AsyncIterator[t.List[T]]:
+        """Walk all matched documents in _id order with pages of size"""
+        page = Page([], next=None)
+        while True:
+            page = await self.read_page(
+                query,
+                limit=size or self.bulk_size,
+                after=page.next,
+                projection=projection,
+            )
+            if page.documents:
+                yield page.documents
+            if page.next is None:
+                break
+
+    def aggregate(
+        self,
+        pipeline: t.Sequence[t.Mapping],
+        *,
+        result: t.Callable[[t.Any], R] = None,
+        hooks: bool = True,
+        raw: bool = None,
+        allow_disk_use: bool = None,
+        batch_size: int = None,
+        max_time_ms: int = None,
+        hint: t.Any = None,
+        session=None,
+        **kwargs,
+    ) -> WrappedCursor:
+        """
+        Cursor over the output of an aggregation pipeline
+
+        Output documents pass through _after_read_many as with read_many,
+        which suits pipelines keeping the shape of stored documents.
+        $group/$facet output has its own shape: result builds every
+        document instead of the hooks (e.g. a pydantic model's from_db),
+        hooks=False returns them as they are.
+        """
+        options = {
+            "allowDiskUse": allow_disk_use,
+            "batchSize": batch_size,
+            "maxTimeMS": max_time_ms,
+            "hint": hint,
+        }
+        kwargs.update((k, v) for k, v in options.items() if v is not None)
+
+        async def unchanged(documents: t.List[t.Any]) -> t.List[t.Any]:
+            return documents
+
+        hydrate: t.Optional[Hydrate] = None
+        if result is not None:
+            convert = result
+
+            async def build(documents: t.List[t.Any]) -> t.List[t.Any]:
+                return [convert(document) for document in documents]
+
+            hydrate = build
+        elif not hooks:
+            hydrate = unchanged
+        elif self._offloads(raw):
+            hydrate = self._after_read_offload
+            raw = True
+
+        return WrappedCursor(
+            self,
+            cursor=self.get_collection(raw).aggregate(
+                list(pipeline), session=session, **kwargs
+            ),
+            hydrate=hydrate,
+            operation="aggregate",
         )
 
     ##
@@ -115,34 +732,101 @@ class BaseModel(t.Generic[T, P]):
         strict: bool = True,
     ) -> t.Optional[T]:
         # todo session
-        kwargs = await self._before_update(
-            query=query, update=update, upsert=upsert, sort=sort
-        )
+        with self._timer("update", "hooks"):
+            kwargs = await self._before_update(
+                query=query, update=update, upsert=upsert, sort=sort
+            )
+        if self.explain:
+            await self._explain(kwargs["filter"], sort=kwargs["sort"], limit=1)
 
         try:
-            document = await self.collection.find_one_and_update(
-                **kwargs,
-                projection=projection,
-                session=session,
-            )
+            with self._timer("update", "server"):
+                document = await self.collection.find_one_and_update(
+                    **kwargs,
+                    projection=projection,
+                    session=session,
+                )
         except DuplicateKeyError:
             raise  # todo
         # todo pymongo.errors.OperationFailure: Updating the path 'name' would create a conflict at 'name', full error: {'ok': 0.0, 'errmsg': "Updating the path 'name' would create a conflict at 'name'", 'code': 40, 'codeName': 'ConflictingUpdateOperators'}
+        self._invalidate(query, document)
 
         if document is not None:
-            return await self._after_update(document, **kwargs)
+            with self._timer("update", "hooks"):
+                return await self._after_update(document, **kwargs)
         elif strict:
             raise Exception("not found")
 
         return None
 
-    async def update_many(self, query: Query, update: dict) -> int:
-        aws = [
-            self.update_one(query={"_id": doc["_id"]}, update=update)
-            async for doc in self.read_many(query=query, projection={"_id": True})
+    async def _before_update_many(
+        self, ids: t.List[P], update: dict
+    ) -> t.List[UpdateOne]:
+        requests = await self.map(
+            lambda _id: self._before_update(query={"_id": _id}, update=update), ids
+        )
+        return [
+            UpdateOne(kwargs["filter"], kwargs["update"], upsert=kwargs["upsert"])
+            for kwargs in requests
         ]
-        result = await asyncio.gather(*aws)
-        return len(result)
+
+    async def _after_update_many(self, ids: t.List[P], update: dict, session=None):
+        if not self._overrides("_after_update"):
+            return
+        cursor = self.collection.find(
+            filter={"_id": {"$in": ids}}, batch_size=len(ids), session=session
+        )
+        await self.map(
+            lambda doc: self._after_update(doc, update=update, upsert=False), cursor
+        )
+
+    async def update_many(
+        self,
+        query: Query,
+        update: dict,
+        *,
+        bulk_size: int = None,
+        session=None,
+    ) -> UpdateManyResult:
+        """
+        Update all matched documents
+
+        Without update hooks it is a single server-side update_many.
+        Otherwise _id's are streamed in chunks of bulk_size, every chunk is
+        sent as one bulk_write of UpdateOne from _before_update_many
+        and passed to _after_update_many.
+        """
+        hooks = (
+            "_before_update",
+            "_after_update",
+            "_before_update_many",
+            "_after_update_many",
+        )
+        if not self._overrides(*hooks):
+            with self._timer("update_many", "server"):
+                result = await self.collection.update_many(
+                    filter=query, update=update, session=session
+                )
+            self._invalidate(query)
+            return UpdateManyResult(result.matched_count, result.modified_count)
+
+        matched = modified = 0
+        async for ids in self._read_ids(
+            query, size=bulk_size or self.bulk_size, session=session
+        ):
+            with self._timer("update_many", "hooks"):
+                requests = await self._before_update_many(ids, update)
+            with self._timer("update_many", "server"):
+                result = await self.collection.bulk_write(
+                    requests, ordered=False, session=session
+                )
+            matched += result.matched_count
+            modified += result.modified_count
+            for _id in ids:
+                self._invalidate({"_id": _id})
+            with self._timer("update_many", "hooks"):
+                await self._after_update_many(ids, update, session=session)
+        return UpdateManyResult(matched, modified)
 
     ##
     # Delete
@@ -161,19 +845,66 @@ class BaseModel(t.Generic[T, P]):
         projection: Projection = None,
         strict: bool = True,
     ) -> t.Optional[T]:
-        query = await self._before_delete(query)
-        document = await self.collection.find_one_and_delete(
-            filter=query, sort=sort, projection=projection
-        )
+        with self._timer("delete", "hooks"):
+            query = await self._before_delete(query)
+        with self._timer("delete", "server"):
+            document = await self.collection.find_one_and_delete(
+                filter=query, sort=sort, projection=projection
+            )
+        self._invalidate(query, document)
         if document is not None:
-            return await self._after_delete(document)
+            with self._timer("delete", "hooks"):
+                return await self._after_delete(document)
         elif strict:
             raise Exception("not found")
         return None
 
-    async def delete_many(self, query: Query) -> int:
-        aws = [
-            self.delete_one({"_id": doc["_id"]}, projection={"_id": True})
-            async for doc in self.read_many(query, projection={"_id": True})
-        ]
-        return len(await asyncio.gather(*aws))
+    async def _after_delete_many(self, batch: t.List[dict]) -> None:
+        await self.map(self._after_delete, batch)
+
+    async def delete_many(
+        self, query: Query, *, bulk_size: int = None, session=None
+    ) -> int:
+        """
+        Delete all matched documents
+
+        Without delete hooks the query is passed straight to delete_many.
+        Otherwise _id's are streamed in chunks of bulk_size, deleted
+        with $in and passed to _after_delete_many as {"_id": ...} documents.
+        """
+        with self._timer("delete_many", "hooks"):
+            query = await self._before_delete(query)
+        if not self._overrides("_after_delete", "_after_delete_many"):
+            with self._timer("delete_many", "server"):
+                result = await self.collection.delete_many(
+                    filter=query, session=session
+                )
+            self._invalidate(query)
+            return result.deleted_count
+
+        count = 0
+        async for ids in self._read_ids(
+            query, size=bulk_size or self.bulk_size, session=session
+        ):
+            with self._timer("delete_many", "server"):
+                result = await self.collection.delete_many(
+                    filter={"_id": {"$in": ids}}, session=session
+                )
+            count += result.deleted_count
+            for _id in ids:
+                self._invalidate({"_id": _id})
+            with self._timer("delete_many", "hooks"):
+                await self._after_delete_many([{"_id": _id} for _id in ids])
+        return count
+
+    ##
+    # Bulk
+    #
+    def bulk(self, **kwargs) -> BulkWriter:
+        """
+        Writer shared by many coroutines, use as async context manager
+
+        >>> async with model.bulk(max_operations=500, max_delay_ms=50) as writer:
+        ...     await writer.update({"_id": _id}, {"$inc": {"views": 1}})
+        """
+        return BulkWriter(self, **kwargs)
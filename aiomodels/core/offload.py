@@ -0,0 +1,23 @@
+import typing as t
+
+import bson
+from bson.codec_options import CodecOptions
+
+
+__all__ = ["Hydrator", "decoded", "hydrate_raw"]
+
+
+Hydrator = t.Callable[[t.List[dict]], t.List[t.Any]]
+"""Sync batch transform, picklable to run in a process pool"""
+
+
+def decoded(documents: t.List[dict]) -> t.List[dict]:
+    """Hydrator of models without read hooks, documents as decoded"""
+    return documents
+
+
+def hydrate_raw(
+    hydrator: Hydrator, raw: bytes, codec_options: CodecOptions
+) -> t.List[t.Any]:
+    """Decode concatenated BSON documents and build results, runs in executors"""
+    return hydrator(bson.decode_all(raw, codec_options))
@@ -0,0 +1,117 @@
+import base64
+import collections.abc
+import typing as t
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.errors import BSONError
+from bson.raw_bson import RawBSONDocument
+
+from aiomodels.base import Projection, Query, RawDocument
+
+
+__all__ = [
+    "Page",
+    "encode_token",
+    "decode_token",
+    "keyset_query",
+    "page_projection",
+    "without_paths",
+]
+
+
+Sort = t.Tuple[str, int]
+
+
+class Page(t.NamedTuple):
+    documents: t.List[t.Any]
+    next: t.Optional[str]
+    """Continuation token, None on the last page"""
+
+
+def get_path(document: RawDocument, path: str) -> t.Any:
+    value: t.Any = document
+    for key in path.split("."):
+        if not isinstance(value, collections.abc.Mapping):
+            return None
+        value = value.get(key)
+    return value
+
+
+def encode_token(sort: Sort, document: RawDocument) -> str:
+    key, direction = sort
+    data = {"s": [key, direction], "v": get_path(document, key), "i": document["_id"]}
+    return base64.urlsafe_b64encode(bson.encode(data)).decode()
+
+
+def decode_token(sort: Sort, token: str) -> t.Tuple[t.Any, t.Any]:
+    try:
+        data = bson.decode(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, BSONError):
+        raise ValueError("Invalid continuation token")
+    if tuple(data["s"]) != tuple(sort):
+        raise ValueError(f"Continuation token is not for sort {sort}")
+    return data["v"], data["i"]
+
+
+def keyset_query(query: t.Optional[Query], sort: Sort, token: str = None) -> Query:
+    """Query for documents after the token, served by an index on (key, _id)"""
+    if token is None:
+        return query or {}
+
+    key, direction = sort
+    value, _id = decode_token(sort, token)
+    op = "$gt" if direction > 0 else "$lt"
+    if key == "_id":
+        seek: Query = {"_id": {op: _id}}
+    else:
+        seek = {"$or": [{key: {op: value}}, {key: value, "_id": {op: _id}}]}
+
+    if not query:
+        return seek
+    return {"$and": [query, seek]}
+
+
+def page_projection(
+    projection: t.Optional[Projection], key: str
+) -> t.Tuple[t.Optional[Projection], t.List[str]]:
+    """Projection returning what the token needs, and the paths added for it"""
+    if not projection:
+        return projection, []
+    if key != "_id" and key in projection and not projection[key]:
+        raise ValueError(f"Projection excludes the sort key {key!r}")
+
+    result = dict(projection)
+    added = []
+    if not result.get("_id", True):
+        result["_id"] = True
+        added.append("_id")
+    parts = key.split(".")
+    included = any(projection.get(".".join(parts[:i])) for i in range(len(parts)))
+    if key != "_id" and not included:
+        inclusion = any(value for name, value in projection.items() if name != "_id")
+        if inclusion:
+            result[key] = True
+            added.append(key)
+    return result, added
+
+
+def without_paths(
+    document: RawDocument, paths: t.List[str], codec_options: CodecOptions
+) -> RawDocument:
+    """Remove dotted paths, raw documents are encoded again without them"""
+    if isinstance(document, RawBSONDocument):
+        options = codec_options.with_options(document_class=dict)
+        decoded = without_paths(bson.decode(document.raw, options), paths, options)
+        return type(document)(
+            bson.encode(decoded, codec_options=options), codec_options
+        )
+
+    for path in paths:
+        *parents, name = path.split(".")
+        value: t.Any = document
+        for parent in parents:
+            value = value.get(parent) if isinstance(value, dict) else None
+        if isinstance(value, dict):
+            value.pop(name, None)
+    return document
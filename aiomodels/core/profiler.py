@@ -0,0 +1,144 @@
+import functools
+import logging
+import time
+import typing as t
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .model import BaseModel
+
+
+__all__ = ["HookProfiler", "HookStats"]
+
+
+logger = logging.getLogger(__name__)
+
+Key = t.Tuple[str, str]
+
+
+class HookStats:
+    __slots__ = ("calls", "wall", "awaited", "max")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        """Seconds from the first step to the result, nested hooks included"""
+        self.awaited = 0.0
+        """Seconds of wall spent suspended, waiting for I/O or other tasks"""
+        self.max = 0.0
+
+    @property
+    def running(self) -> float:
+        return self.wall - self.awaited
+
+
+class _Profiled:
+    __slots__ = ("profiler", "key", "coro", "query")
+
+    def __init__(
+        self, profiler: "HookProfiler", key: Key, coro: t.Awaitable, query: t.Any
+    ) -> None:
+        self.profiler = profiler
+        self.key = key
+        self.coro = coro
+        self.query = query
+
+    def __await__(self) -> t.Generator[t.Any, None, t.Any]:
+        iterator = self.coro.__await__()
+        start = time.perf_counter()
+        running = 0.0
+        value: t.Any = None
+        error: t.Optional[BaseException] = None
+        try:
+            while True:
+                step = time.perf_counter()
+                try:
+                    if error is None:
+                        future = iterator.send(value)
+                    else:
+                        future = iterator.throw(error)
+                except StopIteration as e:
+                    return e.value
+                finally:
+                    running += time.perf_counter() - step
+
+                value, error = None, None
+                try:
+                    value = yield future
+                except BaseException as e:
+                    error = e
+        finally:
+            wall = time.perf_counter() - start
+            self.profiler.record(self.key, wall, wall - running, self.query)
+
+
+class HookProfiler:
+    """
+    Wall time, await time and calls of _before_*/_after_* hooks
+
+    Installed per model instance by wrapping its bound hooks, uninstalled
+    models pay nothing. Hooks slower than slow_ms are logged with the
+    query or document they were called with.
+    """
+
+    def __init__(self, *, slow_ms: float = None) -> None:
+        self.slow_ms = slow_ms
+        self.stats: t.Dict[Key, HookStats] = {}
+
+    def install(self, model: "BaseModel") -> None:
+        name = type(model).__name__
+        for attr in dir(type(model)):
+            if attr.startswith(("_before_", "_after_")):
+                hook = getattr(model, attr)
+                if callable(hook):
+                    setattr(model, attr, self._wrap((name, attr), hook))
+
+    def uninstall(self, model: "BaseModel") -> None:
+        for attr in list(vars(model)):
+            if attr.startswith(("_before_", "_after_")):
+                delattr(model, attr)
+
+    def _wrap(self, key: Key, hook: t.Callable) -> t.Callable:
+        @functools.wraps(hook)
+        async def wrapper(*args, **kwargs):
+            query = kwargs.get("query", args[0] if args else None)
+            return await _Profiled(self, key, hook(*args, **kwargs), query)
+
+        return wrapper
+
+    def record(self, key: Key, wall: float, awaited: float, query: t.Any) -> None:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = HookStats()
+        stats.calls += 1
+        stats.wall += wall
+        stats.awaited += awaited
+        stats.max = max(stats.max, wall)
+
+        if self.slow_ms is not None and wall * 1000 >= self.slow_ms:
+            logger.warning(
+                "Slow hook %s.%s took %.1fms (%.1fms awaited): %r",
+                *key,
+                wall * 1000,
+                awaited * 1000,
+                query,
+            )
+
+    def report(self, sort: str = "wall") -> str:
+        """Table of hooks by descending total of sort: wall, running, awaited, calls"""
+        rows = sorted(
+            self.stats.items(), key=lambda item: getattr(item[1], sort), reverse=True
+        )
+        lines = [
+            f"{'hook':<40} {'calls':>8} {'wall ms':>10} {'running ms':>10} "
+            f"{'awaited ms':>10} {'max ms':>8}"
+        ]
+        for (model, hook), stats in rows:
+            lines.append(
+                f"{model + '.' + hook:<40} {stats.calls:>8} {stats.wall * 1000:>10.1f} "
+                f"{stats.running * 1000:>10.1f} {stats.awaited * 1000:>10.1f} "
+                f"{stats.max * 1000:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self.stats.clear()
@@ -0,0 +1,50 @@
+import collections.abc
+import datetime
+import typing as t
+import uuid
+
+import bson
+from bson import Decimal128, ObjectId
+
+from aiomodels.base import Projection
+
+
+__all__ = ["query_id", "projection_key"]
+
+
+SCALAR_IDS = (
+    ObjectId,
+    str,
+    bytes,
+    int,
+    float,
+    Decimal128,
+    uuid.UUID,
+    datetime.datetime,
+)
+"""Types of a plain _id value, patterns and operator documents are not ones"""
+
+
+def query_id(query: t.Any) -> t.Any:
+    """_id of a query by a single scalar _id, else None"""
+    if isinstance(query, dict):
+        if len(query) != 1 or "_id" not in query:
+            return None
+        query = query["_id"]
+    if isinstance(query, SCALAR_IDS):
+        return query
+    return None
+
+
+def projection_key(projection: t.Optional[Projection]) -> t.Optional[t.Tuple]:
+    """Hashable projection, operators such as $slice by their BSON encoding"""
+    if not projection:
+        return None
+    return tuple(
+        sorted(
+            (name, bson.encode(value))
+            if isinstance(value, collections.abc.Mapping)
+            else (name, value)
+            for name, value in projection.items()
+        )
+    )
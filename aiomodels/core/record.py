@@ -0,0 +1,120 @@
+import collections.abc
+import keyword
+import typing as t
+
+
+__all__ = ["Record", "record_class", "schema_fields"]
+
+
+R = t.TypeVar("R", bound="Record")
+
+
+class Record(collections.abc.MutableMapping):
+    """
+    Document keeping declared fields in slots instead of a dict
+
+    Fields are items and attributes, an unset one is missing like
+    an absent key. Other keys of the document are kept in __extra__.
+    """
+
+    __slots__ = ("__extra__",)
+
+    __fields__: t.ClassVar[t.Tuple[str, ...]] = ()
+    """Slotted fields in iteration order"""
+    __fieldset__: t.ClassVar[t.FrozenSet[str]] = frozenset()
+
+    __extra__: t.Optional[t.Dict[str, t.Any]]
+    """Keys without a slot, None when there are none"""
+
+    def __init__(self, document: t.Mapping[str, t.Any] = None, **kwargs) -> None:
+        self.__extra__ = None
+        for key, value in {**(document or {}), **kwargs}.items():
+            self[key] = value
+
+    @classmethod
+    def from_document(cls: t.Type[R], document: t.Mapping[str, t.Any]) -> R:
+        record = cls.__new__(cls)
+        fieldset = cls.__fieldset__
+        extra = None
+        for key, value in document.items():
+            if key in fieldset:
+                setattr(record, key, value)
+            elif extra is None:
+                extra = {key: value}
+            else:
+                extra[key] = value
+        record.__extra__ = extra
+        return record
+
+    @classmethod
+    def many(cls: t.Type[R], documents: t.Iterable[t.Mapping[str, t.Any]]) -> t.List[R]:
+        from_document = cls.from_document
+        return [from_document(document) for document in documents]
+
+    def __getitem__(self, key: str) -> t.Any:
+        if key in self.__fieldset__:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.__extra__ is None:
+            raise KeyError(key)
+        return self.__extra__[key]
+
+    def __setitem__(self, key: str, value: t.Any) -> None:
+        if key in self.__fieldset__:
+            setattr(self, key, value)
+        elif self.__extra__ is None:
+            self.__extra__ = {key: value}
+        else:
+            self.__extra__[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self.__fieldset__:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.__extra__ is None:
+            raise KeyError(key)
+        else:
+            del self.__extra__[key]
+
+    def __iter__(self) -> t.Iterator[str]:
+        for name in self.__fields__:
+            if hasattr(self, name):
+                yield name
+        if self.__extra__ is not None:
+            yield from self.__extra__
+
+    def __len__(self) -> int:
+        size = sum(1 for name in self.__fields__ if hasattr(self, name))
+        return size + len(self.__extra__ or ())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self: R) -> R:
+        return self.from_document(self)
+
+
+def record_class(name: str, fields: t.Iterable[str]) -> t.Type[Record]:
+    """Record subclass with a slot per field"""
+    fields = tuple(dict.fromkeys(fields))
+    for field in fields:
+        if not field.isidentifier() or keyword.iskeyword(field):
+            raise ValueError(f"Field {field!r} is not a valid attribute name")
+        if hasattr(Record, field):
+            raise ValueError(f"Field {field!r} shadows Record.{field}")
+    return type(
+        name,
+        (Record,),
+        {"__slots__": fields, "__fields__": fields, "__fieldset__": frozenset(fields)},
+    )
+
+
+def schema_fields(schema: t.Type) -> t.List[str]:
+    """Document keys of a pydantic schema, aliases like _id included"""
+    if hasattr(schema, "__fields_by_alias__"):
+        return [alias for alias, _, _ in schema.__fields_by_alias__]
+    return [field.alias for field in schema.__fields__.values()]
@@ -0,0 +1,1592 @@
+"""
+In-memory stand-in for Motor's client, database, collection and cursor
+
+Supports the subset of the driver API used by aiomodels: CRUD, bulk_write,
+find_one_and_*, sort/skip/limit, unique and hash indexes, explain and
+simple aggregation pipelines. Documents are stored BSON encoded, so every
+read returns a fresh copy decoded with the collection codec options.
+"""
+import asyncio
+import collections.abc
+import copy
+import datetime
+import itertools
+import re
+import typing as t
+
+import bson
+from bson import ObjectId
+from bson.codec_options import DEFAULT_CODEC_OPTIONS, CodecOptions
+from pymongo import (
+    DeleteMany,
+    DeleteOne,
+    IndexModel,
+    InsertOne,
+    ReplaceOne,
+    ReturnDocument,
+    UpdateMany,
+    UpdateOne,
+)
+from pymongo.errors import (
+    BulkWriteError,
+    DuplicateKeyError,
+    InvalidOperation,
+    OperationFailure,
+    WriteError,
+)
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+
+__all__ = ["MemoryClient", "MemoryDatabase", "MemoryCollection", "MemoryCursor"]
+
+
+Key = t.Any
+Sort = t.List[t.Tuple[str, int]]
+
+_MISSING = object()
+
+FIRST_BATCH = 101
+"""Documents in the first batch without batch_size, as the server does"""
+
+
+##
+# Values
+#
+def _hashable(value: t.Any) -> Key:
+    if isinstance(value, bool):
+        return "bool", value
+    if isinstance(value, (dict, list)):
+        return "bson", bson.encode({"v": value})
+    try:
+        hash(value)
+    except TypeError:
+        return "bson", bson.encode({"v": value})
+    return value
+
+
+def _bracket(value: t.Any) -> int:
+    """Type order of BSON comparison, values of different brackets never match"""
+    if value is None or value is _MISSING:
+        return 1
+    if isinstance(value, bool):
+        return 8
+    if isinstance(value, (int, float, bson.Int64, bson.Decimal128)):
+        return 2
+    if isinstance(value, str):
+        return 3
+    if isinstance(value, collections.abc.Mapping):
+        return 4
+    if isinstance(value, list):
+        return 5
+    if isinstance(value, bytes):
+        return 6
+    if isinstance(value, ObjectId):
+        return 7
+    if isinstance(value, datetime.datetime):
+        return 9
+    return 10
+
+
+def _sort_key(value: t.Any) -> t.Tuple:
+    bracket = _bracket(value)
+    if bracket == 1:
+        return 1, 0
+    if bracket == 2:
+        if isinstance(value, bson.Decimal128):
+            value = value.to_decimal()
+        return 2, value
+    if bracket == 4:
+        return 4, tuple((k, _sort_key(v)) for k, v in value.items())
+    if bracket == 5:
+        return 5, tuple(_sort_key(v) for v in value)
+    if bracket == 7:
+        return 7, value.binary
+    if bracket == 10:
+        return 10, repr(value)
+    return bracket, value
+
+
+def _compare(a: t.Any, b: t.Any) -> t.Optional[int]:
+    if _bracket(a) != _bracket(b):
+        return None
+    ka, kb = _sort_key(a), _sort_key(b)
+    return (ka > kb) - (ka < kb)
+
+
+##
+# Paths
+#
+def _lookup(value: t.Any, parts: t.Sequence[str]) -> t.List[t.Any]:
+    """Values at the path, arrays of documents on the way are traversed"""
+    if not parts:
+        return [value]
+    key, rest = parts[0], parts[1:]
+    if isinstance(value, collections.abc.Mapping):
+        return _lookup(value[key], rest) if key in value else [_MISSING]
+    if isinstance(value, list):
+        if key.isdigit():
+            index = int(key)
+            return _lookup(value[index], rest) if index < len(value) else [_MISSING]
+        found = [
+            v
+            for item in value
+            if isinstance(item, collections.abc.Mapping)
+            for v in _lookup(item, parts)
+        ]
+        return found or [_MISSING]
+    return [_MISSING]
+
+
+def _get(document: t.Any, path: str) -> t.Any:
+    value = document
+    for key in path.split("."):
+        if isinstance(value, collections.abc.Mapping):
+            value = value.get(key, _MISSING)
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+def _set(document: dict, path: str, value: t.Any) -> None:
+    *parents, last = path.split(".")
+    container: t.Any = document
+    for key in parents:
+        if isinstance(container, list):
+            index = int(key)
+            while len(container) <= index:
+                container.append(None)
+            if not isinstance(container[index], (dict, list)):
+                container[index] = {}
+            container = container[index]
+        else:
+            if not isinstance(container.get(key), (dict, list)):
+                if key in container:
+                    raise WriteError(
+                        f"Cannot create field '{last}' in element "
+                        f"{{{key}: {container[key]!r}}}",
+                        28,
+                    )
+                container[key] = {}
+            container = container[key]
+    if isinstance(container, list):
+        index = int(last)
+        while len(container) <= index:
+            container.append(None)
+        container[index] = value
+    else:
+        container[last] = value
+
+
+def _unset(document: dict, path: str) -> None:
+    *parents, last = path.split(".")
+    container = _get(document, ".".join(parents)) if parents else document
+    if isinstance(container, dict):
+        container.pop(last, None)
+    elif isinstance(container, list) and last.isdigit() and int(last) < len(container):
+        container[int(last)] = None
+
+
+##
+# Query
+#
+def _is_operators(condition: t.Any) -> bool:
+    return (
+        isinstance(condition, collections.abc.Mapping)
+        and bool(condition)
+        and all(str(k).startswith("$") for k in condition)
+    )
+
+
+def _expand(candidates: t.List[t.Any]) -> t.Iterator[t.Any]:
+    for value in candidates:
+        yield value
+        if isinstance(value, list):
+            yield from value
+
+
+def _equals(candidates: t.List[t.Any], expected: t.Any) -> bool:
+    if isinstance(expected, (re.Pattern, bson.regex.Regex)):
+        return _regex(candidates, expected)
+    for value in _expand(candidates):
+        if value is _MISSING:
+            if expected is None:
+                return True
+        elif _compare(value, expected) == 0:
+            return True
+    return False
+
+
+def _regex(candidates: t.List[t.Any], pattern: t.Any) -> bool:
+    if isinstance(pattern, bson.regex.Regex):
+        pattern = pattern.try_compile()
+    return any(
+        isinstance(value, str) and pattern.search(value) is not None
+        for value in _expand(candidates)
+    )
+
+
+def _match_operators(candidates: t.List[t.Any], condition: t.Mapping) -> bool:
+    for op, arg in condition.items():
+        if op == "$options":
+            continue
+        if op == "$regex":
+            flags = 0
+            for option in condition.get("$options", ""):
+                flags |= {"i": re.I, "m": re.M, "s": re.S, "x": re.X}[option]
+            if isinstance(arg, str):
+                arg = re.compile(arg, flags)
+            matched = _regex(candidates, arg)
+        elif op == "$eq":
+            matched = _equals(candidates, arg)
+        elif op == "$ne":
+            matched = not _equals(candidates, arg)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            accepted = {
+                "$gt": (1,),
+                "$gte": (0, 1),
+                "$lt": (-1,),
+                "$lte": (-1, 0),
+            }[op]
+            matched = any(
+                _compare(value, arg) in accepted
+                for value in _expand(candidates)
+                if value is not _MISSING
+            )
+        elif op == "$in":
+            matched = any(_equals(candidates, item) for item in arg)
+        elif op == "$nin":
+            matched = not any(_equals(candidates, item) for item in arg)
+        elif op == "$exists":
+            matched = bool(arg) == any(value is not _MISSING for value in candidates)
+        elif op == "$not":
+            if isinstance(arg, (re.Pattern, bson.regex.Regex)):
+                matched = not _regex(candidates, arg)
+            else:
+                matched = not _match_operators(candidates, arg)
+        elif op == "$size":
+            matched = any(
+                isinstance(value, list) and len(value) == arg for value in candidates
+            )
+        elif op == "$all":
+            matched = bool(arg) and all(_equals(candidates, item) for item in arg)
+        elif op == "$elemMatch":
+            matched = any(
+                _match_element(item, arg)
+                for value in candidates
+                if isinstance(value, list)
+                for item in value
+            )
+        else:
+            raise OperationFailure(f"unknown operator: {op}", 2)
+        if not matched:
+            return False
+    return True
+
+
+def _match_element(item: t.Any, condition: t.Mapping) -> bool:
+    if _is_operators(condition) and not any(
+        k in ("$and", "$or", "$nor") for k in condition
+    ):
+        return _match_operators([item], condition)
+    return isinstance(item, collections.abc.Mapping) and match(item, condition)
+
+
+def match(document: t.Mapping, query: t.Optional[t.Mapping]) -> bool:
+    """Check a document against a query filter"""
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            matched = all(match(document, q) for q in condition)
+        elif key == "$or":
+            matched = any(match(document, q) for q in condition)
+        elif key == "$nor":
+            matched = not any(match(document, q) for q in condition)
+        elif key.startswith("$"):
+            raise OperationFailure(f"unknown top level operator: {key}", 2)
+        else:
+            candidates = _lookup(document, key.split("."))
+            if _is_operators(condition):
+                matched = _match_operators(candidates, condition)
+            else:
+                matched = _equals(candidates, condition)
+        if not matched:
+            return False
+    return True
+
+
+def _equalities(query: t.Mapping) -> t.Iterator[t.Tuple[str, t.Any]]:
+    for key, condition in query.items():
+        if key == "$and":
+            for q in condition:
+                yield from _equalities(q)
+        elif not key.startswith("$"):
+            if not _is_operators(condition):
+                yield key, condition
+            elif set(condition) == {"$eq"}:
+                yield key, condition["$eq"]
+
+
+##
+# Projection
+#
+def project(document: dict, projection: t.Any) -> dict:
+    if not projection:
+        return document
+    if not isinstance(projection, collections.abc.Mapping):
+        projection = {name: True for name in projection}
+
+    fields = {k: v for k, v in projection.items() if k != "_id"}
+    with_id = projection.get("_id", True)
+    if any(fields.values()) or (not fields and with_id):
+        result: dict = {}
+        if with_id and "_id" in document:
+            result["_id"] = document["_id"]
+        for path in fields:
+            value = _get(document, path)
+            if value is not _MISSING:
+                _set(result, path, value)
+        return result
+
+    result = copy.deepcopy(document)
+    for path in fields:
+        _unset(result, path)
+    if not with_id:
+        result.pop("_id", None)
+    return result
+
+
+##
+# Update
+#
+_UPDATE_OPERATORS = (
+    "$set",
+    "$unset",
+    "$inc",
+    "$mul",
+    "$min",
+    "$max",
+    "$rename",
+    "$push",
+    "$addToSet",
+    "$pull",
+    "$pullAll",
+    "$pop",
+    "$setOnInsert",
+    "$currentDate",
+)
+
+
+def _check_paths(update: t.Mapping, insert: bool) -> None:
+    paths: t.List[str] = []
+    for op, fields in update.items():
+        if op not in _UPDATE_OPERATORS:
+            raise WriteError(f"Unknown modifier: {op}", 9)
+        if op == "$setOnInsert" and not insert:
+            continue
+        paths.extend(fields)
+        if op == "$rename":
+            paths.extend(fields.values())
+
+    parts = sorted(path.split(".") for path in paths)
+    for a, b in zip(parts, parts[1:]):
+        if b[: len(a)] == a:
+            path = ".".join(a)
+            raise WriteError(
+                f"Updating the path '{'.'.join(b)}' would create a conflict at '{path}'",
+                40,
+            )
+
+
+def _number(value: t.Any, op: str, path: str) -> t.Any:
+    if _bracket(value) != 2:
+        raise WriteError(
+            f"Cannot apply {op} to a value of non-numeric type: {value!r} at {path}", 14
+        )
+    return value
+
+
+def _array(document: dict, path: str, op: str) -> list:
+    value = _get(document, path)
+    if value is _MISSING:
+        value = []
+        _set(document, path, value)
+    if not isinstance(value, list):
+        raise WriteError(f"The field '{path}' must be an array for {op}", 2)
+    return value
+
+
+def apply_update(document: dict, update: t.Mapping, *, insert: bool = False) -> None:
+    """Apply update operators to the document in place"""
+    _check_paths(update, insert)
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not insert:
+            continue
+        for path, arg in fields.items():
+            current = _get(document, path)
+            if op in ("$set", "$setOnInsert"):
+                _set(document, path, copy.deepcopy(arg))
+            elif op == "$unset":
+                _unset(document, path)
+            elif op == "$inc":
+                base = 0 if current is _MISSING else _number(current, op, path)
+                _set(document, path, base + _number(arg, op, path))
+            elif op == "$mul":
+                base = 0 if current is _MISSING else _number(current, op, path)
+                _set(document, path, base * _number(arg, op, path))
+            elif op in ("$min", "$max"):
+                if current is _MISSING:
+                    _set(document, path, arg)
+                else:
+                    order = _sort_key(arg) > _sort_key(current)
+                    if order == (op == "$max"):
+                        _set(document, path, arg)
+            elif op == "$rename":
+                if current is not _MISSING:
+                    _unset(document, path)
+                    _set(document, arg, current)
+            elif op == "$currentDate":
+                now = datetime.datetime.utcnow()
+                _set(
+                    document,
+                    path,
+                    now.replace(microsecond=now.microsecond // 1000 * 1000),
+                )
+            elif op in ("$push", "$addToSet"):
+                array = _array(document, path, op)
+                each = (
+                    arg["$each"] if isinstance(arg, dict) and "$each" in arg else [arg]
+                )
+                for item in each:
+                    if op == "$push" or not _equals([array], item):
+                        array.append(copy.deepcopy(item))
+                if op == "$push" and isinstance(arg, dict) and "$slice" in arg:
+                    size = arg["$slice"]
+                    array[:] = array[:size] if size >= 0 else array[size:]
+            elif op in ("$pull", "$pullAll"):
+                array = _array(document, path, op)
+                if op == "$pullAll":
+                    array[:] = [
+                        i for i in array if not any(_equals([i], v) for v in arg)
+                    ]
+                elif isinstance(arg, collections.abc.Mapping):
+                    array[:] = [i for i in array if not _match_element(i, arg)]
+                else:
+                    array[:] = [i for i in array if not _equals([i], arg)]
+            elif op == "$pop":
+                array = _array(document, path, op)
+                if array:
+                    array.pop(-1 if arg >= 0 else 0)
+
+
+def _upsert_document(query: t.Mapping) -> dict:
+    document: dict = {}
+    for path, value in _equalities(query):
+        _set(document, path, copy.deepcopy(value))
+    return document
+
+
+##
+# Aggregation
+#
+def _expression(document: t.Mapping, expression: t.Any) -> t.Any:
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _get(document, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, collections.abc.Mapping):
+        if len(expression) == 1:
+            ((op, arg),) = expression.items()
+            if op == "$literal":
+                return arg
+            if op in ("$sum", "$add"):
+                return sum(_expression(document, item) or 0 for item in arg)
+            if op == "$size":
+                return len(_expression(document, arg) or [])
+        return {k: _expression(document, v) for k, v in expression.items()}
+    return expression
+
+
+def _group(documents: t.Iterable[dict], spec: t.Mapping) -> t.List[dict]:
+    groups: t.Dict[Key, dict] = {}
+    for document in documents:
+        _id = _expression(document, spec["_id"])
+        group = groups.setdefault(_hashable(_id), {"_id": _id})
+        for name, accumulator in spec.items():
+            if name == "_id":
+                continue
+            ((op, arg),) = accumulator.items()
+            value = _expression(document, arg)
+            if op == "$sum":
+                group[name] = group.get(name, 0) + (
+                    value if _bracket(value) == 2 else 0
+                )
+            elif op == "$avg":
+                total, count = group.get(name, (0, 0))
+                group[name] = (
+                    (total + value, count + 1)
+                    if _bracket(value) == 2
+                    else (total, count)
+                )
+            elif op in ("$min", "$max"):
+                if name not in group or (
+                    (_sort_key(value) > _sort_key(group[name])) == (op == "$max")
+                ):
+                    group[name] = value
+            elif op == "$first":
+                group.setdefault(name, value)
+            elif op == "$last":
+                group[name] = value
+            elif op == "$push":
+                group.setdefault(name, []).append(value)
+            elif op == "$addToSet":
+                items = group.setdefault(name, [])
+                if not _equals([items], value):
+                    items.append(value)
+            else:
+                raise OperationFailure(f"unknown group operator '{op}'", 15952)
+
+    result = list(groups.values())
+    for name, accumulator in spec.items():
+        if name != "_id" and "$avg" in accumulator:
+            for group in result:
+                total, count = group[name]
+                group[name] = total / count if count else None
+    return result
+
+
+def aggregate(documents: t.List[dict], pipeline: t.Sequence[t.Mapping]) -> t.List[dict]:
+    for stage in pipeline:
+        ((name, spec),) = stage.items()
+        if name == "$match":
+            documents = [d for d in documents if match(d, spec)]
+        elif name == "$project":
+            documents = [_project_stage(d, spec) for d in documents]
+        elif name in ("$addFields", "$set"):
+            for document in documents:
+                for path, expression in spec.items():
+                    _set(document, path, _expression(document, expression))
+        elif name == "$unset":
+            for document in documents:
+                for path in [spec] if isinstance(spec, str) else spec:
+                    _unset(document, path)
+        elif name == "$sort":
+            documents = _sorted(documents, list(spec.items()))
+        elif name == "$skip":
+            documents = documents[spec:]
+        elif name == "$limit":
+            documents = documents[:spec]
+        elif name == "$count":
+            documents = [{spec: len(documents)}] if documents else []
+        elif name == "$unwind":
+            path = (spec["path"] if isinstance(spec, dict) else spec)[1:]
+            documents = [
+                _with(d, path, item)
+                for d in documents
+                for item in (_get(d, path) if isinstance(_get(d, path), list) else [])
+            ]
+        elif name == "$group":
+            documents = _group(documents, spec)
+        elif name == "$replaceRoot":
+            documents = [_expression(d, spec["newRoot"]) for d in documents]
+        else:
+            raise OperationFailure(f"Unrecognized pipeline stage name: '{name}'", 40324)
+    return documents
+
+
+def _project_stage(document: dict, spec: t.Mapping) -> dict:
+    if not any(isinstance(v, (str, dict)) for v in spec.values()):
+        return project(document, spec)
+    result: dict = {}
+    if spec.get("_id", True) and "_id" in document:
+        result["_id"] = document["_id"]
+    for path, value in spec.items():
+        if path == "_id" and not isinstance(value, (str, dict)):
+            continue
+        if not isinstance(value, (str, dict)):
+            value = _get(document, path) if value else _MISSING
+        else:
+            value = _expression(document, value)
+        if value is not _MISSING:
+            _set(result, path, value)
+    return result
+
+
+def _with(document: dict, path: str, value: t.Any) -> dict:
+    result = copy.deepcopy(document)
+    _set(result, path, value)
+    return result
+
+
+def _sorted(documents: t.List[t.Any], sort: Sort, get=lambda d: d) -> t.List[t.Any]:
+    result = list(documents)
+    for path, direction in reversed(sort):
+        result.sort(key=lambda d: _sort_key(_get(get(d), path)), reverse=direction < 0)
+    return result
+
+
+##
+# Storage
+#
+class _Record:
+    __slots__ = ("document", "raw", "position")
+
+    def __init__(self, document: dict, raw: bytes, position: int) -> None:
+        self.document = document
+        self.raw = raw
+        self.position = position
+        """Insertion order, the natural order of index scans with equal keys"""
+
+
+class _Index:
+    __slots__ = ("name", "keys", "options", "entries", "multikey")
+
+    def __init__(self, name: str, keys: Sort, options: t.Dict[str, t.Any]) -> None:
+        self.name = name
+        self.keys = keys
+        self.options = options
+        """unique, sparse, partialFilterExpression and kept as is expireAfterSeconds"""
+        self.entries: t.Dict[Key, t.Set[Key]] = {}
+        self.multikey = False
+        """Some document has several keys through arrays, lookups are not served"""
+
+    @property
+    def unique(self) -> bool:
+        return bool(self.options.get("unique"))
+
+    @property
+    def sparse(self) -> bool:
+        return bool(self.options.get("sparse"))
+
+    @property
+    def partial(self) -> t.Optional[t.Mapping]:
+        return self.options.get("partialFilterExpression")
+
+    def _values(self, document: dict, path: str) -> t.List[t.Any]:
+        """Indexed values at the path, items of arrays on the way and at the end"""
+        found = _lookup(document, path.split("."))
+        if _get(document, path) is _MISSING and found != [_MISSING]:
+            self.multikey = True  # reached through an array of documents
+        values = []
+        for value in found:
+            if isinstance(value, list):
+                self.multikey = True
+                values.extend(value or [None])
+            else:
+                values.append(None if value is _MISSING else value)
+        return values
+
+    def entry_keys(self, document: dict) -> t.List[t.Tuple]:
+        """Keys of the document, several for arrays like a multikey index"""
+        if self.partial is not None and not match(document, self.partial):
+            return []
+        missing = [_MISSING]
+        if self.sparse and all(
+            _lookup(document, path.split(".")) == missing for path, _ in self.keys
+        ):
+            return []
+        values = [self._values(document, path) for path, _ in self.keys]
+        if any(len(items) > 1 for items in values):
+            self.multikey = True
+        keys = itertools.product(*[[_hashable(v) for v in items] for items in values])
+        return list(dict.fromkeys(keys))
+
+    def add(self, document: dict, _id: Key) -> None:
+        for key in self.entry_keys(document):
+            self.entries.setdefault(key, set()).add(_id)
+
+    def remove(self, document: dict, _id: Key) -> None:
+        for key in self.entry_keys(document):
+            ids = self.entries.get(key)
+            if ids is not None:
+                ids.discard(_id)
+                if not ids:
+                    del self.entries[key]
+
+    def info(self) -> dict:
+        return {"key": list(self.keys), "v": 2, **self.options}
+
+
+class _Store:
+    """Documents of one collection by hashable _id with secondary indexes"""
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self.records: t.Dict[Key, _Record] = {}
+        self.indexes: t.Dict[str, _Index] = {}
+        self.inserted = 0
+
+    ##
+    # Queries
+    #
+    def plan(self, query: t.Optional[t.Mapping]) -> t.Tuple[t.List[Key], dict]:
+        """Record keys to examine and the winning plan of explain"""
+        query = query or {}
+        for path, value in _equalities(query):
+            if isinstance(value, (re.Pattern, bson.regex.Regex)):
+                continue
+            if path == "_id":
+                key = _hashable(value)
+                return [key] if key in self.records else [], {"stage": "IDHACK"}
+            index = self._index_for(path)
+            if index is not None:
+                return self._from_index(index, [value]), self._ixscan(index)
+
+        for path, condition in query.items():
+            if _is_operators(condition) and set(condition) == {"$in"}:
+                values = condition["$in"]
+                if any(isinstance(v, (re.Pattern, bson.regex.Regex)) for v in values):
+                    continue
+                if path == "_id":
+                    ids = {_hashable(v): v for v in values}
+                    ordered = sorted(ids.items(), key=lambda item: _sort_key(item[1]))
+                    plan = {
+                        "stage": "FETCH",
+                        "inputStage": {"stage": "IXSCAN", "indexName": "_id_"},
+                    }
+                    return [k for k, _ in ordered if k in self.records], plan
+                index = self._index_for(path)
+                if index is not None:
+                    return self._from_index(index, values), self._ixscan(index)
+
+        return list(self.records), {"stage": "COLLSCAN"}
+
+    def _index_for(self, path: str) -> t.Optional[_Index]:
+        # sparse and partial indexes miss some of the matching documents,
+        # multikey ones need the query semantics of arrays
+        for index in self.indexes.values():
+            if index.keys[0][0] == path and len(index.keys) == 1:
+                if not (index.sparse or index.partial or index.multikey):
+                    return index
+        return None
+
+    def _from_index(self, index: _Index, values: t.Iterable[t.Any]) -> t.List[Key]:
+        keys: t.List[Key] = []
+        for value in sorted(values, key=_sort_key):
+            found = index.entries.get((_hashable(value),), ())
+            keys.extend(sorted(found, key=lambda k: self.records[k].position))
+        return list(dict.fromkeys(keys))
+
+    @staticmethod
+    def _ixscan(index: _Index) -> dict:
+        return {
+            "stage": "FETCH",
+            "inputStage": {"stage": "IXSCAN", "indexName": index.name},
+        }
+
+    def find(
+        self,
+        query: t.Optional[t.Mapping],
+        *,
+        sort: Sort = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> t.Tuple[t.List[_Record], dict]:
+        keys, plan = self.plan(query)
+        records = [self.records[key] for key in keys]
+        examined = len(records)
+        if not _exact(query, plan):
+            records = [r for r in records if match(r.document, query)]
+        if sort:
+            records = _sorted(records, sort, get=lambda r: r.document)
+        if skip:
+            records = records[skip:]
+        if limit:
+            records = records[: abs(limit)]
+        stats = {
+            "nReturned": len(records),
+            "totalDocsExamined": examined,
+            "totalKeysExamined": examined if plan["stage"] != "COLLSCAN" else 0,
+            "executionTimeMillis": 0,
+        }
+        return records, {"winningPlan": plan, "executionStats": stats}
+
+    def first(
+        self, query: t.Optional[t.Mapping], sort: Sort = None
+    ) -> t.Optional[_Record]:
+        if not sort:
+            keys, plan = self.plan(query)
+            exact = _exact(query, plan)
+            for key in keys:
+                record = self.records[key]
+                if exact or match(record.document, query):
+                    return record
+            return None
+        records, _ = self.find(query, sort=sort, limit=1)
+        return records[0] if records else None
+
+    ##
+    # Writes
+    #
+    def _duplicate(
+        self, index_name: str, keys: Sort, document: dict
+    ) -> DuplicateKeyError:
+        values = {path: _get(document, path) for path, _ in keys}
+        values = {k: None if v is _MISSING else v for k, v in values.items()}
+        shown = ", ".join(f"{k}: {v!r}" for k, v in values.items())
+        message = (
+            f"E11000 duplicate key error collection: {self.namespace} "
+            f"index: {index_name} dup key: {{ {shown} }}"
+        )
+        details = {
+            "code": 11000,
+            "errmsg": message,
+            "keyPattern": dict(keys),
+            "keyValue": values,
+        }
+        return DuplicateKeyError(message, 11000, details)
+
+    def _check_unique(self, document: dict, _id: Key) -> None:
+        for index in self.indexes.values():
+            if not index.unique:
+                continue
+            for key in index.entry_keys(document):
+                if index.entries.get(key, set()) - {_id}:
+                    raise self._duplicate(index.name, index.keys, document)
+
+    def insert(self, document: t.MutableMapping) -> t.Any:
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        raw = bson.encode(document)
+        stored = bson.decode(raw)
+        _id = _hashable(stored["_id"])
+        if _id in self.records:
+            raise self._duplicate("_id_", [("_id", 1)], stored)
+        self._check_unique(stored, _id)
+        for index in self.indexes.values():
+            index.add(stored, _id)
+        self.inserted += 1
+        self.records[_id] = _Record(stored, raw, self.inserted)
+        return document["_id"]
+
+    def replace(self, record: _Record, document: dict) -> bool:
+        """Store the new version of the record, False if nothing changed"""
+        current = _hashable(record.document["_id"])
+        if "_id" in document and _hashable(document["_id"]) != current:
+            raise WriteError(
+                "Performing an update on the path '_id' would modify "
+                "the immutable field '_id'",
+                66,
+            )
+        document = {"_id": record.document["_id"], **document}
+        raw = bson.encode(document)
+        if raw == record.raw:
+            return False
+        _id = _hashable(document["_id"])
+        self._check_unique(document, _id)
+        for index in self.indexes.values():
+            index.remove(record.document, _id)
+            index.add(document, _id)
+        record.document, record.raw = document, raw
+        return True
+
+    def update(self, record: _Record, update: t.Mapping) -> bool:
+        if not _is_operators(update):
+            return self.replace(record, dict(copy.deepcopy(update)))
+        document = copy.deepcopy(record.document)
+        apply_update(document, update)
+        return self.replace(record, document)
+
+    def upsert(self, query: t.Mapping, update: t.Mapping) -> t.Any:
+        if _is_operators(update):
+            document = _upsert_document(query)
+            apply_update(document, update, insert=True)
+        else:
+            document = dict(copy.deepcopy(update))
+            for path, value in _equalities(query):
+                if path == "_id":
+                    document.setdefault("_id", value)
+        return self.insert(document)
+
+    def delete(self, record: _Record) -> None:
+        _id = _hashable(record.document["_id"])
+        for index in self.indexes.values():
+            index.remove(record.document, _id)
+        del self.records[_id]
+
+    ##
+    # Indexes
+    #
+    def create_index(self, keys: t.Any, **kwargs) -> str:
+        keys = _index_keys(keys)
+        name = kwargs.get("name") or "_".join(f"{k}_{d}" for k, d in keys)
+        if keys == [("_id", 1)]:
+            return "_id_"
+        if name in self.indexes:
+            return name
+        options = {k: v for k, v in kwargs.items() if k != "name"}
+        index = _Index(name, keys, options)
+        for _id, record in self.records.items():
+            if index.unique:
+                if any(k in index.entries for k in index.entry_keys(record.document)):
+                    raise self._duplicate(name, keys, record.document)
+            index.add(record.document, _id)
+        self.indexes[name] = index
+        return name
+
+
+def _exact(query: t.Optional[t.Mapping], plan: dict) -> bool:
+    """Documents of an index lookup by the only condition match the query"""
+    if plan["stage"] == "COLLSCAN" or not query or len(query) != 1:
+        return False
+    return "$and" not in query
+
+
+def _index_keys(keys: t.Any) -> Sort:
+    if isinstance(keys, str):
+        return [(keys, 1)]
+    if isinstance(keys, collections.abc.Mapping):
+        return list(keys.items())
+    return [(key, direction) for key, direction in keys]
+
+
+def _sort_spec(key_or_list: t.Any, direction: int = None) -> Sort:
+    if key_or_list is None:
+        return []
+    if isinstance(key_or_list, str):
+        return [(key_or_list, 1 if direction is None else direction)]
+    return _index_keys(key_or_list)
+
+
+##
+# Driver API
+#
+class MemoryCursor:
+    """Lazy cursor with server-like batches, supports Motor's async API"""
+
+    def __init__(
+        self,
+        collection: "MemoryCollection",
+        filter: t.Mapping = None,
+        projection: t.Any = None,
+        *,
+        sort: t.Any = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 0,
+        documents: t.List[dict] = None,
+    ) -> None:
+        self.collection = collection
+        self._filter = filter
+        self._projection = projection
+        self._sort = _sort_spec(sort)
+        self._skip = skip
+        self._limit = limit
+        self._batch_size = batch_size
+        self._documents = documents  # precomputed results of aggregate
+
+        self._started = False
+        self._pending: t.Deque[t.Any] = collections.deque()
+        self._data: t.Deque[t.Any] = collections.deque()
+
+    def _check(self) -> None:
+        if self._started:
+            raise InvalidOperation("cannot set options after executing query")
+
+    def sort(self, key_or_list: t.Any, direction: int = None) -> "MemoryCursor":
+        self._check()
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int) -> "MemoryCursor":
+        self._check()
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        self._check()
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "MemoryCursor":
+        self._check()
+        self._batch_size = batch_size
+        return self
+
+    def clone(self) -> "MemoryCursor":
+        return MemoryCursor(
+            self.collection,
+            self._filter,
+            self._projection,
+            sort=self._sort,
+            skip=self._skip,
+            limit=self._limit,
+            batch_size=self._batch_size,
+            documents=self._documents,
+        )
+
+    def rewind(self) -> "MemoryCursor":
+        self._started = False
+        self._pending.clear()
+        self._data.clear()
+        return self
+
+    async def close(self) -> None:
+        self._started = True
+        self._pending.clear()
+        self._data.clear()
+
+    def _execute(self) -> None:
+        self._started = True
+        if self._documents is not None:
+            self._pending.extend(self._documents)
+            return
+        records, _ = self.collection._store.find(
+            self._filter, sort=self._sort, skip=self._skip, limit=self._limit
+        )
+        self._pending.extend(records)
+
+    def _fetch(self) -> None:
+        """Decode the next batch into the buffer"""
+        first = not self._started
+        if first:
+            self._execute()
+        size = self._batch_size or (FIRST_BATCH if first else len(self._pending))
+        for _ in range(min(size, len(self._pending))):
+            item = self._pending.popleft()
+            if isinstance(item, _Record):
+                item = self.collection._output(item, self._projection)
+            else:
+                item = self.collection._decode(item)
+            self._data.append(item)
+
+    @property
+    def alive(self) -> bool:
+        return not self._started or bool(self._pending or self._data)
+
+    def _buffer_size(self) -> int:
+        return len(self._data)
+
+    async def next(self) -> t.Any:
+        if not self._data:
+            await asyncio.sleep(0)
+            self._fetch()
+        if not self._data:
+            raise StopAsyncIteration
+        return self._data.popleft()
+
+    def __aiter__(self) -> "MemoryCursor":
+        return self
+
+    async def __anext__(self) -> t.Any:
+        return await self.next()
+
+    async def to_list(self, length: t.Optional[int]) -> t.List[t.Any]:
+        result: t.List[t.Any] = []
+        while length is None or len(result) < length:
+            if not self._data:
+                if self._started and not self._pending:
+                    break
+                await asyncio.sleep(0)
+                self._fetch()
+            while self._data and (length is None or len(result) < length):
+                result.append(self._data.popleft())
+        return result
+
+    async def explain(self) -> dict:
+        _, stats = self.collection._store.find(
+            self._filter, sort=self._sort, skip=self._skip, limit=self._limit
+        )
+        return {
+            "queryPlanner": {
+                "namespace": self.collection.full_name,
+                "parsedQuery": self._filter or {},
+                "winningPlan": stats["winningPlan"],
+            },
+            "executionStats": stats["executionStats"],
+        }
+
+
+class MemoryCollection:
+    name: str
+    full_name: str
+    codec_options: CodecOptions
+
+    def __init__(
+        self,
+        database: "MemoryDatabase",
+        name: str,
+        codec_options: CodecOptions = None,
+    ) -> None:
+        self.database = database
+        self.name = name
+        self.full_name = f"{database.name}.{name}"
+        self.codec_options = codec_options or database.codec_options
+
+    @property
+    def _store(self) -> _Store:
+        # looked up on every call, handles see drops like driver ones do
+        return self.database._store(self.name)
+
+    def __repr__(self) -> str:
+        return f"MemoryCollection({self.full_name!r})"
+
+    def with_options(
+        self, codec_options: CodecOptions = None, **kwargs
+    ) -> "MemoryCollection":
+        return MemoryCollection(
+            self.database, self.name, codec_options or self.codec_options
+        )
+
+    def _decode(self, document: t.Any) -> t.Any:
+        return bson.decode(bson.encode(document), self.codec_options)
+
+    def _output(self, record: _Record, projection: t.Any = None) -> t.Any:
+        if projection:
+            return self._decode(project(record.document, projection))
+        return bson.decode(record.raw, self.codec_options)
+
+    @staticmethod
+    def _filter(filter: t.Any) -> t.Optional[t.Mapping]:
+        if filter is not None and not isinstance(filter, collections.abc.Mapping):
+            return {"_id": filter}
+        return filter
+
+    ##
+    # Reads
+    #
+    def find(
+        self,
+        filter: t.Mapping = None,
+        projection: t.Any = None,
+        *,
+        sort: t.Any = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 0,
+        session=None,
+        **kwargs,
+    ) -> MemoryCursor:
+        return MemoryCursor(
+            self,
+            filter,
+            projection,
+            sort=sort,
+            skip=skip,
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    async def find_one(
+        self, filter: t.Any = None, *args, **kwargs
+    ) -> t.Optional[t.Any]:
+        documents = await self.find(self._filter(filter), *args, **kwargs).to_list(1)
+        return documents[0] if documents else None
+
+    async def count_documents(self, filter: t.Mapping, session=None, **kwargs) -> int:
+        await asyncio.sleep(0)
+        records, _ = self._store.find(
+            filter, skip=kwargs.get("skip", 0), limit=kwargs.get("limit", 0)
+        )
+        return len(records)
+
+    async def estimated_document_count(self, **kwargs) -> int:
+        await asyncio.sleep(0)
+        return len(self._store.records)
+
+    async def distinct(self, key: str, filter: t.Mapping = None, **kwargs) -> list:
+        await asyncio.sleep(0)
+        records, _ = self._store.find(filter)
+        values: t.Dict[Key, t.Any] = {}
+        for record in records:
+            for value in _expand(_lookup(record.document, key.split("."))):
+                if value is not _MISSING and not isinstance(value, list):
+                    values.setdefault(_hashable(value), value)
+        return list(values.values())
+
+    def aggregate(
+        self, pipeline: t.Sequence[t.Mapping], session=None, **kwargs
+    ) -> MemoryCursor:
+        documents = [
+            copy.deepcopy(record.document) for record in self._store.records.values()
+        ]
+        return MemoryCursor(
+            self,
+            documents=aggregate(documents, pipeline),
+            batch_size=kwargs.get("batchSize") or 0,
+        )
+
+    ##
+    # Writes
+    #
+    async def insert_one(
+        self, document: t.MutableMapping, session=None, **kwargs
+    ) -> InsertOneResult:
+        await asyncio.sleep(0)
+        return InsertOneResult(self._store.insert(document), True)
+
+    async def insert_many(
+        self,
+        documents: t.Iterable[t.MutableMapping],
+        ordered: bool = True,
+        session=None,
+        **kwargs,
+    ) -> InsertManyResult:
+        documents = list(documents)
+        if not documents:
+            raise TypeError("documents must be a non-empty list")
+        for document in documents:
+            if "_id" not in document:
+                document["_id"] = ObjectId()
+        await self.bulk_write([InsertOne(d) for d in documents], ordered=ordered)
+        return InsertManyResult([d["_id"] for d in documents], True)
+
+    async def update_one(
+        self,
+        filter: t.Mapping,
+        update: t.Mapping,
+        upsert: bool = False,
+        session=None,
+        **kwargs,
+    ) -> UpdateResult:
+        await asyncio.sleep(0)
+        return UpdateResult(
+            self._update(filter, update, upsert=upsert, multi=False), True
+        )
+
+    async def update_many(
+        self,
+        filter: t.Mapping,
+        update: t.Mapping,
+        upsert: bool = False,
+        session=None,
+        **kwargs,
+    ) -> UpdateResult:
+        await asyncio.sleep(0)
+        return UpdateResult(
+            self._update(filter, update, upsert=upsert, multi=True), True
+        )
+
+    async def replace_one(
+        self,
+        filter: t.Mapping,
+        replacement: t.Mapping,
+        upsert: bool = False,
+        session=None,
+        **kwargs,
+    ) -> UpdateResult:
+        if _is_operators(replacement):
+            raise ValueError("replacement can not include $ operators")
+        await asyncio.sleep(0)
+        return UpdateResult(
+            self._update(filter, replacement, upsert=upsert, multi=False), True
+        )
+
+    def _update(
+        self,
+        filter: t.Mapping,
+        update: t.Mapping,
+        *,
+        upsert: bool,
+        multi: bool,
+        sort: Sort = None,
+    ) -> dict:
+        if multi:
+            records, _ = self._store.find(filter)
+        else:
+            record = self._store.first(filter, sort)
+            records = [record] if record is not None else []
+        if not records and upsert:
+            _id = self._store.upsert(filter or {}, update)
+            return {
+                "n": 1,
+                "nModified": 0,
+                "upserted": _id,
+                "ok": 1.0,
+                "updatedExisting": False,
+            }
+        modified = sum(self._store.update(record, update) for record in records)
+        return {
+            "n": len(records),
+            "nModified": modified,
+            "ok": 1.0,
+            "updatedExisting": bool(records),
+        }
+
+    async def delete_one(
+        self, filter: t.Mapping, session=None, **kwargs
+    ) -> DeleteResult:
+        await asyncio.sleep(0)
+        return DeleteResult({"n": self._delete(filter, multi=False), "ok": 1.0}, True)
+
+    async def delete_many(
+        self, filter: t.Mapping, session=None, **kwargs
+    ) -> DeleteResult:
+        await asyncio.sleep(0)
+        return DeleteResult({"n": self._delete(filter, multi=True), "ok": 1.0}, True)
+
+    def _delete(self, filter: t.Mapping, *, multi: bool) -> int:
+        if multi:
+            records, _ = self._store.find(filter)
+        else:
+            record = self._store.first(filter)
+            records = [record] if record is not None else []
+        for record in records:
+            self._store.delete(record)
+        return len(records)
+
+    async def find_one_and_update(
+        self,
+        filter: t.Mapping,
+        update: t.Mapping,
+        projection: t.Any = None,
+        sort: t.Any = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session=None,
+        **kwargs,
+    ) -> t.Optional[t.Any]:
+        return await self._find_and_modify(
+            filter, update, projection, sort, upsert, return_document
+        )
+
+    async def find_one_and_replace(
+        self,
+        filter: t.Mapping,
+        replacement: t.Mapping,
+        projection: t.Any = None,
+        sort: t.Any = None,
+        upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+        session=None,
+        **kwargs,
+    ) -> t.Optional[t.Any]:
+        if _is_operators(replacement):
+            raise ValueError("replacement can not include $ operators")
+        return await self._find_and_modify(
+            filter, replacement, projection, sort, upsert, return_document
+        )
+
+    async def _find_and_modify(
+        self,
+        filter: t.Mapping,
+        update: t.Mapping,
+        projection: t.Any,
+        sort: t.Any,
+        upsert: bool,
+        return_document: bool,
+    ) -> t.Optional[t.Any]:
+        await asyncio.sleep(0)
+        record = self._store.first(filter, _sort_spec(sort))
+        if record is None:
+            if not upsert:
+                return None
+            _id = self._store.upsert(filter or {}, update)
+            if not return_document:
+                return None
+            record = self._store.records[_hashable(_id)]
+            return self._output(record, projection)
+
+        before = self._output(record, projection)
+        self._store.update(record, update)
+        return self._output(record, projection) if return_document else before
+
+    async def find_one_and_delete(
+        self,
+        filter: t.Mapping,
+        projection: t.Any = None,
+        sort: t.Any = None,
+        session=None,
+        **kwargs,
+    ) -> t.Optional[t.Any]:
+        await asyncio.sleep(0)
+        record = self._store.first(filter, _sort_spec(sort))
+        if record is None:
+            return None
+        self._store.delete(record)
+        return self._output(record, projection)
+
+    async def bulk_write(
+        self, requests: t.Sequence[t.Any], ordered: bool = True, session=None, **kwargs
+    ) -> BulkWriteResult:
+        requests = list(requests)
+        if not requests:
+            raise InvalidOperation("No operations to execute")
+        await asyncio.sleep(0)
+        result: dict = {
+            "writeErrors": [],
+            "writeConcernErrors": [],
+            "nInserted": 0,
+            "nUpserted": 0,
+            "nMatched": 0,
+            "nModified": 0,
+            "nRemoved": 0,
+            "upserted": [],
+        }
+        for i, request in enumerate(requests):
+            try:
+                self._apply(request, i, result)
+            except WriteError as e:
+                details = dict(e.details or {})
+                details.update(
+                    index=i,
+                    code=e.code,
+                    errmsg=details.get("errmsg", str(e)),
+                    op=_op(request),
+                )
+                result["writeErrors"].append(details)
+                if ordered:
+                    break
+        if result["writeErrors"]:
+            raise BulkWriteError(result)
+        result.pop("writeErrors")
+        result.pop("writeConcernErrors")
+        return BulkWriteResult(result, True)
+
+    def _apply(self, request: t.Any, index: int, result: dict) -> None:
+        if isinstance(request, InsertOne):
+            self._store.insert(request._doc)
+            result["nInserted"] += 1
+        elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+            raw = self._update(
+                request._filter,
+                request._doc,
+                upsert=request._upsert,
+                multi=isinstance(request, UpdateMany),
+            )
+            if "upserted" in raw:
+                result["nUpserted"] += 1
+                result["upserted"].append({"index": index, "_id": raw["upserted"]})
+            else:
+                result["nMatched"] += raw["n"]
+                result["nModified"] += raw["nModified"]
+        elif isinstance(request, (DeleteOne, DeleteMany)):
+            result["nRemoved"] += self._delete(
+                request._filter, multi=isinstance(request, DeleteMany)
+            )
+        else:
+            raise TypeError(f"{request!r} is not a valid request")
+
+    ##
+    # Indexes
+    #
+    async def create_index(self, keys: t.Any, session=None, **kwargs) -> str:
+        await asyncio.sleep(0)
+        return self._store.create_index(keys, **kwargs)
+
+    async def create_indexes(
+        self, indexes: t.Sequence[IndexModel], session=None, **kwargs
+    ) -> t.List[str]:
+        await asyncio.sleep(0)
+        names = []
+        for model in indexes:
+            document = dict(model.document)
+            keys = document.pop("key")
+            names.append(self._store.create_index(list(keys.items()), **document))
+        return names
+
+    async def drop_index(self, index_or_name: t.Any, session=None, **kwargs) -> None:
+        await asyncio.sleep(0)
+        name = index_or_name
+        if not isinstance(name, str):
+            name = "_".join(f"{k}_{d}" for k, d in _index_keys(index_or_name))
+        if self._store.indexes.pop(name, None) is None:
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+
+    async def drop_indexes(self, session=None, **kwargs) -> None:
+        await asyncio.sleep(0)
+        self._store.indexes.clear()
+
+    async def index_information(self, session=None) -> dict:
+        await asyncio.sleep(0)
+        info = {"_id_": {"key": [("_id", 1)], "v": 2}}
+        info.update({name: index.info() for name, index in self._store.indexes.items()})
+        return info
+
+    async def drop(self, session=None) -> None:
+        await self.database.drop_collection(self.name)
+
+
+def _op(request: t.Any) -> t.Any:
+    if isinstance(request, InsertOne):
+        return request._doc
+    if isinstance(request, (DeleteOne, DeleteMany)):
+        return {"q": request._filter, "limit": int(isinstance(request, DeleteOne))}
+    return {
+        "q": request._filter,
+        "u": request._doc,
+        "multi": isinstance(request, UpdateMany),
+        "upsert": bool(request._upsert),
+    }
+
+
+class MemoryDatabase:
+    name: str
+    codec_options: CodecOptions
+
+    def __init__(
+        self, client: "MemoryClient", name: str, codec_options: CodecOptions = None
+    ) -> None:
+        self.client = client
+        self.name = name
+        self.codec_options = codec_options or client.codec_options
+        self._stores: t.Dict[str, _Store] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        return self.get_collection(name)
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.get_collection(name)
+
+    def get_collection(
+        self, name: str, codec_options: CodecOptions = None, **kwargs
+    ) -> MemoryCollection:
+        return MemoryCollection(self, name, codec_options)
+
+    def _store(self, name: str) -> _Store:
+        store = self._stores.get(name)
+        if store is None:
+            store = self._stores[name] = _Store(f"{self.name}.{name}")
+        return store
+
+    async def list_collection_names(self, session=None, **kwargs) -> t.List[str]:
+        return [name for name, store in self._stores.items() if store.records]
+
+    async def drop_collection(self, name_or_collection: t.Any, session=None) -> None:
+        name = getattr(name_or_collection, "name", name_or_collection)
+        self._stores.pop(name, None)
+
+
+class MemoryClient:
+    """
+    Motor-like client, databases live as long as the client
+
+    >>> db = MemoryClient()["test"]
+    >>> model = BaseModel(db, collection_name="users")
+    """
+
+    def __init__(self, *, document_class: t.Type = dict, **kwargs) -> None:
+        self.codec_options = DEFAULT_CODEC_OPTIONS.with_options(
+            document_class=document_class
+        )
+        self._databases: t.Dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        return self.get_database(name)
+
+    def get_database(self, name: str, **kwargs) -> MemoryDatabase:
+        database = self._databases.get(name)
+        if database is None:
+            database = self._databases[name] = MemoryDatabase(self, name)
+        return database
+
+    async def list_database_names(self, session=None) -> t.List[str]:
+        return list(self._databases)
+
+    async def drop_database(self, name_or_database: t.Any, session=None) -> None:
+        name = getattr(name_or_database, "name", name_or_database)
+        database = self._databases.get(name)
+        if database is not None:
+            database._stores.clear()
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,41 @@
+import functools
+import typing as t
+
+from aiomodels.core import BaseModel
+from aiomodels.core.offload import Hydrator
+from aiomodels.pydantic.model import Model
+
+
+__all__ = ["PydanticModel"]
+
+
+M = t.TypeVar("M", bound=Model)
+
+
+class PydanticModel(BaseModel[M, t.Any]):
+    """Reads documents as schema instances with the trusted from_db"""
+
+    schema: t.Type[M]
+    trusted: bool = True
+    """Skip validation of documents read from the database"""
+
+    async def _after_read(self, document: dict) -> M:
+        if self.trusted:
+            return self.schema.from_db(document)
+        return self.schema(**document)
+
+    async def _after_read_many(self, documents: t.List[dict]) -> t.List[M]:
+        if type(self)._after_read is not PydanticModel._after_read:
+            # a subclass hook applies to every read, mapped like BaseModel does
+            return await super()._after_read_many(documents)
+        return self.schema.parse_many(documents, trusted=self.trusted)
+
+    def _hydrator(self) -> t.Optional[Hydrator]:
+        """parse_many of the schema, subclasses overriding read hooks return None"""
+        cls = type(self)
+        if any(
+            getattr(cls, name) is not getattr(PydanticModel, name)
+            for name in ("_after_read", "_after_read_many")
+        ):
+            return None
+        return functools.partial(self.schema.parse_many, trusted=self.trusted)
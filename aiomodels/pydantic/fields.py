@@ -1,4 +1,5 @@
 from bson.objectid import ObjectId
+from pydantic.validators import str_validator
 
 
 class ObjectIdField(ObjectId):
@@ -11,3 +12,21 @@ class ObjectIdField(ObjectId):
         if not isinstance(v, ObjectId):
             raise TypeError("ObjectId reqired")
         return str(v)
+
+
+class IdField:
+    """Document _id, an ObjectId as kept by the default generate_id or a str"""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v):
+        if isinstance(v, ObjectId):
+            return v
+        return str_validator(v)
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(type="string")
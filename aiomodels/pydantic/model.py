@@ -1,21 +1,91 @@
+import copy
+import logging
+import random
 import typing as t
 
 import pydantic
 import pydantic.main
 import pydantic.class_validators
 
+from aiomodels.pydantic.fields import IdField
+from aiomodels.pydantic.observer import DictObserver, diff, get_path, unwrap
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from aiomodels.core.model import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+M = t.TypeVar("M", bound="Model")
+
+
+class FieldDescriptor:
+    """Schema field on the wrapper class, reads and writes go to __instance__"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: t.Optional["Model"], owner=None) -> t.Any:
+        if obj is None:
+            return self
+        try:
+            value = obj.__instance__.__dict__[self.name]
+        except KeyError:
+            # a trusted document may miss a required field
+            raise AttributeError(self.name) from None
+        if type(value) is dict or type(value) is list:
+            # readers get the value itself, changes in place are found
+            # by get_update comparing it with a copy taken on first read
+            if self.name not in obj.__snapshots__ and not obj._replaced(self.name):
+                obj.__snapshots__[self.name] = copy.deepcopy(value)
+        return value
+
+    def __set__(self, obj: "Model", value: t.Any) -> None:
+        instance = obj.__instance__
+        if value is instance.__dict__.get(self.name):
+            if self.name in obj.__snapshots__ or obj._replaced(self.name):
+                return  # augmented assignment, changes in place are diffed
+        setattr(instance, self.name, unwrap(value))
+        # validated assignment replaces __dict__ of the instance
+        obj.__observer__.data = instance.__dict__
+        obj.__snapshots__.pop(self.name, None)
+        obj.__observer__.set_changed((self.name,), True)
+
 
 class ModelMetaclass(type):
     def __new__(mcs, name, bases, attrs: t.Dict[str, t.Any]):
         pydantic_fields = mcs.get_fields_for_pydantic(attrs)
         pydantic_fields["__annotations__"] = mcs.get_annotations_for_pydantic(attrs)
         mcs.create_model(name, bases, attrs, pydantic_fields)
+        attrs["__fields_by_alias__"] = tuple(
+            (field.alias, field_name, field)
+            for field_name, field in attrs["__model__"].__fields__.items()
+        )
+        mcs.create_descriptors(bases, attrs)
 
-        attrs.setdefault("__instance__", None)
+        attrs.setdefault("__slots__", ())
         cls = super().__new__(mcs, name, bases, attrs)
 
         return cls
 
+    @classmethod
+    def create_descriptors(mcs, bases, attrs: t.Dict[str, t.Any]) -> None:
+        for field_name in attrs["__model__"].__fields__:
+            if field_name in attrs:
+                continue  # methods win over fields like with __getattr__
+            inherited = next(
+                (
+                    getattr(base, field_name)
+                    for base in bases
+                    if hasattr(base, field_name)
+                ),
+                None,
+            )
+            if inherited is None or isinstance(inherited, FieldDescriptor):
+                attrs[field_name] = FieldDescriptor(field_name)
+
     @classmethod
     def get_annotations_for_pydantic(
         mcs, attrs: t.Dict[str, t.Any]
@@ -41,6 +111,8 @@ class ModelMetaclass(type):
                 result[name] = attrs.pop(name)
             elif name.startswith("__") or callable(value):
                 continue
+            elif isinstance(value, (classmethod, staticmethod, property)):
+                continue
             else:
                 result[name] = attrs.pop(name)
 
@@ -77,16 +149,108 @@ class ModelMetaclass(type):
 class Model(metaclass=ModelMetaclass):
     __model__: t.ClassVar[t.Type[pydantic.main.BaseModel]] = pydantic.main.BaseModel
     """Data storage schema"""
+    __slots__ = ("__instance__", "__observer__", "__snapshots__")
+
     __instance__: pydantic.main.BaseModel
     """Data storage"""
+    __observer__: DictObserver
+    """Fields assigned since the last save"""
+    __snapshots__: t.Dict[str, t.Any]
+    """Copies of dict and list fields as of their first read since the last save"""
+    __fields_by_alias__: t.ClassVar[t.Tuple[t.Tuple[str, str, t.Any], ...]]
+    """(alias, name, field) of schema fields"""
+    __validate_rate__: t.ClassVar[float] = 0.0
+    """Fraction of from_db documents validated in full to catch schema drift"""
 
-    id: str = pydantic.Field(default=None, alias="_id")
+    id: IdField = pydantic.Field(default=None, alias="_id")
 
     class Config:
         validate_assignment = True
 
     def __init__(self, **kwargs) -> None:
-        self.__instance__ = self.__model__(**kwargs)
+        self._set_instance(self.__model__(**kwargs))
+
+    def _set_instance(self, instance: pydantic.main.BaseModel) -> None:
+        self.__instance__ = instance
+        self.__observer__ = DictObserver(instance.__dict__)
+        self.__snapshots__ = {}
+
+    @classmethod
+    def from_db(cls: t.Type[M], document: t.Mapping[str, t.Any]) -> M:
+        """
+        Trusted constructor for documents read from the database
+
+        Validators are skipped and values are taken as is, aliases applied.
+        """
+        if cls.__validate_rate__ and random.random() < cls.__validate_rate__:
+            try:
+                return cls(**document)
+            except pydantic.ValidationError as e:
+                logger.warning("Schema drift in %s: %s", cls.__name__, e)
+
+        values, fields_set = {}, set()
+        for alias, name, field in cls.__fields_by_alias__:
+            if alias in document:
+                values[name] = document[alias]
+                fields_set.add(name)
+            elif not field.required:
+                values[name] = field.get_default()
+
+        obj = cls.__new__(cls)
+        obj._set_instance(cls.__model__.construct(_fields_set=fields_set, **values))
+        return obj
+
+    @classmethod
+    def parse_many(
+        cls: t.Type[M],
+        documents: t.Iterable[t.Dict[str, t.Any]],
+        *,
+        trusted: bool = False,
+    ) -> t.List[M]:
+        """Build instances of a batch, trusted skips validation like from_db"""
+        if trusted:
+            from_db = cls.from_db
+            return [from_db(document) for document in documents]
+
+        model = cls.__model__
+        new = cls.__new__
+        result = []
+        for document in documents:
+            values, fields_set, error = pydantic.main.validate_model(model, document)
+            if error:
+                raise error
+            instance = model.__new__(model)
+            object.__setattr__(instance, "__dict__", values)
+            object.__setattr__(instance, "__fields_set__", fields_set)
+            instance._init_private_attributes()
+
+            obj = new(cls)
+            obj._set_instance(instance)
+            result.append(obj)
+        return result
+
+    @staticmethod
+    def dump_many(
+        instances: t.Iterable["Model"], *, by_alias: bool = True, **kwargs
+    ) -> t.List[t.Dict[str, t.Any]]:
+        """
+        Documents of instances, by alias to be written to the database
+
+        _id of unsaved instances is omitted by alias, so the database
+        generates one instead of storing None.
+        """
+        documents = []
+        for instance in instances:
+            document = instance.__instance__.dict(by_alias=by_alias, **kwargs)
+            if by_alias and "_id" in document and document["_id"] is None:
+                del document["_id"]
+            documents.append(document)
+        return documents
+
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        """Pickle by class and values, changes since the last save are not kept"""
+        instance = self.__instance__
+        return _restore, (type(self), instance.__dict__, instance.__fields_set__)
 
     def __str__(self) -> str:
         return str(self.__instance__)
@@ -95,17 +259,9 @@ class Model(metaclass=ModelMetaclass):
         return repr(self.__instance__)
 
     def __getattr__(self, item: str) -> t.Any:
-        try:
-            return getattr(self.__instance__, item)
-        except AttributeError:
-            return super().__getattribute__(item)
-
-    def __setattr__(self, name: str, value: t.Any) -> None:
-        try:
-            object.__getattribute__(self, name)
-            super().__setattr__(name, value)
-        except AttributeError:
-            setattr(self.__instance__, name, value)
+        if item in Model.__slots__:
+            raise AttributeError(item)  # not initialized yet
+        return getattr(self.__instance__, item)
 
     def __eq__(self, o: object) -> bool:
         if isinstance(o, Model):
@@ -120,3 +276,65 @@ class Model(metaclass=ModelMetaclass):
         elif isinstance(o, pydantic.main.BaseModel):
             return self.__instance__ != o
         return super().__ne__(o)
+
+    ##
+    # Changes
+    #
+    def get_update(self) -> dict:
+        """Minimal $set/$unset update with the changes since the last save"""
+        fields = self.__instance__.__fields__
+        values = self.__instance__.__dict__
+        changes = dict(self.__observer__.changes)
+        for name, before in self.__snapshots__.items():
+            changes.update(diff(before, values[name], (name,)))
+
+        update: t.Dict[str, dict] = {}
+        for (name, *path), is_set in changes.items():
+            field = fields.get(name)
+            alias = field.alias if field else name
+            key = ".".join([alias, *map(str, path)])
+            if not is_set:
+                update.setdefault("$unset", {})[key] = ""
+            elif path:
+                update.setdefault("$set", {})[key] = get_path(values, (name, *path))
+            else:
+                data = self.__instance__.dict(include={name}, by_alias=True)
+                update.setdefault("$set", {})[key] = data[alias]
+        return update
+
+    async def save(self, model: "BaseModel", **kwargs) -> t.Any:
+        """Send only the changed fields with model.update_one"""
+        update = self.get_update()
+        if not update:
+            return None
+        result = await model.update_one(
+            {"_id": self.__instance__.id}, update, **kwargs  # type: ignore
+        )
+        self._reset()
+        return result
+
+    def _replaced(self, name: str) -> bool:
+        return bool(self.__observer__.changes.get((name,)))
+
+    def _reset(self) -> None:
+        # references taken before the save keep being tracked
+        data = self.__instance__.__dict__
+        names = {*self.__snapshots__, *(path[0] for path in self.__observer__.changes)}
+        self.__snapshots__ = {
+            name: copy.deepcopy(data[name])
+            for name in names
+            if type(data.get(name)) is dict or type(data.get(name)) is list
+        }
+        self.__observer__.reset()
+
+
+def _restore(cls: t.Type[M], values: dict, fields_set: t.Set[str]) -> M:
+    model = cls.__model__
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__fields_set__", fields_set)
+    instance._init_private_attributes()
+
+    obj = cls.__new__(cls)
+    obj._set_instance(instance)
+    return obj
@@ -1,16 +1,22 @@
 import typing as t
-import collections
+import collections.abc
 
 T = t.TypeVar("T")
 
+Path = t.Tuple[t.Any, ...]
+
 
 class Observer(t.Generic[T]):
-    __slots__ = ("modified", "data", "parent")
+    __slots__ = ("modified", "data", "parent", "key", "changes", "children")
 
-    def __init__(self, data: T, parent: "Observer" = None):
+    def __init__(self, data: T, parent: "Observer" = None, key: t.Any = None):
         self.data: T = data
         self.parent: t.Optional[Observer] = parent
+        self.key: t.Any = key  # of data in the parent data
         self.modified = False
+        # changed paths of the root observer, True for set and False for unset
+        self.changes: t.Dict[Path, bool] = {}
+        self.children: t.Dict[t.Any, Observer] = {}
 
     def __str__(self):
         return str(self.data)
@@ -38,21 +44,69 @@ class Observer(t.Generic[T]):
             self.parent.set_modified()
         self.modified = True
 
+    def set_changed(self, path: Path, is_set: bool) -> None:
+        self.set_modified()
+        self.record(path, is_set)
+
+    def record(self, path: Path, is_set: bool) -> None:
+        if self.parent is not None:
+            return self.parent.record((self.key, *path), is_set)
+
+        for i in range(1, len(path)):
+            if self.changes.get(path[:i]):
+                return  # value of the ancestor is taken as a whole
+        size = len(path)
+        for changed in [p for p in self.changes if len(p) > size and p[:size] == path]:
+            del self.changes[changed]
+        self.changes[path] = is_set
+
+    def iter_changes(self) -> t.Iterator[t.Tuple[Path, bool, t.Any]]:
+        for path, is_set in self.changes.items():
+            yield path, is_set, get_path(self.data, path) if is_set else None
+
+    def get_update(self) -> dict:
+        """Minimal $set/$unset update for changes since the last reset"""
+        update: t.Dict[str, dict] = {}
+        for path, is_set, value in self.iter_changes():
+            name = ".".join(map(str, path))
+            if is_set:
+                update.setdefault("$set", {})[name] = value
+            else:
+                update.setdefault("$unset", {})[name] = ""
+        return update
+
+    def reset(self) -> None:
+        self.changes.clear()
+        self.modified = False
+
+    def get_child(self, k: t.Any, item: t.Any) -> t.Union["Observer", t.Any]:
+        child = self.children.get(k)
+        if child is not None and child.data is item:
+            return child
+        child = create_observer(item, parent=self, key=k)
+        if isinstance(child, Observer):
+            self.children[k] = child
+        return child
+
+
+class DictObserver(Observer[t.Dict], collections.abc.MutableMapping):
+    __slots__ = ()
 
-class DictObserver(Observer[t.Dict], collections.MutableMapping):
     def __getitem__(self, k):
-        item = self.data.__getitem__(k)
-        if not self.modified:
-            return create_observer(item, parent=self)
-        return item
+        return self.get_child(k, self.data.__getitem__(k))
 
     def __setitem__(self, k, v) -> None:
-        self.set_modified()
-        return self.data.__setitem__(k, v)
+        child = self.children.get(k)
+        if child is not None and child is v and self.data.get(k) is child.data:
+            return  # augmented assignment of the observed child, already recorded
+        self.data.__setitem__(k, unwrap(v))
+        self.children.pop(k, None)
+        self.set_changed((k,), True)
 
     def __delitem__(self, v) -> None:
-        self.set_modified()
-        return self.data.__delitem__(v)
+        self.data.__delitem__(v)
+        self.children.pop(v, None)
+        self.set_changed((v,), False)
 
     def __len__(self) -> int:
         return self.data.__len__()
@@ -61,29 +115,162 @@ class DictObserver(Observer[t.Dict], collections.MutableMapping):
         return self.data.__iter__()
 
     def update(self, *args, **kwargs) -> None:
-        self.set_modified()
-        self.data.update(*args, **kwargs)
+        for k, v in dict(*args, **kwargs).items():
+            self[k] = v
 
     def clear(self) -> None:
-        self.set_modified()
-        self.data.clear()
+        if self.parent is None:
+            for k in list(self.data):
+                del self[k]
+        else:
+            self.data.clear()
+            self.children.clear()
+            self.set_changed((), True)
 
     def pop(self, *args, **kwargs) -> t.Any:
-        self.set_modified()
-        return self.data.pop(*args, **kwargs)
+        exists = args[0] in self.data if args else False
+        value = self.data.pop(*args, **kwargs)
+        if exists:
+            self.children.pop(args[0], None)
+            self.set_changed((args[0],), False)
+        return value
 
     def popitem(self):
-        self.set_modified()
-        return self.data.popitem()
+        k, v = self.data.popitem()
+        self.children.pop(k, None)
+        self.set_changed((k,), False)
+        return k, v
 
-    def setdefault(self, *args, **kwargs):
-        self.set_modified()
-        return self.data.setdefault(*args, **kwargs)
+    def setdefault(self, k, default=None):
+        if k not in self.data:
+            self[k] = default
+        return self[k]
+
+
+class ListObserver(Observer[t.List], collections.abc.MutableSequence):
+    """
+    Appended items are recorded by index, other changes of positions
+    record the whole list
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.data.__getitem__(i)
+        i = self._index(i)
+        return self.get_child(i, self.data.__getitem__(i))
+
+    def __setitem__(self, i, v) -> None:
+        if isinstance(i, slice):
+            self.data.__setitem__(i, [unwrap(item) for item in v])
+            self._set_changed()
+            return
+        i = self._index(i)
+        self.data.__setitem__(i, unwrap(v))
+        self.children.pop(i, None)
+        self.set_changed((i,), True)
+
+    def __delitem__(self, i) -> None:
+        self.data.__delitem__(i)
+        self._set_changed()
+
+    def __len__(self) -> int:
+        return self.data.__len__()
+
+    def __iter__(self) -> t.Iterator:
+        for i, item in enumerate(self.data):
+            yield self.get_child(i, item)
+
+    def _index(self, i: int) -> int:
+        return i + len(self.data) if i < 0 else i
+
+    def _set_changed(self) -> None:
+        self.children.clear()
+        self.set_changed((), True)
+
+    def insert(self, i: int, v) -> None:
+        if self._index(i) >= len(self.data):
+            return self.append(v)
+        self.data.insert(i, unwrap(v))
+        self._set_changed()
+
+    def append(self, v) -> None:
+        self.data.append(unwrap(v))
+        self.set_changed((len(self.data) - 1,), True)
+
+    def extend(self, values) -> None:
+        for v in values:
+            self.append(v)
+
+    def pop(self, i: int = -1) -> t.Any:
+        value = self.data.pop(i)
+        self._set_changed()
+        return value
+
+    def remove(self, v) -> None:
+        self.data.remove(unwrap(v))
+        self._set_changed()
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._set_changed()
+
+    def reverse(self) -> None:
+        self.data.reverse()
+        self._set_changed()
+
+    def sort(self, *args, **kwargs) -> None:
+        self.data.sort(*args, **kwargs)
+        self._set_changed()
+
+
+def unwrap(item: t.Any) -> t.Any:
+    return item.data if isinstance(item, Observer) else item
+
+
+def diff(
+    before: t.Any, after: t.Any, path: Path = ()
+) -> t.Iterator[t.Tuple[Path, bool]]:
+    """
+    Changed paths from before to after, True for set and False for unset
+
+    Like ListObserver, items appended to a list are set by index and a
+    shorter list is set as a whole.
+    """
+    if type(before) is dict and type(after) is dict:
+        for k in before:
+            if k not in after:
+                yield (*path, k), False
+        for k, v in after.items():
+            if k in before:
+                yield from diff(before[k], v, (*path, k))
+            else:
+                yield (*path, k), True
+    elif type(before) is list and type(after) is list:
+        if len(after) < len(before):
+            yield path, True
+            return
+        for i, v in enumerate(after):
+            if i < len(before):
+                yield from diff(before[i], v, (*path, i))
+            else:
+                yield (*path, i), True
+    elif type(before) is not type(after) or before != after:
+        yield path, True
+
+
+def get_path(data: t.Any, path: Path) -> t.Any:
+    for key in path:
+        data = data[key]
+    return data
 
 
 def create_observer(
-    item: t.Union[t.Dict, t.Any], parent=None
+    item: t.Union[t.Dict, t.List, t.Any], parent=None, key: t.Any = None
 ) -> t.Union[Observer, t.Any]:
     if isinstance(item, dict):
-        return DictObserver(item, parent=parent)
+        return DictObserver(item, parent=parent, key=key)
+    if isinstance(item, list):
+        return ListObserver(item, parent=parent, key=key)
     return item
@@ -1,11 +1,21 @@
+import os
+import typing as t
 from unittest import IsolatedAsyncioTestCase
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from aiomodels.memory import MemoryClient
 
 
 class BaseTestModel(IsolatedAsyncioTestCase):
+    mongodb_url: t.Optional[str] = os.environ.get("AIOMODELS_MONGODB_URL")
+    """Live server to test against, in-memory database when not set"""
+
     async def asyncSetUp(self) -> None:
-        db = AsyncIOMotorClient("mongodb://localhost/")
+        if self.mongodb_url:
+            from motor.motor_asyncio import AsyncIOMotorClient
+
+            db = AsyncIOMotorClient(self.mongodb_url)
+        else:
+            db = MemoryClient()
         await db.drop_database("test_aiomodels")
         self.client = db
         self.db = db["test_aiomodels"]
@@ -0,0 +1,6 @@
+"""
+Throughput and latency benchmarks of the CRUD, cursor and pydantic paths
+
+    python -m benchmarks run --backend memory --count 10000 --output new.json
+    python -m benchmarks compare old.json new.json
+"""
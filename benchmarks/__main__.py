@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import sys
+
+from benchmarks import cases  # noqa: F401 registers the cases
+from benchmarks.runner import CASES, compare, dump, load, run, save, table
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run cases and print a table")
+    run_parser.add_argument(
+        "--backend", default="memory", help='"memory" or a mongodb:// url'
+    )
+    run_parser.add_argument("--count", type=int, default=1000, help="documents")
+    run_parser.add_argument("--size", type=int, default=100, help="payload bytes")
+    run_parser.add_argument("--repeat", type=int, default=1)
+    run_parser.add_argument("--output", help="JSON file for the results")
+    run_parser.add_argument("cases", nargs="*", choices=[[], *CASES], metavar="case")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON results")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="allowed slowdown, 0.1 is 10%%"
+    )
+    compare_parser.add_argument(
+        "--min-samples", type=int, default=5, help="calls needed to compare a case"
+    )
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        report, regressions = compare(
+            load(args.base),
+            load(args.new),
+            threshold=args.threshold,
+            min_samples=args.min_samples,
+        )
+        print(report)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            return 1
+        return 0
+
+    results = asyncio.run(
+        run(
+            args.backend,
+            names=args.cases,
+            count=args.count,
+            size=args.size,
+            repeat=args.repeat,
+        )
+    )
+    print(table(results))
+    if args.output:
+        save(
+            args.output,
+            dump(
+                results,
+                backend=args.backend,
+                count=args.count,
+                size=args.size,
+                repeat=args.repeat,
+            ),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
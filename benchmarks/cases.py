@@ -0,0 +1,150 @@
+import time
+
+from aiomodels.core import BaseModel
+
+from benchmarks.runner import Context, Samples, case
+
+
+class HookedModel(BaseModel):
+    """Overrides the update hooks, so update_many takes the chunked path"""
+
+    async def _after_update(self, document: dict, **kwargs) -> dict:
+        return document
+
+
+##
+# Create
+#
+@case("create_one")
+async def create_one(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    for document in ctx.documents():
+        with samples.measure():
+            await model.create_one(document)
+
+
+@case("create_many")
+async def create_many(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    start = time.perf_counter()
+    async for result in model.create_many_iter(ctx.documents()):
+        samples.add(time.perf_counter() - start, len(result.documents))
+        start = time.perf_counter()
+
+
+##
+# Read
+#
+@case("read_one")
+async def read_one(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    for _id in await ctx.fill(model):
+        with samples.measure():
+            await model.read_one(_id)
+
+
+@case("read_many_iter")
+async def read_many_iter(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    await ctx.fill(model)
+    cursor = model.read_many().__aiter__()
+    while True:
+        start = time.perf_counter()
+        try:
+            await cursor.__anext__()
+        except StopAsyncIteration:
+            break
+        samples.add(time.perf_counter() - start)
+
+
+@case("read_many_prefetch")
+async def read_many_prefetch(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    await ctx.fill(model)
+    with samples.measure(ctx.count):
+        async for _ in model.read_many().prefetch(2):
+            pass
+
+
+@case("read_many_to_list")
+async def read_many_to_list(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    await ctx.fill(model)
+    with samples.measure(ctx.count):
+        await model.read_many().to_list()
+
+
+##
+# Update
+#
+@case("update_one")
+async def update_one(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    for _id in await ctx.fill(model):
+        with samples.measure():
+            await model.update_one({"_id": _id}, {"$inc": {"i": 1}})
+
+
+@case("update_many")
+async def update_many(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    await ctx.fill(model)
+    with samples.measure(ctx.count):
+        await model.update_many({}, {"$inc": {"i": 1}})
+
+
+@case("update_many_hooks")
+async def update_many_hooks(ctx: Context, samples: Samples) -> None:
+    model = ctx.model(HookedModel)
+    await ctx.fill(model)
+    with samples.measure(ctx.count):
+        await model.update_many({}, {"$inc": {"i": 1}})
+
+
+##
+# Delete
+#
+@case("delete_many")
+async def delete_many(ctx: Context, samples: Samples) -> None:
+    model = ctx.model()
+    await ctx.fill(model)
+    with samples.measure(ctx.count):
+        await model.delete_many({"group": {"$gte": 0}})
+
+
+##
+# Pydantic
+#
+try:
+    import pydantic  # noqa: F401
+except ImportError:  # pragma: no cover
+    pass
+else:
+    from aiomodels.pydantic.model import Model
+
+    class Document(Model):
+        i: int
+        group: int
+        payload: str
+        nested: dict
+
+    @case("pydantic_from_db")
+    async def pydantic_from_db(ctx: Context, samples: Samples) -> None:
+        for document in ctx.documents():
+            with samples.measure():
+                Document.from_db(document)
+
+    @case("pydantic_parse_many")
+    async def pydantic_parse_many(ctx: Context, samples: Samples) -> None:
+        documents = ctx.documents()
+        with samples.measure(len(documents)):
+            Document.parse_many(documents)
+
+    @case("observer_mutation")
+    async def observer_mutation(ctx: Context, samples: Samples) -> None:
+        for document in Document.parse_many(ctx.documents(), trusted=True):
+            with samples.measure():
+                document.group += 1
+                document.nested["a"] = 0
+                document.nested["tags"].append("d")
+                document.get_update()
@@ -0,0 +1,230 @@
+import contextlib
+import datetime
+import json
+import platform
+import statistics
+import time
+import typing as t
+
+from aiomodels.core import BaseModel
+from aiomodels.memory import MemoryClient
+
+
+__all__ = ["Context", "Result", "Samples", "case", "compare", "connect", "run"]
+
+
+DATABASE = "aiomodels_benchmarks"
+
+Case = t.Callable[["Context", "Samples"], t.Awaitable[None]]
+
+CASES: t.Dict[str, Case] = {}
+
+
+def case(name: str) -> t.Callable[[Case], Case]:
+    def register(fn: Case) -> Case:
+        CASES[name] = fn
+        return fn
+
+    return register
+
+
+class Samples:
+    """Latencies of measured calls and the documents they processed"""
+
+    def __init__(self) -> None:
+        self.latencies: t.List[float] = []
+        self.operations = 0
+
+    def add(self, seconds: float, operations: int = 1) -> None:
+        self.latencies.append(seconds)
+        self.operations += operations
+
+    @contextlib.contextmanager
+    def measure(self, operations: int = 1) -> t.Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.add(time.perf_counter() - start, operations)
+
+
+class Result(t.NamedTuple):
+    name: str
+    operations: int
+    samples: int
+    """Measured calls, batch cases take one per repeat"""
+    seconds: float
+    """Sum of measured latencies, setup is excluded"""
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.seconds if self.seconds else 0.0
+
+    @classmethod
+    def from_samples(cls, name: str, samples: Samples) -> "Result":
+        latencies = sorted(samples.latencies)
+        return cls(
+            name=name,
+            operations=samples.operations,
+            samples=len(latencies),
+            seconds=sum(latencies),
+            p50_ms=_percentile(latencies, 0.50) * 1000,
+            p99_ms=_percentile(latencies, 0.99) * 1000,
+        )
+
+
+def _percentile(latencies: t.List[float], q: float) -> float:
+    if not latencies:
+        return 0.0
+    if len(latencies) == 1:
+        return latencies[0]
+    return statistics.quantiles(latencies, n=100, method="inclusive")[
+        round(q * 100) - 1
+    ]
+
+
+class Context:
+    """Database, sizes and documents shared by cases"""
+
+    def __init__(self, db: t.Any, *, count: int, size: int) -> None:
+        self.db = db
+        self.count = count
+        self.size = size
+        self._collections = 0
+
+    def document(self, i: int) -> dict:
+        return {
+            "_id": f"{i:012d}",
+            "i": i,
+            "group": i % 10,
+            "payload": "x" * self.size,
+            "nested": {"a": i, "tags": ["a", "b", "c"]},
+        }
+
+    def documents(self) -> t.List[dict]:
+        return [self.document(i) for i in range(self.count)]
+
+    def model(self, cls: t.Type[BaseModel] = BaseModel) -> BaseModel:
+        self._collections += 1
+        return cls(self.db, collection_name=f"bench_{self._collections}")
+
+    async def fill(self, model: BaseModel) -> t.List[str]:
+        result = await model.create_many(self.documents())
+        return [document["_id"] for document in result.documents]
+
+
+async def connect(backend: str) -> t.Tuple[t.Any, t.Any]:
+    """Client and database of "memory" or a mongodb:// url"""
+    if backend == "memory":
+        client: t.Any = MemoryClient()
+    else:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(backend)
+    await client.drop_database(DATABASE)
+    return client, client[DATABASE]
+
+
+async def run(
+    backend: str,
+    *,
+    names: t.Sequence[str] = None,
+    count: int,
+    size: int,
+    repeat: int = 1,
+) -> t.List[Result]:
+    client, db = await connect(backend)
+    results = []
+    try:
+        for name in names or CASES:
+            samples = Samples()
+            for _ in range(repeat):
+                await CASES[name](Context(db, count=count, size=size), samples)
+                await client.drop_database(DATABASE)
+            results.append(Result.from_samples(name, samples))
+    finally:
+        await client.drop_database(DATABASE)
+    return results
+
+
+##
+# Reports
+#
+def dump(
+    results: t.Sequence[Result], *, backend: str, count: int, size: int, repeat: int
+) -> dict:
+    return {
+        "meta": {
+            "backend": "memory" if backend == "memory" else "mongodb",
+            "count": count,
+            "size": size,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "results": {
+            result.name: {
+                **result._asdict(),
+                "throughput": result.throughput,
+            }
+            for result in results
+        },
+    }
+
+
+def table(results: t.Sequence[Result]) -> str:
+    lines = [f"{'case':<24} {'ops':>8} {'ops/s':>12} {'p50 ms':>9} {'p99 ms':>9}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<24} {r.operations:>8} {r.throughput:>12.0f} "
+            f"{r.p50_ms:>9.3f} {r.p99_ms:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def compare(
+    base: dict, new: dict, *, threshold: float = 0.1, min_samples: int = 5
+) -> t.Tuple[str, t.List[str]]:
+    """
+    Table of changes and names of cases slower by more than threshold
+
+    A case regresses when its median latency grows by more than threshold.
+    Tail latencies are too noisy to gate on, and cases with fewer than
+    min_samples calls on either side are reported but never flagged.
+    """
+    lines = [
+        f"{'case':<24} {'ops/s':>12} {'change':>8} {'p50 ms':>9} {'change':>8} "
+        f"{'p99 ms':>9}"
+    ]
+    regressions = []
+    for name, result in new["results"].items():
+        previous = base["results"].get(name)
+        if previous is None:
+            continue
+        throughput = _change(previous["throughput"], result["throughput"])
+        p50 = _change(previous["p50_ms"], result["p50_ms"])
+        samples = min(previous.get("samples", 0), result.get("samples", 0))
+        line = (
+            f"{name:<24} {result['throughput']:>12.0f} {throughput:>+8.1%} "
+            f"{result['p50_ms']:>9.3f} {p50:>+8.1%} {result['p99_ms']:>9.3f}"
+        )
+        if samples < min_samples:
+            line += f"  {samples} samples, not compared"
+        elif p50 > threshold:
+            regressions.append(name)
+        lines.append(line)
+    return "\n".join(lines), regressions
+
+
+def _change(before: float, after: float) -> float:
+    return (after - before) / before if before else 0.0
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(path: str, data: dict) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
@@ -24,7 +24,7 @@ setup(
     description="Mongo async models",
     maintainer="Vladimir Doroshenko",
     maintainer_email="vovktt@gmail.com",
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
     include_package_data=True,
     zip_safe=True,
     install_requires=DEPENDENCIES,
@@ -0,0 +1,70 @@
+import asyncio
+
+from pymongo.errors import DuplicateKeyError
+
+from aiomodels.core import BaseModel, BulkWriter
+from aiomodels.testing import BaseTestModel
+
+
+class TestBulkWriter(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = BaseModel(self.db, collection_name="users")
+
+    async def test_context(self):
+        async with self.model.bulk() as writer:
+            self.assertIsInstance(writer, BulkWriter)
+            await writer.insert({"name": "aaa"})
+            await writer.insert({"name": "bbb"})
+            self.assertEqual(2, len(writer))
+            self.assertEqual([], await self.model.read_many())
+
+        self.assertEqual(0, len(writer))
+        self.assertEqual(1, writer.flushes)
+        self.assertEqual(
+            ["aaa", "bbb"], [doc["name"] for doc in await self.model.read_many()]
+        )
+
+    async def test_operations(self):
+        user1 = await self.model.create_one({"name": "aaa", "level": 1})
+        user2 = await self.model.create_one({"name": "bbb", "level": 1})
+
+        async with self.model.bulk() as writer:
+            await writer.update({"_id": user1["_id"]}, {"$inc": {"level": 1}})
+            await writer.upsert({"name": "ccc"}, {"$set": {"level": 3}})
+            await writer.delete({"_id": user2["_id"]})
+
+        self.assertEqual(
+            [("aaa", 2), ("ccc", 3)],
+            [(doc["name"], doc["level"]) for doc in await self.model.read_many()],
+        )
+
+    async def test_max_operations(self):
+        flushes = []
+        async with self.model.bulk(max_operations=2, on_flush=flushes.append) as w:
+            for i in range(5):
+                await w.insert({"level": i})
+
+        self.assertEqual([2, 2, 1], [flush.operations for flush in flushes])
+        self.assertEqual([2, 2, 1], [flush.result.inserted_count for flush in flushes])
+        self.assertEqual(5, w.operations)
+
+    async def test_max_delay(self):
+        async with self.model.bulk(max_delay_ms=10) as writer:
+            future = await writer.insert({"name": "aaa"})
+            self.assertFalse(future.done())
+            await asyncio.sleep(0.05)
+            self.assertTrue(future.done())
+            self.assertEqual(1, len(await self.model.read_many()))
+
+    async def test_errors(self):
+        await self.model.collection.create_index("name", unique=True)
+
+        async with self.model.bulk() as writer:
+            ok = await writer.insert({"name": "aaa"})
+            duplicate = await writer.insert({"name": "aaa"})
+
+        self.assertIsNone(await ok)
+        with self.assertRaises(DuplicateKeyError):
+            await duplicate
+        self.assertEqual([1], [error["index"] for error in writer.errors])
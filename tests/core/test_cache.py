@@ -0,0 +1,98 @@
+import re
+from unittest import TestCase, mock
+
+import bson
+from bson import ObjectId, Regex
+
+from aiomodels.core import IdentityCache
+
+
+class TestIdentityCache(TestCase):
+    def test_key(self):
+        _id = ObjectId()
+        self.assertEqual((_id, None), IdentityCache.key(_id))
+        self.assertEqual((_id, None), IdentityCache.key({"_id": _id}))
+        self.assertEqual(
+            (_id, (("a", True), ("b", True))),
+            IdentityCache.key(_id, {"b": True, "a": True}),
+        )
+        self.assertIsNone(IdentityCache.key(None))
+        self.assertIsNone(IdentityCache.key({"name": "Vovkt"}))
+        self.assertIsNone(IdentityCache.key({"_id": _id, "name": "Vovkt"}))
+        self.assertIsNone(IdentityCache.key({"_id": {"$in": [_id]}}))
+        self.assertIsNone(IdentityCache.key({"_id": re.compile("^a")}))
+        self.assertIsNone(IdentityCache.key({"_id": Regex("^a")}))
+        self.assertIsNone(IdentityCache.key(re.compile("^a")))
+
+    def test_operator_projection(self):
+        key = IdentityCache.key("a", {"tags": {"$slice": 1}, "name": True})
+
+        self.assertEqual(
+            key, IdentityCache.key("a", {"name": 1, "tags": {"$slice": 1}})
+        )
+        self.assertNotEqual(key, IdentityCache.key("a", {"tags": {"$slice": 2}}))
+        cache = IdentityCache()
+        cache.set(key, b"a", version=0)
+        self.assertEqual(b"a", cache.get(key))
+
+    def test_get_set(self):
+        cache = IdentityCache()
+        self.assertIsNone(cache.get(("a", None)))
+        cache.set(("a", None), b"data", version=cache.version)
+        self.assertEqual(b"data", cache.get(("a", None)))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_stale_version(self):
+        cache = IdentityCache()
+        version = cache.version
+        cache.invalidate("a")
+        cache.set(("a", None), b"data", version=version)
+        self.assertEqual(0, len(cache))
+
+    def test_lru(self):
+        cache = IdentityCache(max_size=2)
+        cache.set(("a", None), b"a", version=0)
+        cache.set(("b", None), b"b", version=0)
+        cache.get(("a", None))
+        cache.set(("c", None), b"c", version=0)
+
+        self.assertIsNone(cache.get(("b", None)))
+        self.assertEqual(b"a", cache.get(("a", None)))
+        self.assertEqual(1, cache.evictions)
+
+    def test_max_bytes(self):
+        cache = IdentityCache(max_bytes=5)
+        cache.set(("a", None), b"aaa", version=0)
+        cache.set(("b", None), b"bbb", version=0)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(3, cache.size_bytes)
+
+        cache.set(("c", None), b"cccccc", version=0)
+        self.assertIsNone(cache.get(("c", None)))
+
+    def test_ttl(self):
+        cache = IdentityCache(ttl=10)
+        with mock.patch("time.monotonic", return_value=100):
+            cache.set(("a", None), b"a", version=0)
+        with mock.patch("time.monotonic", return_value=105):
+            self.assertEqual(b"a", cache.get(("a", None)))
+        with mock.patch("time.monotonic", return_value=111):
+            self.assertIsNone(cache.get(("a", None)))
+        self.assertEqual(1, cache.evictions)
+
+    def test_invalidate(self):
+        cache = IdentityCache()
+        cache.set(("a", None), b"a", version=0)
+        cache.set(("a", (("name", True),)), b"a", version=0)
+        cache.set(("b", None), b"b", version=0)
+
+        cache.invalidate_query({"_id": "a"})
+        self.assertEqual(1, len(cache))
+
+        cache.invalidate_query({"name": "b"})
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size_bytes)
+
+        cache.set(("ab", None), b"ab", version=cache.version)
+        cache.invalidate_query({"_id": Regex("^a")})
+        self.assertEqual(0, len(cache))
@@ -1,3 +1,7 @@
+import asyncio
+
+from pymongo.errors import OperationFailure
+
 from aiomodels.core import BaseModel
 from aiomodels.testing import BaseTestModel
 
@@ -180,3 +184,142 @@ class TestCursorWrapper(BaseTestModel):
         )
 
         self.assertEqual(await self.model.read_many().skip(100), [])
+
+    async def test_batches(self):
+        users = [await self.model.create_one({"level": i}) for i in range(5)]
+
+        result = [batch async for batch in self.model.read_many().batches(2)]
+
+        self.assertEqual([users[0:2], users[2:4], users[4:]], result)
+
+    async def test_batches_chaining(self):
+        users = [await self.model.create_one({"level": i}) for i in range(6)]
+
+        cursor = self.model.read_many().sort("level", -1).skip(1).limit(4)
+        result = [batch async for batch in cursor.batches(3)]
+
+        self.assertEqual([users[4:1:-1], users[1:0:-1]], result)
+
+    async def test_batches_empty(self):
+        self.assertEqual(
+            [], [batch async for batch in self.model.read_many().batches(2)]
+        )
+
+
+class TestCursorAfterRead(BaseTestModel):
+    class Model(BaseModel):
+        concurrency = 2
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.active = 0
+            self.max_active = 0
+            self.batches = []
+
+        async def _after_read(self, document):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0)
+            self.active -= 1
+            return document["name"]
+
+        async def _after_read_many(self, documents):
+            self.batches.append(len(documents))
+            return await super()._after_read_many(documents)
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = self.Model(self.db, collection_name="users")
+        for name in ("a", "b", "c", "d", "e"):
+            await self.model.create_one({"name": name})
+
+    async def test_to_list(self):
+        self.assertEqual(["a", "b", "c", "d", "e"], await self.model.read_many())
+        self.assertEqual([5], self.model.batches)
+        self.assertEqual(2, self.model.max_active)
+
+    async def test_iterator_batches(self):
+        cursor = self.model.read_many(batch_size=2)
+        self.assertEqual(["a", "b", "c", "d", "e"], [doc async for doc in cursor])
+        self.assertEqual([2, 2, 1], self.model.batches)
+
+    async def test_iterator_then_to_list(self):
+        cursor = self.model.read_many(batch_size=3)
+        self.assertEqual("a", await cursor.__anext__())
+        self.assertEqual(["b"], await cursor.to_list(1))
+        self.assertEqual(["c", "d", "e"], await cursor.to_list())
+
+
+class TestCursorPrefetch(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = BaseModel(self.db, collection_name="users")
+        self.users = (
+            await self.model.create_many([{"i": i} for i in range(10)])
+        ).documents
+        self.fetched = 0
+
+    def cursor(self, **kwargs):
+        cursor = self.model.read_many(batch_size=2).prefetch(**kwargs)
+        next_batch = cursor._next_batch
+
+        async def counted():
+            documents = await next_batch()
+            self.fetched += 1
+            return documents
+
+        cursor._next_batch = counted
+        return cursor
+
+    async def test_iterator(self):
+        cursor = self.cursor(depth=2)
+
+        result = []
+        async for user in cursor:
+            result.append(user)
+            await asyncio.sleep(0)
+            # fetched: consumed batches, the one in hand and up to depth ahead
+            self.assertLessEqual(self.fetched, len(result) // 2 + 1 + 2)
+
+        self.assertEqual(self.users, result)
+
+    async def test_ahead(self):
+        cursor = self.cursor(depth=3)
+
+        self.assertEqual(self.users[0], await cursor.__anext__())
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(4, self.fetched)  # 1 in hand and 3 ahead
+        self.assertEqual(self.users[1:7], await cursor.to_list(6))
+        self.assertEqual(self.users[7:], await cursor.to_list())
+
+    async def test_max_bytes(self):
+        cursor = self.cursor(depth=3, max_bytes=1)
+
+        await cursor.__anext__()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(2, self.fetched)  # paused after one batch ahead
+        self.assertEqual(9, len(await cursor))
+
+    async def test_close(self):
+        cursor = self.cursor(depth=1)
+
+        await cursor.__anext__()
+        await cursor.close()
+
+        self.assertTrue(cursor._task.done())
+
+    async def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.model.read_many().prefetch(0)
+        with self.assertRaises(ValueError):
+            self.model.read_many().prefetch(2, max_bytes=0)
+
+    async def test_error(self):
+        cursor = self.model.read_many({"$bad": 1}).prefetch()
+
+        with self.assertRaises(OperationFailure):
+            await cursor.__anext__()
+        with self.assertRaises(OperationFailure):
+            await cursor.to_list()
@@ -0,0 +1,109 @@
+import asyncio
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+from aiomodels.core import BaseModel, ensure_indexes
+from aiomodels.core.indexes import explain_query, registry
+from aiomodels.testing import BaseTestModel
+
+
+class Users(BaseModel):
+    indexes = [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("group", ASCENDING), ("age", DESCENDING)]),
+        IndexModel(
+            [("nick", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"active": True},
+        ),
+        IndexModel([("created", ASCENDING)], expireAfterSeconds=3600),
+    ]
+
+
+class Posts(BaseModel):
+    indexes = [IndexModel("user")]
+
+
+class TestEnsureIndexes(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.users = Users(self.db, collection_name="users")
+        self.posts = Posts(self.db, collection_name="posts")
+
+    async def test_ensure(self):
+        created = await ensure_indexes([self.users, self.posts])
+
+        self.assertEqual(
+            {
+                "test_aiomodels.users": [
+                    "email_1",
+                    "group_1_age_-1",
+                    "nick_1",
+                    "created_1",
+                ],
+                "test_aiomodels.posts": ["user_1"],
+            },
+            created,
+        )
+        info = await self.users.collection.index_information()
+        self.assertEqual(3600, info["created_1"]["expireAfterSeconds"])
+        self.assertEqual([], await self.users.ensure_indexes())
+
+    async def test_registry(self):
+        registry.clear()  # models of the other tests
+        posts = Posts(self.db, collection_name="posts")
+
+        self.assertEqual({"test_aiomodels.posts": ["user_1"]}, await ensure_indexes())
+        self.assertIn(posts, registry)
+
+    async def test_unique(self):
+        await self.users.ensure_indexes()
+        await self.users.create_one({"email": "a", "nick": "n", "active": True})
+        await self.users.create_one({"email": "b", "nick": "n", "active": False})
+
+        with self.assertRaises(DuplicateKeyError):
+            await self.users.create_one({"email": "a"})
+        with self.assertRaises(DuplicateKeyError):
+            await self.users.create_one({"email": "c", "nick": "n", "active": True})
+
+    async def test_conflict(self):
+        await self.posts.collection.create_index("user", name="user_1", unique=True)
+        await self.posts.collection.create_index([("user", DESCENDING)], name="x")
+
+        class Other(BaseModel):
+            indexes = [IndexModel([("user", DESCENDING)], name="user_1")]
+
+        with self.assertLogs("aiomodels.core.model", "WARNING"):
+            self.assertEqual([], await Other(self.db, "posts").ensure_indexes())
+
+
+class TestExplain(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = Posts(self.db, collection_name="posts")
+        self.model.explain = True
+        await self.model.ensure_indexes()
+        await self.model.create_many(
+            [{"user": "a", "n": i} for i in range(20)] + [{"user": "b", "n": 0}]
+        )
+
+    async def test_collection_scan(self):
+        with self.assertLogs("aiomodels.core.indexes", "WARNING") as logs:
+            await self.model.read_one({"n": 0})
+            await self.model.update_one({"n": 0}, {"$set": {"x": 1}})
+            await self.model.read_many({"n": 1}).to_list()
+            await asyncio.gather(*self.model._tasks)
+
+        self.assertEqual(3, len(logs.output))
+        self.assertIn("collection scan: {'n': 0}", logs.output[0])
+
+    async def test_ratio(self):
+        collection = self.model.collection
+
+        self.assertIsNone(await explain_query(collection, {"user": "b"}))
+        with self.assertLogs("aiomodels.core.indexes", "WARNING") as logs:
+            problem = await explain_query(collection, {"user": "a", "n": 1})
+
+        self.assertEqual("20 documents examined for 1 returned", problem)
+        self.assertIn(problem, logs.output[0])
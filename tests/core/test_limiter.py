@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+
+from aiomodels.core import BaseModel, Limiter
+from aiomodels.testing import BaseTestModel
+
+
+class TestLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_limit(self):
+        limiter = Limiter(2)
+        active = []
+
+        async def work():
+            async with limiter.slot():
+                active.append(limiter.active)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*[work() for _ in range(10)])
+
+        self.assertEqual(2, max(active))
+        self.assertEqual(0, limiter.active)
+        self.assertEqual(0, len(limiter))
+
+    async def test_fair(self):
+        limiter = Limiter(1)
+        order = []
+
+        async def work(key):
+            async with limiter.slot(key):
+                order.append(key)
+                await asyncio.sleep(0)
+
+        await limiter.acquire()
+        tasks = [asyncio.ensure_future(work("a")) for _ in range(3)]
+        tasks += [asyncio.ensure_future(work("b")) for _ in range(2)]
+        await asyncio.sleep(0)
+        self.assertEqual(5, len(limiter))
+        limiter.release()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(["a", "b", "a", "b", "a"], order)
+
+    async def test_cancel(self):
+        limiter = Limiter(1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire("a"))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(0, len(limiter))
+        limiter.release()
+        self.assertEqual(0, limiter.active)
+
+    async def test_reentrant(self):
+        limiter = Limiter(1)
+
+        async with limiter.slot():
+            async with limiter.slot():
+                self.assertEqual(1, limiter.active)
+        self.assertEqual(0, limiter.active)
+
+    async def test_child_tasks(self):
+        limiter = Limiter(2)
+        active = []
+
+        async def work():
+            async with limiter.slot():
+                active.append(limiter.active)
+                await asyncio.sleep(0)
+
+        async with limiter.slot():
+            await asyncio.gather(*[work() for _ in range(50)])
+
+        self.assertEqual(2, max(active))
+        self.assertEqual(0, limiter.active)
+
+
+class TestModelMap(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.limiter = Limiter(3)
+        self.model = BaseModel(self.db, collection_name="users", limiter=self.limiter)
+        self.active = self.max_active = 0
+
+    async def double(self, i: int) -> int:
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.001 * (i % 3))
+        async with self.model.slot():
+            self.active -= 1
+        return i * 2
+
+    async def test_order(self):
+        result = await self.model.map(self.double, range(20), concurrency=5)
+
+        self.assertEqual([i * 2 for i in range(20)], result)
+        self.assertEqual(3, self.max_active)
+        self.assertEqual(0, self.limiter.active)
+
+    async def test_concurrency(self):
+        self.model.limiter = None
+
+        await self.model.map(self.double, list(range(20)), concurrency=5)
+
+        self.assertEqual(5, self.max_active)
+
+    async def test_async_iterable(self):
+        async def items():
+            for i in range(5):
+                await asyncio.sleep(0)
+                yield i
+
+        self.assertEqual([0, 2, 4, 6, 8], await self.model.map(self.double, items()))
+        self.assertEqual([], await self.model.map(self.double, []))
+
+    async def test_error(self):
+        async def fail(i: int) -> int:
+            if i == 3:
+                raise ValueError(i)
+            return await self.double(i)
+
+        with self.assertRaises(ValueError):
+            await self.model.map(fail, range(100), concurrency=2)
+        self.assertEqual(0, self.limiter.active)
+
+    async def test_delete_many(self):
+        class Model(BaseModel):
+            deleted = 0
+
+            async def _after_delete(self, document: dict) -> dict:
+                async with self.slot():
+                    Model.deleted += 1
+                return document
+
+        model = Model(self.db, collection_name="users", limiter=self.limiter)
+        await model.create_many([{"i": i} for i in range(10)])
+
+        self.assertEqual(10, await model.delete_many({}, bulk_size=4))
+        self.assertEqual(10, Model.deleted)
@@ -0,0 +1,124 @@
+import asyncio
+import re
+
+from bson import Regex
+from bson.raw_bson import RawBSONDocument
+
+from aiomodels.core import BaseModel, Loader
+from aiomodels.testing import BaseTestModel
+
+
+class TestLoader(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.loader = Loader()
+        self.model = BaseModel(self.db, collection_name="users", loader=self.loader)
+        self.users = [
+            await self.model.create_one({"name": name}) for name in ("a", "b", "c")
+        ]
+
+    async def test_coalesce(self):
+        ids = [user["_id"] for user in self.users]
+
+        result = await asyncio.gather(*[self.model.read_one(_id) for _id in ids])
+
+        self.assertEqual(self.users, result)
+        self.assertEqual(1, self.loader.queries)
+        self.assertEqual(3, self.loader.loads)
+
+    async def test_dedupe(self):
+        _id = self.users[0]["_id"]
+
+        result = await asyncio.gather(
+            self.model.read_one(_id), self.model.read_one({"_id": _id})
+        )
+
+        self.assertEqual([self.users[0], self.users[0]], result)
+        self.assertIsNot(result[0], result[1])
+        self.assertEqual(1, self.loader.queries)
+
+    async def test_projection(self):
+        _id = self.users[0]["_id"]
+
+        result = await asyncio.gather(
+            self.model.read_one(_id, projection={"name": True}),
+            self.model.read_one(_id, projection={"_id": False}),
+            self.model.read_one(_id),
+        )
+
+        self.assertEqual(
+            [{"_id": _id, "name": "a"}, {"name": "a"}, self.users[0]], result
+        )
+        self.assertEqual(3, self.loader.queries)
+
+    async def test_operator_projection(self):
+        _id = self.users[0]["_id"]
+        projection = {"name": True, "tags": {"$elemMatch": {"$eq": "a"}}}
+
+        result = await asyncio.gather(
+            self.model.read_one(_id, projection=projection),
+            self.model.read_one(_id, projection=projection),
+        )
+
+        self.assertEqual([{"_id": _id, "name": "a"}] * 2, result)
+        self.assertEqual(1, self.loader.queries)
+
+    async def test_raw(self):
+        _id = self.users[0]["_id"]
+
+        result = await asyncio.gather(
+            self.model.read_one(_id, raw=True, projection={"_id": False}),
+            self.model.read_one(_id, raw=True, projection={"_id": False}),
+        )
+
+        self.assertIsInstance(result[0], RawBSONDocument)
+        self.assertEqual([{"name": "a"}, {"name": "a"}], [dict(r) for r in result])
+        self.assertEqual(1, self.loader.queries)
+
+    async def test_strict(self):
+        result = await asyncio.gather(
+            self.model.read_one(self.users[0]["_id"]),
+            self.model.read_one("missing"),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(self.users[0], result[0])
+        self.assertIsInstance(result[1], Exception)
+        self.assertIsNone(await self.model.read_one("missing", strict=False))
+
+    async def test_not_by_id(self):
+        self.assertEqual(self.users[1], await self.model.read_one({"name": "b"}))
+        self.assertEqual(0, self.loader.queries)
+
+    async def test_pattern(self):
+        user = await self.model.create_one({"_id": "abc1", "name": "r"})
+
+        result = await self.model.read_one({"_id": re.compile("^abc")})
+        regex = await self.model.read_one({"_id": Regex("^abc")})
+
+        self.assertEqual([user, user], [result, regex])
+        self.assertEqual(0, self.loader.queries)
+
+    async def test_window(self):
+        loader = Loader(window_ms=10)
+        model = BaseModel(self.db, collection_name="users", loader=loader)
+
+        async def delayed(_id):
+            await asyncio.sleep(0.001)
+            return await model.read_one(_id)
+
+        result = await asyncio.gather(
+            model.read_one(self.users[0]["_id"]), delayed(self.users[1]["_id"])
+        )
+
+        self.assertEqual(self.users[0:2], result)
+        self.assertEqual(1, loader.queries)
+
+    async def test_max_batch(self):
+        loader = Loader(max_batch=2)
+        model = BaseModel(self.db, collection_name="users", loader=loader)
+
+        result = await asyncio.gather(*[model.read_one(u["_id"]) for u in self.users])
+
+        self.assertEqual(self.users, result)
+        self.assertEqual(2, loader.queries)
@@ -0,0 +1,91 @@
+import unittest
+from types import SimpleNamespace
+
+from aiomodels.core import BaseModel, CommandMetrics, Metrics
+from aiomodels.core.metrics import Histogram
+from aiomodels.testing import BaseTestModel
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram((1, 10))
+
+        for value in (0.5, 1, 5, 50):
+            histogram.observe(value)
+
+        self.assertEqual([2, 1, 1], histogram.counts)
+        self.assertEqual(4, histogram.count)
+        self.assertEqual(56.5, histogram.sum)
+        self.assertEqual(1, histogram.quantile(0.5))
+        self.assertEqual(float("inf"), histogram.quantile(0.99))
+
+
+class TestMetrics(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.metrics = Metrics(measure_bytes=True)
+        self.model = BaseModel(self.db, collection_name="users", metrics=self.metrics)
+
+    async def test_operations(self):
+        user = await self.model.create_one({"name": "a"})
+        await self.model.read_one(user["_id"])
+        await self.model.update_one({"_id": user["_id"]}, {"$set": {"name": "b"}})
+        await self.model.delete_one({"_id": user["_id"]})
+
+        for operation in ("create", "read", "update", "delete"):
+            self.assertEqual(
+                1, self.metrics.latency[("users", operation, "server")].count
+            )
+        self.assertEqual(2, self.metrics.latency[("users", "create", "hooks")].count)
+
+    async def test_cursor(self):
+        await self.model.create_many({"i": i} for i in range(5))
+
+        documents = await self.model.read_many().to_list()
+
+        self.assertEqual(1, self.metrics.latency[("users", "cursor", "server")].count)
+        self.assertEqual(5, self.metrics.documents[("users", "cursor")].sum)
+        self.assertGreater(self.metrics.bytes_decoded["users"], 5 * len(documents))
+        self.assertEqual(
+            self.metrics.bytes_decoded["users"], self.metrics.bytes_encoded["users"]
+        )
+        self.assertIn(
+            'aiomodels_encoded_bytes_total{model="users"}', self.metrics.render()
+        )
+
+    async def test_errors(self):
+        await self.model.create_one({"_id": 1})
+
+        with self.assertRaises(Exception):
+            await self.model.create_one({"_id": 1})
+
+        self.assertEqual({("users", "create", "server"): 1}, self.metrics.errors)
+        self.assertIn(
+            'aiomodels_errors_total{model="users",operation="create",phase="server"} 1',
+            self.metrics.render(),
+        )
+
+    async def test_disabled(self):
+        model = BaseModel(self.db, collection_name="users")
+
+        await model.create_one({"name": "a"})
+
+        self.assertIsNone(model.metrics)
+
+
+class TestCommandMetrics(unittest.TestCase):
+    def test_events(self):
+        metrics = Metrics()
+        listener = CommandMetrics(metrics)
+        event = dict(connection_id=("localhost", 27017), request_id=1)
+
+        listener.started(
+            SimpleNamespace(**event, command_name="find", command={"find": "users"})
+        )
+        listener.succeeded(
+            SimpleNamespace(**event, command_name="find", duration_micros=1500)
+        )
+
+        histogram = metrics.latency[("users", "find", "driver")]
+        self.assertEqual(1, histogram.count)
+        self.assertEqual(0.0015, histogram.sum)
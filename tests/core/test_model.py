@@ -1,8 +1,18 @@
+import re
+
+import bson
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 
 from pymongo.errors import DuplicateKeyError
 
-from aiomodels.core import WrappedCursor, BaseModel
+from aiomodels.core import (
+    WrappedCursor,
+    BaseModel,
+    CreateManyResult,
+    IdentityCache,
+    UpdateManyResult,
+)
 from aiomodels.testing import BaseTestModel
 
 
@@ -33,6 +43,83 @@ class TestModelCreate(BaseTestModel):
             await model.create_one({"name": "Vovkt"})
 
 
+class TestModelCreateMany(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = BaseModel(self.db, collection_name="users")
+
+    async def test_default(self):
+        result = await self.model.create_many([{"name": "aaa"}, {"name": "bbb"}])
+
+        self.assertEqual([], result.errors)
+        self.assertEqual(["aaa", "bbb"], [doc["name"] for doc in result.documents])
+        self.assertEqual(result.documents, await self.model.read_many())
+
+    async def test_async_iterable(self):
+        async def documents():
+            for i in range(5):
+                yield {"level": i}
+
+        result = await self.model.create_many(documents(), bulk_size=2)
+
+        self.assertEqual(
+            list(range(5)), [doc["level"] for doc in await self.model.read_many()]
+        )
+        self.assertEqual(5, len(result.documents))
+
+    async def test_empty(self):
+        result = await self.model.create_many([])
+        self.assertEqual(CreateManyResult([], []), result)
+
+    async def test_duplicates(self):
+        await self.model.collection.create_index("name", unique=True)
+        await self.model.create_one({"name": "bbb"})
+
+        result = await self.model.create_many(
+            [{"name": "aaa"}, {"name": "bbb"}, {"name": "ccc"}, {"name": "aaa"}],
+            bulk_size=2,
+        )
+
+        self.assertEqual(["aaa", "ccc"], [doc["name"] for doc in result.documents])
+        self.assertEqual(2, len(result.errors))
+        self.assertIsInstance(result.errors[0], DuplicateKeyError)
+        self.assertEqual(
+            [(1, "bbb"), (3, "aaa")],
+            [(e.details["index"], e.details["op"]["name"]) for e in result.errors],
+        )
+        self.assertEqual(3, len(await self.model.read_many()))
+
+    async def test_bulk_bytes(self):
+        class Model(BaseModel):
+            bulk_bytes = 100
+
+        model = Model(self.db, collection_name="users")
+        batches = [
+            batch
+            async for batch in model.create_many_iter(
+                [{"data": "x" * 40} for _ in range(3)]
+            )
+        ]
+
+        self.assertEqual([1, 1, 1], [len(batch.documents) for batch in batches])
+
+    async def test_iter(self):
+        batches = [
+            batch
+            async for batch in self.model.create_many_iter(
+                ({"level": i} for i in range(5)), bulk_size=2, in_flight=1
+            )
+        ]
+
+        self.assertEqual(
+            [[0, 1], [2, 3], [4]],
+            [[doc["level"] for doc in batch.documents] for batch in batches],
+        )
+        with self.assertRaises(ValueError):
+            await self.model.create_many_iter([{"level": 5}], in_flight=0).__anext__()
+        self.assertEqual(5, len(await self.model.read_many()))
+
+
 class TestModelRead(BaseTestModel):
     async def test_empty(self):
         model = BaseModel(self.db, collection_name="users")
@@ -89,6 +176,89 @@ class TestModelRead(BaseTestModel):
             await model.read_one({})
 
 
+class TestModelReadCache(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.cache = IdentityCache()
+        self.model = BaseModel(self.db, collection_name="users", cache=self.cache)
+        self.user = await self.model.create_one({"name": "Vovkt", "level": 1})
+
+    async def test_hit(self):
+        actual = await self.model.read_one(self.user["_id"])
+        actual["name"] = "changed"
+
+        await self.model.collection.update_one(
+            {"_id": self.user["_id"]}, {"$set": {"level": 2}}
+        )
+
+        self.assertEqual(
+            self.user, await self.model.read_one({"_id": self.user["_id"]})
+        )
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    async def test_projection(self):
+        await self.model.read_one(self.user["_id"])
+        actual = await self.model.read_one(self.user["_id"], projection={"name": True})
+
+        self.assertEqual({"_id": self.user["_id"], "name": "Vovkt"}, actual)
+        self.assertEqual(2, len(self.cache))
+
+    async def test_operator_projection(self):
+        projection = {"name": True, "tags": {"$slice": 1}}
+        await self.model.read_one(self.user["_id"], projection=projection)
+        actual = await self.model.read_one(self.user["_id"], projection=projection)
+
+        self.assertEqual("Vovkt", actual["name"])
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    async def test_not_cached_query(self):
+        await self.model.read_one({"name": "Vovkt"})
+        self.assertEqual(0, len(self.cache))
+
+    async def test_pattern(self):
+        await self.model.create_one({"_id": "abc1", "level": 1})
+        await self.model.read_one({"_id": re.compile("^abc")})
+        await self.model.update_one({"_id": "abc1"}, {"$set": {"level": 2}})
+
+        actual = await self.model.read_one({"_id": re.compile("^abc")})
+        self.assertEqual(2, actual["level"])
+        self.assertEqual(0, len(self.cache))
+
+    async def test_update_one(self):
+        await self.model.read_one(self.user["_id"])
+        await self.model.update_one({"name": "Vovkt"}, {"$set": {"level": 2}})
+
+        actual = await self.model.read_one(self.user["_id"])
+        self.assertEqual(2, actual["level"])
+
+    async def test_delete_one(self):
+        await self.model.read_one(self.user["_id"])
+        await self.model.delete_one({"_id": self.user["_id"]})
+
+        self.assertIsNone(await self.model.read_one(self.user["_id"], strict=False))
+
+    async def test_update_many(self):
+        await self.model.read_one(self.user["_id"])
+        await self.model.update_many({"level": 1}, {"$set": {"level": 2}})
+
+        actual = await self.model.read_one(self.user["_id"])
+        self.assertEqual(2, actual["level"])
+
+    async def test_delete_many(self):
+        await self.model.read_one(self.user["_id"])
+        await self.model.delete_many({"level": 1})
+
+        self.assertIsNone(await self.model.read_one(self.user["_id"], strict=False))
+
+    async def test_bulk(self):
+        await self.model.read_one(self.user["_id"])
+        async with self.model.bulk() as writer:
+            await writer.update({"_id": self.user["_id"]}, {"$set": {"level": 2}})
+
+        actual = await self.model.read_one(self.user["_id"])
+        self.assertEqual(2, actual["level"])
+
+
 class TestModelReadMany(BaseTestModel):
     async def test_default(self):
         model = BaseModel(self.db, collection_name="users")
@@ -97,6 +267,185 @@ class TestModelReadMany(BaseTestModel):
         self.assertIsInstance(cursor, WrappedCursor)
 
 
+class TestModelReadPage(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = BaseModel(self.db, collection_name="users")
+        self.users = [
+            await self.model.create_one({"name": name, "level": level})
+            for name, level in [("a", 2), ("b", 1), ("c", 2), ("d", 1), ("e", 3)]
+        ]
+
+    async def test_by_id(self):
+        page = await self.model.read_page(limit=2)
+        self.assertEqual(self.users[0:2], page.documents)
+
+        page = await self.model.read_page(limit=2, after=page.next)
+        self.assertEqual(self.users[2:4], page.documents)
+
+        page = await self.model.read_page(limit=2, after=page.next)
+        self.assertEqual(self.users[4:], page.documents)
+        self.assertIsNone(page.next)
+
+    async def test_sort_key(self):
+        sort = ("level", -1)
+        result = []
+        page = await self.model.read_page(limit=2, sort=sort)
+        result.extend(page.documents)
+        while page.next:
+            page = await self.model.read_page(limit=2, sort=sort, after=page.next)
+            result.extend(page.documents)
+
+        u = self.users
+        self.assertEqual([u[4], u[2], u[0], u[3], u[1]], result)
+
+    async def test_query_and_projection(self):
+        page = await self.model.read_page(
+            {"level": {"$lt": 3}}, limit=3, sort=("level", 1), projection={"name": 1}
+        )
+        self.assertEqual(["b", "d", "a"], [doc["name"] for doc in page.documents])
+
+        page = await self.model.read_page(
+            {"level": {"$lt": 3}},
+            limit=3,
+            sort=("level", 1),
+            after=page.next,
+            projection={"name": 1},
+        )
+        self.assertEqual(["c"], [doc["name"] for doc in page.documents])
+
+    async def test_projection_keys(self):
+        page = await self.model.read_page(
+            limit=2, sort=("level", 1), projection={"name": 1, "_id": 0}
+        )
+        self.assertEqual([{"name": "b"}, {"name": "d"}], page.documents)
+
+        page = await self.model.read_page(
+            limit=2,
+            sort=("level", 1),
+            after=page.next,
+            projection={"name": 1, "_id": 0},
+            raw=True,
+        )
+        self.assertIsInstance(page.documents[0], RawBSONDocument)
+        self.assertEqual(
+            [{"name": "a"}, {"name": "c"}], list(map(dict, page.documents))
+        )
+
+        with self.assertRaises(ValueError):
+            await self.model.read_page(
+                limit=1, sort=("level", 1), projection={"level": False}
+            )
+
+    async def test_invalid_token(self):
+        page = await self.model.read_page(limit=1)
+        with self.assertRaises(ValueError):
+            await self.model.read_page(limit=1, sort=("level", 1), after=page.next)
+        with self.assertRaises(ValueError):
+            await self.model.read_page(limit=1, after="invalid")
+        with self.assertRaises(ValueError):
+            await self.model.read_page(limit=0)
+
+    async def test_scan(self):
+        batches = [batch async for batch in self.model.scan(size=2)]
+        self.assertEqual([self.users[0:2], self.users[2:4], self.users[4:]], batches)
+
+        batches = [batch async for batch in self.model.scan({"level": 1}, size=2)]
+        self.assertEqual([[self.users[1], self.users[3]]], batches)
+
+
+class TestModelReadRaw(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = BaseModel(self.db, collection_name="users")
+        self.user = await self.model.create_one(
+            {"name": "Vovkt", "address": {"city": "Kyiv"}}
+        )
+
+    async def test_read_one(self):
+        actual = await self.model.read_one(self.user["_id"], raw=True)
+
+        self.assertIsInstance(actual, RawBSONDocument)
+        self.assertEqual("Kyiv", actual["address"]["city"])
+        self.assertEqual(self.user, bson.decode(actual.raw))
+
+    async def test_read_many(self):
+        result = await self.model.read_many(raw=True)
+
+        self.assertIsInstance(result[0], RawBSONDocument)
+        self.assertEqual([self.user], [bson.decode(doc.raw) for doc in result])
+
+    async def test_model_default(self):
+        class Model(BaseModel):
+            raw = True
+
+        model = Model(self.db, collection_name="users")
+
+        self.assertIsInstance(await model.read_one(), RawBSONDocument)
+        self.assertEqual(self.user, await model.read_one(raw=False))
+
+    async def test_cache(self):
+        model = BaseModel(self.db, collection_name="users", cache=IdentityCache())
+
+        actual = await model.read_one(self.user["_id"], raw=True)
+        cached = await model.read_one(self.user["_id"], raw=True)
+        decoded = await model.read_one(self.user["_id"])
+
+        self.assertEqual(actual, cached)
+        self.assertEqual(self.user, decoded)
+        self.assertEqual(2, model.cache.hits)
+
+
+class TestModelAggregate(BaseTestModel):
+    class Model(BaseModel):
+        async def _after_read(self, document: dict) -> dict:
+            return {**document, "hooked": True}
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = self.Model(self.db, collection_name="users")
+        await self.model.create_many(
+            [{"name": str(i), "group": i % 3, "age": i} for i in range(10)]
+        )
+
+    async def test_hooks(self):
+        cursor = self.model.aggregate(
+            [{"$match": {"group": 0}}, {"$sort": {"age": -1}}, {"$limit": 2}],
+            allow_disk_use=True,
+            max_time_ms=1000,
+        )
+
+        self.assertIsInstance(cursor, WrappedCursor)
+        result = await cursor
+        self.assertEqual([9, 6], [document["age"] for document in result])
+        self.assertTrue(all(document["hooked"] for document in result))
+
+    async def test_result(self):
+        pipeline = [
+            {"$group": {"_id": "$group", "total": {"$sum": "$age"}}},
+            {"$sort": {"_id": 1}},
+        ]
+
+        plain = await self.model.aggregate(pipeline, hooks=False)
+        typed = await self.model.aggregate(
+            pipeline, result=lambda document: (document["_id"], document["total"])
+        )
+
+        self.assertEqual([{"_id": 0, "total": 18}], plain[:1])
+        self.assertEqual([(0, 18), (1, 12), (2, 15)], typed)
+
+    async def test_batches(self):
+        cursor = self.model.aggregate(
+            [{"$project": {"age": True}}], batch_size=4, raw=True, hooks=False
+        )
+
+        batches = [batch async for batch in cursor.batches(4)]
+
+        self.assertEqual([4, 4, 2], [len(batch) for batch in batches])
+        self.assertIsInstance(batches[0][0], RawBSONDocument)
+        self.assertEqual(0, batches[0][0]["age"])
+
+
 class TestModelUpdate(BaseTestModel):
     async def asyncSetUp(self) -> None:
         await super().asyncSetUp()
@@ -184,9 +533,9 @@ class TestModelUpdateMany(BaseTestModel):
         user2 = await self.model.create_one({"name": "bbb", "level": 1})
         user3 = await self.model.create_one({"name": "ccc", "level": 2})
 
-        count = await self.model.update_many({"level": 1}, {"$inc": {"level": 1}})
+        result = await self.model.update_many({"level": 1}, {"$inc": {"level": 1}})
 
-        self.assertEqual(count, 2)
+        self.assertEqual(result, UpdateManyResult(matched_count=2, modified_count=2))
 
         self.assertEqual(
             await self.model.read_many(),
@@ -207,8 +556,69 @@ class TestModelUpdateMany(BaseTestModel):
         )
 
     async def test_none(self):
-        count = await self.model.update_many({}, {"$set": {"name": "Vovkt"}})
-        self.assertEqual(0, count)
+        result = await self.model.update_many({}, {"$set": {"name": "Vovkt"}})
+        self.assertEqual(UpdateManyResult(0, 0), result)
+
+    async def test_modified_count(self):
+        await self.model.create_one({"name": "aaa", "level": 1})
+        await self.model.create_one({"name": "bbb", "level": 2})
+
+        result = await self.model.update_many({}, {"$set": {"level": 2}})
+        self.assertEqual(UpdateManyResult(matched_count=2, modified_count=1), result)
+
+
+class TestModelUpdateManyHooks(BaseTestModel):
+    class Model(BaseModel):
+        bulk_size = 2
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.before = []
+            self.after = []
+
+        async def _before_update(self, query, update, upsert=None, sort=None):
+            self.before.append(query["_id"])
+            return await super()._before_update(query, update, upsert, sort)
+
+        async def _after_update(self, document, **kwargs):
+            self.after.append(document)
+            return document
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = self.Model(self.db, collection_name="users")
+
+    async def test_chunks(self):
+        users = [
+            await self.model.create_one({"name": name, "level": 1})
+            for name in ("aaa", "bbb", "ccc")
+        ]
+        await self.model.create_one({"name": "ddd", "level": 2})
+
+        result = await self.model.update_many({"level": 1}, {"$inc": {"level": 1}})
+
+        self.assertEqual(UpdateManyResult(3, 3), result)
+        self.assertEqual([user["_id"] for user in users], self.model.before)
+        self.assertEqual(
+            sorted(doc["_id"] for doc in self.model.after),
+            [user["_id"] for user in users],
+        )
+        self.assertTrue(all(doc["level"] == 2 for doc in self.model.after))
+
+    async def test_batch_hooks(self):
+        batches = []
+
+        class Model(BaseModel):
+            async def _after_update_many(self, ids, update, session=None):
+                batches.append(ids)
+
+        model = Model(self.db, collection_name="users")
+        user = await model.create_one({"name": "aaa"})
+
+        result = await model.update_many({}, {"$set": {"name": "bbb"}})
+
+        self.assertEqual(UpdateManyResult(1, 1), result)
+        self.assertEqual([[user["_id"]]], batches)
 
 
 class TestModelDeleteOne(BaseTestModel):
@@ -258,3 +668,55 @@ class TestModelDeleteMany(BaseTestModel):
                 },
             ],
         )
+
+    async def test_none(self):
+        model = BaseModel(self.db, collection_name="user")
+        self.assertEqual(0, await model.delete_many({}))
+
+
+class TestModelDeleteManyHooks(BaseTestModel):
+    async def test_after_delete(self):
+        deleted = []
+
+        class Model(BaseModel):
+            bulk_size = 2
+
+            async def _after_delete(self, document):
+                deleted.append(document)
+                return document
+
+        model = Model(self.db, collection_name="user")
+        users = [
+            await model.create_one({"name": name, "level": 1})
+            for name in ("aaa", "bbb", "ccc")
+        ]
+        user4 = await model.create_one({"name": "ddd", "level": 2})
+
+        count = await model.delete_many({"level": 1})
+
+        self.assertEqual(3, count)
+        self.assertEqual([{"_id": user["_id"]} for user in users], deleted)
+        self.assertEqual([user4], await model.read_many())
+
+    async def test_after_delete_many(self):
+        batches = []
+
+        class Model(BaseModel):
+            bulk_size = 2
+
+            async def _after_delete_many(self, batch):
+                batches.append(batch)
+
+        model = Model(self.db, collection_name="user")
+        users = [await model.create_one({"name": name}) for name in ("a", "b", "c")]
+
+        count = await model.delete_many({})
+
+        self.assertEqual(3, count)
+        self.assertEqual(
+            [
+                [{"_id": users[0]["_id"]}, {"_id": users[1]["_id"]}],
+                [{"_id": users[2]["_id"]}],
+            ],
+            batches,
+        )
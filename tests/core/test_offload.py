@@ -0,0 +1,67 @@
+import concurrent.futures
+
+from bson.raw_bson import RawBSONDocument
+
+from aiomodels.core import BaseModel
+from aiomodels.testing import BaseTestModel
+
+
+class TestOffload(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.executor = concurrent.futures.ThreadPoolExecutor(2)
+        self.model = BaseModel(self.db, collection_name="users", executor=self.executor)
+        self.model.offload_batch = 3
+        self.users = (
+            await self.model.create_many([{"i": i} for i in range(10)])
+        ).documents
+
+    async def asyncTearDown(self) -> None:
+        self.executor.shutdown()
+        await super().asyncTearDown()
+
+    async def test_order(self):
+        calls = []
+        submit = self.executor.submit
+
+        def counted(*args, **kwargs):
+            calls.append(len(args[2]))
+            return submit(*args, **kwargs)
+
+        self.executor.submit = counted
+
+        self.assertEqual(self.users, await self.model.read_many().to_list())
+        self.assertEqual(4, len(calls))  # 10 documents by 3
+        self.assertEqual(
+            [{"n": 10}], await self.model.aggregate([{"$count": "n"}]).to_list()
+        )
+
+    async def test_iterator(self):
+        cursor = self.model.read_many(batch_size=4, sort=[("i", -1)])
+
+        self.assertEqual(self.users[::-1], [user async for user in cursor])
+
+    async def test_read_page(self):
+        page = await self.model.read_page(limit=4, projection={"i": True, "_id": False})
+
+        self.assertEqual([{"i": i} for i in range(4)], page.documents)
+        self.assertIs(dict, type(page.documents[0]))
+
+        batches = [batch async for batch in self.model.scan(size=4)]
+        self.assertEqual(self.users, [user for batch in batches for user in batch])
+        self.assertIs(dict, type(batches[0][0]))
+
+    async def test_raw(self):
+        users = await self.model.read_many(raw=True)
+
+        self.assertIsInstance(users[0], RawBSONDocument)
+
+    async def test_hooks(self):
+        class Model(BaseModel):
+            async def _after_read(self, document: dict) -> dict:
+                return {**document, "hooked": True}
+
+        model = Model(self.db, collection_name="users", executor=self.executor)
+
+        self.assertIsNone(model._hydrator())
+        self.assertTrue((await model.read_many().to_list())[0]["hooked"])
@@ -0,0 +1,57 @@
+import asyncio
+
+from aiomodels.core import BaseModel, HookProfiler
+from aiomodels.testing import BaseTestModel
+
+
+class SlowModel(BaseModel):
+    async def _after_read(self, document: dict) -> dict:
+        await asyncio.sleep(0.02)
+        return document
+
+
+class TestHookProfiler(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.profiler = HookProfiler(slow_ms=10)
+        self.model = SlowModel(self.db, collection_name="users", profiler=self.profiler)
+
+    async def test_stats(self):
+        user = await self.model.create_one({"name": "a"})
+        with self.assertLogs("aiomodels.core.profiler", "WARNING") as logs:
+            await self.model.read_one(user["_id"])
+
+        self.assertEqual(1, self.profiler.stats[("SlowModel", "_before_create")].calls)
+        stats = self.profiler.stats[("SlowModel", "_after_read")]
+        self.assertEqual(1, stats.calls)
+        self.assertGreaterEqual(stats.wall, 0.02)
+        self.assertGreaterEqual(stats.awaited, 0.02)
+        self.assertLess(stats.running, 0.02)
+        self.assertIn("SlowModel._after_read", logs.output[0])
+        self.assertIn(repr(user["_id"]), logs.output[0])
+
+    async def test_report(self):
+        await self.model.create_many([{"name": "a"}, {"name": "b"}])
+        with self.assertLogs("aiomodels.core.profiler", "WARNING"):
+            await self.model.read_many().to_list()
+
+        report = self.profiler.report().splitlines()
+
+        # concurrent _after_read calls add up to more than _after_read_many
+        self.assertIn("SlowModel._after_read ", report[1])
+        self.assertIn("SlowModel._after_read_many", report[2])
+
+    async def test_exception(self):
+        await self.model.create_one({"_id": 1})
+
+        with self.assertRaises(Exception):
+            await self.model.update_one({"_id": 1}, {"$set": {"_id": 2}})
+
+        self.assertEqual(1, self.profiler.stats[("SlowModel", "_before_update")].calls)
+
+    async def test_uninstall(self):
+        self.profiler.uninstall(self.model)
+
+        await self.model.create_one({"name": "a"})
+
+        self.assertEqual({}, self.profiler.stats)
@@ -0,0 +1,90 @@
+import concurrent.futures
+import pickle
+import sys
+import unittest
+
+from aiomodels.core import BaseModel, Record, record_class
+from aiomodels.testing import BaseTestModel
+
+
+class Users(BaseModel):
+    record_fields = ["_id", "name", "level"]
+
+
+class TestRecord(unittest.TestCase):
+    Point = record_class("Point", ["_id", "x", "y"])
+
+    def test_access(self):
+        point = self.Point.from_document({"_id": 1, "x": 2, "extra": 3})
+
+        self.assertEqual((1, 2), (point["_id"], point.x))
+        self.assertEqual(3, point["extra"])
+        self.assertEqual({"_id": 1, "x": 2, "extra": 3}, point)
+        self.assertEqual(["_id", "x", "extra"], list(point))
+        self.assertNotIn("y", point)
+        self.assertIsNone(point.get("y"))
+        with self.assertRaises(AttributeError):
+            point.y
+
+    def test_mutation(self):
+        point = self.Point(x=1)
+        point["y"] = 2
+        point.x = 3
+        del point["x"]
+        point["other"] = 4
+
+        self.assertEqual({"y": 2, "other": 4}, point)
+        self.assertEqual(2, len(point))
+        with self.assertRaises(KeyError):
+            del point["x"]
+        with self.assertRaises(AttributeError):
+            point.z = 5
+
+    def test_size(self):
+        document = {"_id": 1, "x": 2, "y": 3}
+        point = self.Point.from_document(document)
+
+        self.assertFalse(hasattr(point, "__dict__"))
+        self.assertLess(sys.getsizeof(point) * 2, sys.getsizeof(document))
+
+    def test_invalid_fields(self):
+        with self.assertRaises(ValueError):
+            record_class("Bad", ["a-b"])
+        with self.assertRaises(ValueError):
+            record_class("Bad", ["items"])
+
+
+class TestModelRecords(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = Users(self.db, collection_name="users")
+        await self.model.create_many(
+            [{"_id": "u1", "name": "Vovkt"}, {"_id": "u2", "name": "Mini", "x": 1}]
+        )
+
+    async def test_read(self):
+        user = await self.model.read_one("u1")
+        users = await self.model.read_many()
+
+        self.assertIsInstance(user, Users.record_class)
+        self.assertEqual("Vovkt", user.name)
+        self.assertEqual(
+            [{"_id": "u1", "name": "Vovkt"}, {"_id": "u2", "name": "Mini", "x": 1}],
+            users,
+        )
+        self.assertEqual(1, users[1]["x"])
+
+    async def test_pickle(self):
+        user = await self.model.read_one("u2")
+
+        self.assertEqual(user, pickle.loads(pickle.dumps(user)))
+
+    async def test_executor(self):
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            model = Users(self.db, collection_name="users", executor=executor)
+            model.offload_batch = 1
+
+            users = await model.read_many().to_list()
+
+        self.assertIsInstance(users[0], Record)
+        self.assertEqual(["Vovkt", "Mini"], [user.name for user in users])
@@ -0,0 +1,127 @@
+import concurrent.futures
+
+from bson import ObjectId
+
+from aiomodels.core import BaseModel, schema_fields
+from aiomodels.pydantic.core import PydanticModel
+from aiomodels.pydantic.model import Model
+from aiomodels.testing import BaseTestModel
+
+
+class User(Model):
+    name: str
+
+
+class Level(Model):
+    level: int
+
+
+class Users(PydanticModel[User]):
+    schema = User
+
+
+class TestPydanticModel(BaseTestModel):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.executor = concurrent.futures.ProcessPoolExecutor(1)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.executor.shutdown()
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = Users(self.db, collection_name="users")
+        await self.model.collection.insert_many(
+            [{"_id": "u1", "name": "Vovkt"}, {"_id": "u2", "name": "Natasyan"}]
+        )
+
+    async def test_read_one(self):
+        user = await self.model.read_one("u1")
+
+        self.assertIsInstance(user, User)
+        self.assertEqual(User(_id="u1", name="Vovkt"), user)
+
+    async def test_read_many(self):
+        users = await self.model.read_many()
+
+        self.assertEqual(["u1", "u2"], [user.id for user in users])
+        self.assertTrue(all(isinstance(user, User) for user in users))
+
+    async def test_validated(self):
+        class Levels(PydanticModel[Level]):
+            schema = Level
+            trusted = False
+
+        model = Levels(self.db, collection_name="levels")
+        await model.collection.insert_one({"_id": "l1", "level": "1"})
+
+        self.assertEqual(1, (await model.read_one("l1")).level)
+        self.assertEqual([1], [level.level for level in await model.read_many()])
+
+    async def test_validated_object_id(self):
+        class Levels(PydanticModel[Level]):
+            schema = Level
+            trusted = False
+
+        model = Levels(self.db, collection_name="levels")
+        _id = model.generate_id()
+        await model.collection.insert_one({"_id": _id, "level": "1"})
+
+        self.assertIsInstance(_id, ObjectId)
+        self.assertEqual(_id, (await model.read_one(_id)).id)
+        self.assertEqual([_id], [level.id for level in await model.read_many()])
+
+    async def test_process_pool(self):
+        model = Users(self.db, collection_name="users", executor=self.executor)
+        model.offload_batch = 1
+
+        users = await model.read_many().to_list()
+
+        self.assertEqual(["Vovkt", "Natasyan"], [user.name for user in users])
+        users[0].name = "changed"
+        self.assertEqual({"$set": {"name": "changed"}}, users[0].get_update())
+
+    async def test_overridden_hooks(self):
+        class Names(Users):
+            async def _after_read(self, document: dict) -> User:
+                user = await super()._after_read(document)
+                user.name = user.name.upper()
+                return user
+
+            async def _after_read_many(self, documents):
+                return [await self._after_read(document) for document in documents]
+
+        model = Names(self.db, collection_name="users", executor=self.executor)
+        model.offload_batch = 1
+
+        users = await model.read_many().to_list()
+
+        self.assertIsNone(model._hydrator())
+        self.assertEqual(["VOVKT", "NATASYAN"], [user.name for user in users])
+
+    async def test_overridden_read(self):
+        class Names(Users):
+            async def _after_read(self, document: dict) -> User:
+                user = await super()._after_read(document)
+                user.name = user.name.upper()
+                return user
+
+        model = Names(self.db, collection_name="users", executor=self.executor)
+
+        self.assertEqual("VOVKT", (await model.read_one("u1")).name)
+        self.assertEqual(
+            ["VOVKT", "NATASYAN"], [user.name for user in await model.read_many()]
+        )
+        page = await model.read_page(limit=1)
+        self.assertEqual(["VOVKT"], [user.name for user in page.documents])
+
+    async def test_record_fields(self):
+        class Records(BaseModel):
+            record_fields = schema_fields(User)
+
+        model = Records(self.db, collection_name="users")
+        user = await model.read_one("u1")
+
+        self.assertEqual(("_id", "name"), Records.record_class.__fields__)
+        self.assertEqual(("u1", "Vovkt"), (user["_id"], user.name))
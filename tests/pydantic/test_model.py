@@ -1,8 +1,13 @@
-from unittest import TestCase
+import json
+import pickle
+from unittest import TestCase, mock
 
+from bson import ObjectId
 from pydantic import validator, root_validator, Field, BaseModel, ValidationError
 
-from aiomodels.pydantic.model import Model
+from aiomodels.core import BaseModel as CoreModel
+from aiomodels.pydantic.model import FieldDescriptor, Model
+from aiomodels.testing import BaseTestModel
 
 
 class TestModel(TestCase):
@@ -83,3 +88,282 @@ class TestModel(TestCase):
             model.dict(),
             {"id": None, "val": 1},
         )
+
+
+class TestModelDescriptors(TestCase):
+    class ModelD(Model):
+        name: str
+        level: int = 0
+
+        def method1(self):
+            return self.level
+
+    def test_descriptors(self):
+        self.assertIsInstance(self.ModelD.name, FieldDescriptor)
+        self.assertIsInstance(self.ModelD.id, FieldDescriptor)
+
+    def test_slots(self):
+        model = self.ModelD(name="Vovkt")
+        with self.assertRaises(AttributeError):
+            object.__getattribute__(model, "__dict__")
+
+        with self.assertRaises(AttributeError):
+            model.other = 1
+
+    def test_read_write(self):
+        model = self.ModelD(name="Vovkt")
+        model.level = 2
+
+        self.assertEqual(2, model.level)
+        self.assertEqual(2, model.method1())
+        self.assertEqual(2, model.__instance__.level)
+
+    def test_inheritance(self):
+        class ModelE(self.ModelD):
+            extra: str = "e"
+
+        model = ModelE(name="Vovkt")
+        self.assertEqual(("Vovkt", "e"), (model.name, model.extra))
+        with self.assertRaises(AttributeError):
+            object.__getattribute__(model, "__dict__")
+
+
+class TestModelFromDb(TestCase):
+    class ModelT(Model):
+        name: str
+        level: int = 1
+        tags: list = Field(default_factory=list)
+
+        @validator("name")
+        def name_val(cls, v):
+            raise ValueError("not called")
+
+        @classmethod
+        def create(cls, name):
+            return cls(name=name)
+
+    def test_default(self):
+        model = self.ModelT.from_db({"_id": "u1", "name": "Vovkt", "other": 1})
+
+        self.assertIsInstance(model, self.ModelT)
+        self.assertEqual("u1", model.id)
+        self.assertEqual("Vovkt", model.name)
+        self.assertEqual(1, model.level)
+        self.assertEqual([], model.tags)
+        self.assertEqual(
+            {"id": "u1", "name": "Vovkt", "level": 1, "tags": []}, model.dict()
+        )
+        self.assertEqual({"id", "name"}, model.__fields_set__)
+
+    def test_missing_field(self):
+        model = self.ModelT.from_db({"_id": "u1"})
+
+        self.assertFalse(hasattr(model, "name"))
+        with self.assertRaises(AttributeError):
+            model.name
+
+    def test_classmethod_is_not_field(self):
+        self.assertNotIn("create", self.ModelT.__model__.__fields__)
+
+    def test_changes(self):
+        model = self.ModelT.from_db({"_id": "u1", "name": "Vovkt", "tags": ["a"]})
+        model.tags.append("b")
+
+        self.assertEqual({"$set": {"tags.1": "b"}}, model.get_update())
+
+    def test_validate_rate(self):
+        class ModelV(Model):
+            __validate_rate__ = 1.0
+            level: int
+
+        model = ModelV.from_db({"level": "1"})
+        self.assertEqual(1, model.level)
+
+        with mock.patch("aiomodels.pydantic.model.logger") as logger:
+            model = ModelV.from_db({"level": "s"})
+        self.assertEqual("s", model.level)
+        logger.warning.assert_called_once()
+
+    def test_validate_object_id(self):
+        class ModelV(Model):
+            __validate_rate__ = 1.0
+            level: int
+
+        _id = ObjectId()
+        with mock.patch("aiomodels.pydantic.model.logger") as logger:
+            model = ModelV.from_db({"_id": _id, "level": 1})
+        logger.warning.assert_not_called()
+        self.assertEqual(_id, model.id)
+        self.assertEqual("u1", ModelV(_id="u1", level=1).id)
+
+
+class TestModelParseMany(TestCase):
+    class ModelP(Model):
+        name: str
+        level: int = 0
+
+    def test_parse_many(self):
+        models = self.ModelP.parse_many(
+            [{"_id": "u1", "name": "a", "level": "1"}, {"name": "b"}]
+        )
+
+        self.assertEqual(
+            [self.ModelP(_id="u1", name="a", level=1), self.ModelP(name="b")], models
+        )
+        self.assertEqual({"id", "name", "level"}, models[0].__fields_set__)
+
+    def test_validation(self):
+        with self.assertRaises(ValidationError):
+            self.ModelP.parse_many([{"name": "a"}, {"level": "s"}])
+
+    def test_trusted(self):
+        models = self.ModelP.parse_many([{"name": "a", "level": "1"}], trusted=True)
+        self.assertEqual("1", models[0].level)
+
+    def test_changes(self):
+        model = self.ModelP.parse_many([{"name": "a"}])[0]
+        model.level = 2
+        self.assertEqual({"$set": {"level": 2}}, model.get_update())
+
+    def test_dump_many(self):
+        models = [self.ModelP(_id="u1", name="a"), self.ModelP(name="b", level=1)]
+
+        self.assertEqual(
+            [
+                {"_id": "u1", "name": "a", "level": 0},
+                {"name": "b", "level": 1},
+            ],
+            Model.dump_many(models),
+        )
+        self.assertEqual(
+            {"id": None, "name": "b", "level": 1},
+            Model.dump_many(models, by_alias=False)[1],
+        )
+        self.assertEqual(
+            [{"_id": "u1", "name": "a"}, {"name": "b", "level": 1}],
+            Model.dump_many(models, exclude_defaults=True),
+        )
+
+
+class TestModelChanges(TestCase):
+    class ModelC(Model):
+        name: str
+        level: int = 0
+        meta: dict = Field(default_factory=dict)
+        tags: list = Field(default_factory=list)
+
+    def test_set(self):
+        model = self.ModelC(_id="u1", name="Vovkt", meta={"a": {"b": 1}})
+        self.assertEqual({}, model.get_update())
+
+        model.level = 2
+        model.meta["a"]["b"] = 2
+        model.meta["c"] = 1
+
+        self.assertEqual(
+            {"$set": {"level": 2, "meta.a.b": 2, "meta.c": 1}}, model.get_update()
+        )
+        self.assertEqual({"a": {"b": 2}, "c": 1}, model.dict()["meta"])
+
+    def test_unset(self):
+        model = self.ModelC(_id="u1", name="Vovkt", meta={"a": 1, "b": 1})
+        del model.meta["a"]
+
+        self.assertEqual({"$unset": {"meta.a": ""}}, model.get_update())
+
+    def test_set_field_after_nested(self):
+        model = self.ModelC(_id="u1", name="Vovkt", meta={"a": 1})
+        model.meta["a"] = 2
+        model.meta = {"b": 1}
+        model.meta["c"] = 1
+
+        self.assertEqual({"$set": {"meta": {"b": 1, "c": 1}}}, model.get_update())
+
+    def test_augmented(self):
+        model = self.ModelC(_id="u1", name="Vovkt", tags=["a"])
+        model.tags += ["b"]
+
+        self.assertEqual(["a", "b"], model.dict()["tags"])
+        self.assertEqual({"$set": {"tags.1": "b"}}, model.get_update())
+
+        model.tags = ["c"]
+        model.tags += ["d"]
+        self.assertEqual({"$set": {"tags": ["c", "d"]}}, model.get_update())
+
+    def test_plain_values(self):
+        model = self.ModelC(_id="u1", name="Vovkt", meta={"a": 1}, tags=["a"])
+
+        self.assertIs(list, type(model.tags))
+        self.assertIs(dict, type(model.meta))
+        self.assertEqual('["a"]', json.dumps(model.tags))
+        self.assertEqual({}, model.get_update())
+
+        model.meta |= {"b": {"c": 1}}
+        model.meta["b"]["c"] += 1
+        model.tags[0] = "z"
+        self.assertEqual(
+            {"$set": {"meta.b": {"c": 2}, "tags.0": "z"}}, model.get_update()
+        )
+
+        del model.tags[0]
+        self.assertEqual({"$set": {"meta.b": {"c": 2}, "tags": []}}, model.get_update())
+
+    def test_alias(self):
+        model = self.ModelC(_id="u1", name="Vovkt")
+        model.id = "u2"
+
+        self.assertEqual({"$set": {"_id": "u2"}}, model.get_update())
+
+    def test_pickle(self):
+        model = self.ModelC(_id="u1", name="Vovkt", meta={"a": 1})
+        model.level = 2
+
+        actual = pickle.loads(pickle.dumps(model))
+
+        self.assertEqual(model, actual)
+        self.assertEqual(2, actual.level)
+        self.assertEqual({}, actual.get_update())
+
+
+class User(Model):
+    name: str
+    meta: dict = Field(default_factory=dict)
+
+
+class TestModelSave(BaseTestModel):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.model = CoreModel(self.db, collection_name="users")
+
+    async def test_save(self):
+        await self.model.create_one(
+            {"_id": "u1", "name": "Vovkt", "meta": {"a": 1, "b": 1}, "other": 1}
+        )
+        user = User(**await self.model.read_one("u1"))
+
+        user.name = "Vladimir"
+        user.meta["a"] = 2
+        del user.meta["b"]
+        await user.save(self.model)
+
+        self.assertEqual({}, user.get_update())
+        self.assertEqual(
+            {"_id": "u1", "name": "Vladimir", "meta": {"a": 2}, "other": 1},
+            await self.model.read_one("u1"),
+        )
+
+    async def test_save_reference(self):
+        await self.model.create_one({"_id": "u1", "name": "Vovkt", "meta": {"a": 1}})
+        user = User.from_db(await self.model.read_one("u1"))
+        meta = user.meta
+
+        meta["a"] = 2
+        await user.save(self.model)
+        meta["b"] = 1
+        await user.save(self.model)
+
+        self.assertEqual({"a": 2, "b": 1}, (await self.model.read_one("u1"))["meta"])
+
+    async def test_save_unchanged(self):
+        user = User(_id="u1", name="Vovkt")
+        self.assertIsNone(await user.save(self.model))
@@ -1,6 +1,6 @@
 from unittest import TestCase
 
-from aiomodels.pydantic.observer import create_observer
+from aiomodels.pydantic.observer import create_observer, diff
 
 
 class TestDictObserver(TestCase):
@@ -54,3 +54,161 @@ class TestDictObserver(TestCase):
 
         self.assertTrue(storage.modified)
         self.assertEqual(copy, {"a": {"b": 1, "c": 2}})
+
+
+class TestDictObserverChanges(TestCase):
+    def test_set(self):
+        storage = create_observer({"a": 1, "b": {"c": {"d": 1}}})
+        storage["a"] = 2
+        storage["b"]["c"]["d"] = 2
+
+        self.assertEqual({"$set": {"a": 2, "b.c.d": 2}}, storage.get_update())
+
+    def test_unset(self):
+        storage = create_observer({"a": 1, "b": {"c": 1, "d": 1}})
+        del storage["a"]
+        storage["b"].pop("c")
+        storage["b"].pop("missing", None)
+
+        self.assertEqual({"$unset": {"a": "", "b.c": ""}}, storage.get_update())
+
+    def test_set_parent(self):
+        storage = create_observer({"b": {"c": {"d": 1}}})
+        storage["b"]["c"]["d"] = 2
+        storage["b"]["c"] = {"e": 1}
+        storage["b"]["c"]["f"] = 1
+
+        self.assertEqual({"$set": {"b.c": {"e": 1, "f": 1}}}, storage.get_update())
+
+    def test_set_after_unset(self):
+        storage = create_observer({"a": 1})
+        del storage["a"]
+        storage["a"] = 2
+
+        self.assertEqual({"$set": {"a": 2}}, storage.get_update())
+
+    def test_clear_nested(self):
+        storage = create_observer({"a": {"b": 1}})
+        storage["a"].clear()
+
+        self.assertEqual({"$set": {"a": {}}}, storage.get_update())
+
+    def test_update_and_setdefault(self):
+        storage = create_observer({"a": {"b": 1}})
+        storage["a"].update(c=1)
+        storage.setdefault("d", {})["e"] = 1
+        storage.setdefault("a", {})
+
+        self.assertEqual({"$set": {"a.c": 1, "d": {"e": 1}}}, storage.get_update())
+
+    def test_set_observer(self):
+        storage = create_observer({"a": {"b": 1}})
+        storage["c"] = storage["a"]
+
+        self.assertIs(storage.data["c"], storage.data["a"])
+
+    def test_reset(self):
+        storage = create_observer({"a": 1})
+        storage["a"] = 2
+        storage.reset()
+
+        self.assertFalse(storage.modified)
+        self.assertEqual({}, storage.get_update())
+
+
+class TestObserverChildren(TestCase):
+    def test_cached(self):
+        storage = create_observer({"a": {"b": 1}, "c": [{"d": 1}]})
+
+        self.assertIs(storage["a"], storage["a"])
+        self.assertIs(storage["c"], storage["c"])
+        self.assertIs(storage["c"][0], storage["c"][0])
+
+    def test_replaced(self):
+        storage = create_observer({"a": {"b": 1}})
+        child = storage["a"]
+        storage["a"] = {"b": 2}
+
+        self.assertIsNot(child, storage["a"])
+        self.assertEqual({"b": 2}, storage["a"])
+
+    def test_modified_children(self):
+        storage = create_observer({"a": {"b": 1}, "c": {"d": 1}})
+        storage["a"]["b"] = 2
+        storage["c"]["d"] = 2
+
+        self.assertEqual({"$set": {"a.b": 2, "c.d": 2}}, storage.get_update())
+
+
+class TestListObserver(TestCase):
+    def test_append(self):
+        storage = create_observer({"tags": ["a"]})
+        storage["tags"].append("b")
+        storage["tags"].extend(["c"])
+        storage["tags"] += ["d"]
+
+        self.assertTrue(storage.modified)
+        self.assertEqual(["a", "b", "c", "d"], storage.data["tags"])
+        self.assertEqual(
+            {"$set": {"tags.1": "b", "tags.2": "c", "tags.3": "d"}},
+            storage.get_update(),
+        )
+
+    def test_setitem(self):
+        storage = create_observer({"tags": ["a", "b"]})
+        storage["tags"][-1] = "c"
+
+        self.assertEqual({"$set": {"tags.1": "c"}}, storage.get_update())
+
+    def test_positions(self):
+        for method, args in [
+            ("pop", ()),
+            ("insert", (0, "z")),
+            ("remove", ("a",)),
+            ("sort", ()),
+            ("reverse", ()),
+            ("clear", ()),
+            ("__delitem__", (0,)),
+        ]:
+            with self.subTest(method):
+                storage = create_observer({"tags": ["b", "a"]})
+                storage["tags"][0]  # cached child is dropped
+                getattr(storage["tags"], method)(*args)
+
+                self.assertEqual(
+                    {"$set": {"tags": storage.data["tags"]}}, storage.get_update()
+                )
+
+    def test_nested(self):
+        storage = create_observer({"items": [{"count": 1}, {"count": 1}]})
+        for item in storage["items"]:
+            item["count"] += 1
+
+        self.assertEqual(
+            {"$set": {"items.0.count": 2, "items.1.count": 2}}, storage.get_update()
+        )
+
+
+class TestDiff(TestCase):
+    def test_dict(self):
+        before = {"a": 1, "b": {"c": 1}, "d": 1}
+        after = {"a": 1.0, "b": {"c": 2, "e": 1}, "f": 1}
+
+        self.assertEqual(
+            {
+                ("a",): True,
+                ("b", "c"): True,
+                ("b", "e"): True,
+                ("d",): False,
+                ("f",): True,
+            },
+            dict(diff(before, after)),
+        )
+        self.assertEqual({}, dict(diff(before, before)))
+
+    def test_list(self):
+        self.assertEqual(
+            {("l", 0, "a"): True, ("l", 2): True},
+            dict(diff([{"a": 1}, 2], [{"a": 2}, 2, 3], ("l",))),
+        )
+        self.assertEqual({("l",): True}, dict(diff([1, 2], [2], ("l",))))
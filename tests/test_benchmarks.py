@@ -0,0 +1,66 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from benchmarks import cases  # noqa: F401 registers the cases
+from benchmarks.runner import Result, Samples, compare, dump, run
+
+
+def results(p50_ms: float, samples: int = 10) -> dict:
+    return {
+        "results": {
+            "read_one": {
+                "throughput": 1000.0,
+                "samples": samples,
+                "p50_ms": p50_ms,
+                "p99_ms": 10.0,
+            }
+        }
+    }
+
+
+class TestResult(TestCase):
+    def test_from_samples(self):
+        samples = Samples()
+        for i in range(1, 101):
+            samples.add(i / 1000)
+        samples.add(1.0, operations=10)
+
+        result = Result.from_samples("case", samples)
+
+        self.assertEqual((110, 101), (result.operations, result.samples))
+        self.assertAlmostEqual(51, result.p50_ms)
+        self.assertAlmostEqual(110 / 6.05, result.throughput)
+
+
+class TestCompare(TestCase):
+    def test_median(self):
+        report, regressions = compare(results(1.0), results(1.05))
+        self.assertEqual([], regressions)
+        self.assertIn("+5.0%", report)
+
+        _, regressions = compare(results(1.0), results(1.2))
+        self.assertEqual(["read_one"], regressions)
+
+    def test_min_samples(self):
+        report, regressions = compare(results(1.0, samples=1), results(2.0))
+
+        self.assertEqual([], regressions)
+        self.assertIn("1 samples, not compared", report)
+
+    def test_new_case(self):
+        report, regressions = compare({"results": {}}, results(1.0))
+
+        self.assertEqual([], regressions)
+        self.assertNotIn("read_one", report)
+
+
+class TestRun(IsolatedAsyncioTestCase):
+    async def test_memory(self):
+        result = await run(
+            "memory", names=["read_one", "create_many"], count=10, size=10, repeat=2
+        )
+
+        self.assertEqual(["read_one", "create_many"], [r.name for r in result])
+        self.assertEqual([20, 2], [r.samples for r in result])
+        data = dump(result, backend="memory", count=10, size=10, repeat=2)
+        self.assertEqual(20, data["results"]["read_one"]["operations"])
+        self.assertEqual([], compare(data, data)[1])
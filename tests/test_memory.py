@@ -0,0 +1,325 @@
+import re
+from unittest import IsolatedAsyncioTestCase, mock
+
+from bson.raw_bson import RawBSONDocument
+from bson.regex import Regex
+from pymongo import DeleteOne, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, WriteError
+
+from aiomodels import memory
+from aiomodels.memory import MemoryClient
+
+
+class TestMemoryCollection(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = MemoryClient()
+        self.collection = self.client["test"]["users"]
+        await self.collection.insert_many(
+            [
+                {"_id": 1, "name": "a", "age": 30, "tags": ["x", "y"]},
+                {"_id": 2, "name": "b", "age": 20, "address": {"city": "c"}},
+                {"_id": 3, "name": "c", "age": 40, "items": [{"n": 1}, {"n": 2}]},
+            ]
+        )
+
+    async def find(self, query, **kwargs):
+        return [
+            d["_id"] for d in await self.collection.find(query, **kwargs).to_list(None)
+        ]
+
+    async def test_insert(self):
+        document = {"name": "d"}
+
+        result = await self.collection.insert_one(document)
+
+        self.assertEqual(document["_id"], result.inserted_id)
+        stored = await self.collection.find_one(result.inserted_id)
+        self.assertEqual(document, stored)
+        stored["name"] = "changed"
+        self.assertEqual("d", (await self.collection.find_one(document["_id"]))["name"])
+
+    async def test_query(self):
+        self.assertEqual([1, 3], await self.find({"age": {"$gte": 30}}))
+        self.assertEqual([2], await self.find({"age": {"$lt": 30, "$ne": 10}}))
+        self.assertEqual([1], await self.find({"tags": "x"}))
+        self.assertEqual([1], await self.find({"tags": {"$all": ["x", "y"]}}))
+        self.assertEqual([2], await self.find({"address.city": "c"}))
+        self.assertEqual([3], await self.find({"items.n": 2}))
+        self.assertEqual(
+            [3], await self.find({"items": {"$elemMatch": {"n": {"$gt": 1}}}})
+        )
+        self.assertEqual([1, 2], await self.find({"_id": {"$in": [2, 1, 5]}}))
+        self.assertEqual([2, 3], await self.find({"tags": {"$exists": False}}))
+        self.assertEqual([1, 3], await self.find({"$or": [{"_id": 1}, {"name": "c"}]}))
+        self.assertEqual([2], await self.find({"name": re.compile("^B", re.I)}))
+        self.assertEqual([2], await self.find({"name": Regex("^b")}))
+        self.assertEqual([1, 2], await self.find({"name": {"$in": [Regex("^b"), "a"]}}))
+        self.assertEqual(
+            [2], await self.find({"name": {"$regex": "^B", "$options": "i"}})
+        )
+        self.assertEqual([2], await self.find({"age": {"$not": {"$gte": 30}}}))
+
+    async def test_projection(self):
+        self.assertEqual(
+            {"_id": 2, "address": {"city": "c"}},
+            await self.collection.find_one(2, projection={"address.city": True}),
+        )
+        self.assertEqual(
+            {"name": "b"}, await self.collection.find_one(2, {"name": 1, "_id": 0})
+        )
+        self.assertEqual(
+            {"_id": 1, "name": "a", "age": 30},
+            await self.collection.find_one(1, projection={"tags": False}),
+        )
+
+    async def test_sort_skip_limit(self):
+        self.assertEqual([3, 1, 2], await self.find({}, sort=[("age", -1)]))
+        self.assertEqual([1], await self.find({}, sort=[("age", -1)], skip=1, limit=1))
+
+        cursor = self.collection.find({}).sort("name", -1).skip(1).limit(2)
+        self.assertEqual([2, 1], [d["_id"] for d in await cursor.to_list(None)])
+
+    async def test_batches(self):
+        await self.collection.insert_many([{"i": i} for i in range(200)])
+        cursor = self.collection.find({})
+
+        await cursor.next()
+        self.assertEqual(100, cursor._buffer_size())
+        self.assertEqual(203, 1 + len(await cursor.to_list(None)))
+
+        cursor = self.collection.find({}, batch_size=10)
+        await cursor.next()
+        self.assertEqual(9, cursor._buffer_size())
+
+    async def test_update_operators(self):
+        document = await self.collection.find_one_and_update(
+            {"_id": 1},
+            {
+                "$set": {"address.city": "d"},
+                "$inc": {"age": 1, "visits": 2},
+                "$push": {"tags": {"$each": ["z", "x"]}},
+                "$unset": {"name": ""},
+                "$min": {"age_min": 5},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+        self.assertEqual(
+            {
+                "_id": 1,
+                "age": 31,
+                "tags": ["x", "y", "z", "x"],
+                "address": {"city": "d"},
+                "visits": 2,
+                "age_min": 5,
+            },
+            document,
+        )
+
+        result = await self.collection.update_one(
+            {"_id": 1}, {"$addToSet": {"tags": "y"}}
+        )
+        self.assertEqual((1, 0), (result.matched_count, result.modified_count))
+        await self.collection.update_one({"_id": 1}, {"$pull": {"tags": "x"}})
+        self.assertEqual(["y", "z"], (await self.collection.find_one(1))["tags"])
+
+        result = await self.collection.update_many({}, {"$set": {"name": "c"}})
+        self.assertEqual((3, 2), (result.matched_count, result.modified_count))
+
+    async def test_update_errors(self):
+        with self.assertRaises(WriteError) as e:
+            await self.collection.update_one({"_id": 1}, {"$set": {"_id": 5}})
+        self.assertEqual(66, e.exception.code)
+        with self.assertRaises(WriteError) as e:
+            await self.collection.update_one({"_id": 1}, {"$set": {"_id": "one"}})
+        self.assertEqual(66, e.exception.code)
+        self.assertEqual("a", (await self.collection.find_one(1))["name"])
+        await self.collection.replace_one({"_id": 1}, {"_id": 1.0, "name": "a"})
+
+        with self.assertRaises(WriteError) as e:
+            await self.collection.update_one(
+                {"_id": 1}, {"$set": {"age": 1}, "$inc": {"age": 1}}
+            )
+        self.assertEqual(40, e.exception.code)
+
+        with self.assertRaises(WriteError) as e:
+            await self.collection.update_one({"_id": 1}, {"$inc": {"name": 1}})
+        self.assertEqual(14, e.exception.code)
+
+    async def test_upsert(self):
+        document = await self.collection.find_one_and_update(
+            {"name": "e", "age": {"$gt": 1}},
+            {"$set": {"age": 10}, "$setOnInsert": {"_id": 5, "new": True}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+        self.assertEqual({"_id": 5, "name": "e", "age": 10, "new": True}, document)
+
+        result = await self.collection.update_one(
+            {"_id": 5}, {"$setOnInsert": {"new": False}}, upsert=True
+        )
+        self.assertEqual(
+            (1, 0, None),
+            (result.matched_count, result.modified_count, result.upserted_id),
+        )
+
+    async def test_delete(self):
+        document = await self.collection.find_one_and_delete({}, sort=[("age", 1)])
+
+        self.assertEqual(2, document["_id"])
+        self.assertEqual(
+            2,
+            (await self.collection.delete_many({"_id": {"$in": [1, 3]}})).deleted_count,
+        )
+        self.assertEqual(0, await self.collection.count_documents({}))
+
+    async def test_unique_index(self):
+        await self.collection.create_index("name", unique=True)
+
+        with self.assertRaises(DuplicateKeyError) as e:
+            await self.collection.insert_one({"name": "a"})
+        self.assertEqual({"name": "a"}, e.exception.details["keyValue"])
+
+        with self.assertRaises(DuplicateKeyError):
+            await self.collection.update_one({"_id": 2}, {"$set": {"name": "a"}})
+
+        with self.assertRaises(DuplicateKeyError):
+            await self.collection.insert_one({"_id": 1})
+
+        await self.collection.update_one({"_id": 2}, {"$set": {"name": "z"}})
+        await self.collection.insert_one({"name": "b"})
+
+    async def test_multikey_index(self):
+        await self.collection.insert_many(
+            [{"_id": 4, "a": [{"b": 1}, {"b": 2}]}, {"_id": 5, "a": {"b": 1}}]
+        )
+        await self.collection.create_index("a.b")
+
+        self.assertEqual([4, 5], await self.find({"a.b": 1}))
+        self.assertEqual([4], await self.find({"a.b": 2}))
+
+    async def test_multikey_unique(self):
+        await self.collection.create_index("tags", unique=True, sparse=True)
+
+        with self.assertRaises(DuplicateKeyError):
+            await self.collection.insert_one({"tags": ["z", "y"]})
+        await self.collection.update_one({"_id": 1}, {"$pull": {"tags": "y"}})
+        await self.collection.insert_one({"_id": 4, "tags": ["z", "y"]})
+        self.assertEqual([4], await self.find({"tags": "y"}))
+
+    async def test_bulk_write(self):
+        requests = [
+            InsertOne({"_id": 4}),
+            InsertOne({"_id": 1}),
+            UpdateOne({"_id": 2}, {"$set": {"age": 21}}),
+            UpdateOne({"_id": 6}, {"$set": {"age": 1}}, upsert=True),
+            DeleteOne({"_id": 3}),
+        ]
+
+        with self.assertRaises(BulkWriteError) as e:
+            await self.collection.bulk_write(requests, ordered=False)
+
+        details = e.exception.details
+        self.assertEqual([1], [error["index"] for error in details["writeErrors"]])
+        self.assertEqual(11000, details["writeErrors"][0]["code"])
+        self.assertEqual(
+            (1, 1, 1, 1, 1),
+            tuple(
+                details[k]
+                for k in ("nInserted", "nMatched", "nModified", "nUpserted", "nRemoved")
+            ),
+        )
+
+        with self.assertRaises(BulkWriteError) as e:
+            await self.collection.bulk_write([InsertOne({"_id": 1}), DeleteOne({})])
+        self.assertEqual(0, e.exception.details["nRemoved"])
+
+    async def test_index_explain(self):
+        await self.collection.create_index([("age", 1)])
+
+        explain = await self.collection.find({"age": 20}).explain()
+        self.assertEqual(
+            "IXSCAN", explain["queryPlanner"]["winningPlan"]["inputStage"]["stage"]
+        )
+        self.assertEqual(1, explain["executionStats"]["totalDocsExamined"])
+
+        explain = await self.collection.find({"name": "a"}).explain()
+        self.assertEqual("COLLSCAN", explain["queryPlanner"]["winningPlan"]["stage"])
+        self.assertEqual(3, explain["executionStats"]["totalDocsExamined"])
+
+        await self.collection.update_one({"_id": 2}, {"$set": {"age": 30}})
+        self.assertEqual([1, 2], await self.find({"age": 30}))
+
+    async def test_raw(self):
+        codec_options = self.collection.codec_options.with_options(
+            document_class=RawBSONDocument
+        )
+        collection = self.collection.with_options(codec_options=codec_options)
+
+        document = await collection.find_one(1)
+
+        self.assertIsInstance(document, RawBSONDocument)
+        self.assertEqual("a", document["name"])
+
+    async def test_aggregate(self):
+        cursor = self.collection.aggregate(
+            [
+                {"$match": {"age": {"$gte": 20}}},
+                {"$group": {"_id": None, "total": {"$sum": "$age"}, "n": {"$sum": 1}}},
+                {"$project": {"_id": 0, "total": 1, "n": 1}},
+            ]
+        )
+
+        self.assertEqual([{"total": 90, "n": 3}], await cursor.to_list(None))
+
+        cursor = self.collection.aggregate(
+            [{"$unwind": "$tags"}, {"$sort": {"tags": -1}}, {"$limit": 1}],
+            batchSize=1,
+            hint="_id_",
+            maxTimeMS=1000,
+        )
+        self.assertEqual(
+            [{"_id": 1, "name": "a", "age": 30, "tags": "y"}],
+            await cursor.to_list(None),
+        )
+
+    async def test_drop_database(self):
+        await self.client.drop_database("test")
+
+        self.assertIsNone(await self.collection.find_one(1))
+        self.assertEqual([], await self.client["test"].list_collection_names())
+
+        await self.collection.insert_one({"_id": 4})
+        self.assertEqual([4], await self.find({}))
+        self.assertEqual(
+            {"_id": 4}, await self.client["test"]["users"].find_one({"_id": 4})
+        )
+
+    async def test_drop_collection(self):
+        other = self.client["test"]["users"]
+
+        await self.client["test"].drop_collection("users")
+
+        self.assertEqual([], await self.find({}))
+        self.assertIsNone(await other.find_one(1))
+        self.assertEqual([], await self.client["test"].list_collection_names())
+
+    async def test_exact_lookup(self):
+        await self.collection.create_index("name")
+
+        with mock.patch.object(memory, "match", wraps=memory.match) as match:
+            self.assertEqual([1], await self.find({"name": "a"}))
+            self.assertEqual([1, 3], await self.find({"_id": {"$in": [3, 1]}}))
+            self.assertEqual(
+                {"_id": 2}, await self.collection.find_one({"name": "b"}, {"_id": 1})
+            )
+            match.assert_not_called()
+
+            self.assertEqual([], await self.find({"name": "a", "age": 20}))
+            self.assertEqual(
+                [], await self.find({"$and": [{"name": "a"}, {"age": 20}]})
+            )
+            self.assertIsNone(await self.collection.find_one({"name": "b", "age": 30}))
+            self.assertEqual([2], await self.find({"age": 20}))
+        self.assertTrue(match.called)